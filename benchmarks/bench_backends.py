@@ -0,0 +1,79 @@
+"""
+Compare the process and thread backends of BatchRunner.
+
+Run the same script under a regular and a free-threaded interpreter to
+see where threads pay off:
+
+    python benchmarks/bench_backends.py
+    python3.13t -X gil=0 benchmarks/bench_backends.py
+
+With the GIL enabled, the thread backend runs documents one at a time and
+mostly measures the cost of skipping process startup and transport.
+"""
+
+import argparse
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+
+from stylometry_ttr import BatchRunner, Document, TTRConfig
+from stylometry_ttr.batch import _gil_enabled
+
+
+DATA_DIR = Path(__file__).parent.parent / "tests" / "data"
+HOUND_FILE = DATA_DIR / "doyle-the-hound-of-the-baskervilles.txt"
+
+
+def _documents(count: int, scale: int) -> list[Document]:
+    """Slices of the Hound, rotated so that documents differ."""
+    text = HOUND_FILE.read_text(encoding="utf-8")
+    step = len(text) // count
+    return [
+        Document(f"doc{i}", (text[i * step :] + text[: i * step]) * scale, author=f"a{i % 4}")
+        for i in range(count)
+    ]
+
+
+def _time(runner: BatchRunner, documents: list[Document], repeat: int) -> float:
+    """Best wall-clock time of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        runner.run(documents)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--documents", type=int, default=32, help="Documents per batch")
+    parser.add_argument("--scale", type=int, default=1, help="Copies of the Hound per document")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per backend (best is kept)")
+    args = parser.parse_args()
+
+    documents = _documents(args.documents, args.scale)
+    megabytes = sum(len(doc.text.encode("utf-8")) for doc in documents) / 1e6
+    config = TTRConfig(return_chunk_details=True)
+
+    print(f"{platform.python_implementation()} {platform.python_version()}", end="")
+    print(f" (GIL {'enabled' if _gil_enabled() else 'disabled'}), {args.workers} workers")
+    print(f"{len(documents)} documents, {megabytes:.1f} MB\n")
+
+    backends = [
+        ("process, shared memory", dict(backend="process", shared_memory=True)),
+        ("process, pickled", dict(backend="process", shared_memory=False)),
+        ("thread", dict(backend="thread")),
+    ]
+    print(f"{'backend':<24} {'seconds':>9} {'MB/s':>9} {'util':>7}")
+    for name, options in backends:
+        runner = BatchRunner(config=config, max_workers=args.workers, **options)
+        seconds = _time(runner, documents, args.repeat)
+        utilization = runner.last_stats.utilization
+        print(f"{name:<24} {seconds:>9.3f} {megabytes / seconds:>9.1f} {utilization:>7.1%}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
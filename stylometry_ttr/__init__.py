@@ -19,9 +19,42 @@ __version__ = "1.0.3"
 
 from typing import Optional
 
-from stylometry_ttr.models import TTRResult, TTRAggregate, ChunkTTR
-from stylometry_ttr.ttr import TTRCalculator, TTRConfig, TTRAggregator
-from stylometry_ttr.tokenizer import Tokenizer, tokenize, tokenize_iter
+from stylometry_ttr.models import (
+    TTRResult,
+    TTRAggregate,
+    ChunkTTR,
+    ChunkSeries,
+    STTREstimate,
+    TypeSignature,
+    MinHashSignature,
+)
+from stylometry_ttr.ttr import (
+    TTRCalculator,
+    TTRConfig,
+    TTRAggregator,
+    RunningAggregate,
+    by_author,
+)
+from stylometry_ttr.tokenizer import Tokenizer, TokenSpans, tokenize, tokenize_iter
+from stylometry_ttr.vocabulary import Vocabulary
+from stylometry_ttr.batch import (
+    BatchRunner,
+    BatchStats,
+    Document,
+    DuplicateMatch,
+    WorkerUsage,
+    compute_ttr_batch,
+)
+from stylometry_ttr.corpus import iter_corpus
+from stylometry_ttr.jobs import CorpusJob
+from stylometry_ttr.minhash import (
+    MinHashIndex,
+    minhash_signature,
+    overlap_matrix,
+    shingle_signature,
+)
+from stylometry_ttr.store import TTRStore
+from stylometry_ttr.variants import compute_ttr_variants
 
 
 def compute_ttr(
@@ -32,6 +65,7 @@ def compute_ttr(
     chunk_size: int = 1000,
     return_chunks: bool = False,
     config: Optional[TTRConfig] = None,
+    max_workers: Optional[int] = None,
 ) -> TTRResult:
     """
     Compute TTR metrics from raw text.
@@ -46,13 +80,11 @@ def compute_ttr(
         chunk_size: Words per chunk for STTR (default: 1000)
         return_chunks: Return per-chunk TTR data for visualization (default: False)
         config: TTR configuration (optional, overrides chunk_size/return_chunks if provided)
+        max_workers: Tokenize in parallel across this many processes (default: sequential)
 
     Returns:
         TTRResult with all computed metrics
     """
-    tokenizer = Tokenizer()
-    tokens = tokenizer.tokenize(text)
-
     # Use provided config, or build one from convenience parameters
     if config is None:
         config = TTRConfig(
@@ -61,7 +93,9 @@ def compute_ttr(
         )
 
     calculator = TTRCalculator(config=config)
-    return calculator.compute(tokens, text_id=text_id, title=title, author=author)
+    return calculator.compute_text(
+        text, text_id=text_id, title=title, author=author, max_workers=max_workers
+    )
 
 
 # Alias for namespace-style usage: ttr.compute()
@@ -73,15 +107,37 @@ __all__ = [
     # Primary API
     "compute_ttr",
     "compute",
+    "compute_ttr_batch",
+    "iter_corpus",
+    "compute_ttr_variants",
+    "overlap_matrix",
     "tokenize",
     # Models
     "TTRResult",
     "TTRAggregate",
     "ChunkTTR",
+    "ChunkSeries",
+    "STTREstimate",
+    "TypeSignature",
+    "MinHashSignature",
     # Power user classes
     "TTRCalculator",
     "TTRConfig",
     "TTRAggregator",
+    "RunningAggregate",
+    "by_author",
+    "CorpusJob",
+    "TTRStore",
+    "Vocabulary",
+    "MinHashIndex",
+    "minhash_signature",
+    "shingle_signature",
     "Tokenizer",
+    "TokenSpans",
     "tokenize_iter",
+    "BatchRunner",
+    "BatchStats",
+    "WorkerUsage",
+    "DuplicateMatch",
+    "Document",
 ]
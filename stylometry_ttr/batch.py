@@ -0,0 +1,923 @@
+"""
+Batch TTR computation across worker processes or threads.
+
+By default, documents cross the process boundary through shared memory
+instead of pickling: the parent writes every text as UTF-8 into one
+input segment, and workers write the scalar metrics and per-chunk TTR
+values of each result into one output segment as float64 slots. Only
+small task descriptors (offsets and slot positions) are pickled, and
+the token lists of segments of split documents on their way back.
+
+On free-threaded CPython (3.13t and later, running without the GIL) the
+thread backend computes documents in a thread pool instead, so texts and
+results are never copied at all. Tokenizer module state is immutable
+and safe to share between threads.
+
+With deduplicate=True, a pre-pass in the parent hashes raw texts so that
+each distinct text is computed once. Word-shingle signatures of the
+distinct texts are computed in the pool alongside the TTR tasks, and the
+parent flags near-duplicates from them afterwards.
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from multiprocessing import shared_memory
+from typing import Any, Callable, Collection, Iterable, NamedTuple, Optional, Union
+
+from stylometry_ttr.minhash import MinHashIndex, shingle_signature
+from stylometry_ttr.models import TTRResult, ChunkTTR, ChunkSeries, MinHashSignature
+from stylometry_ttr.tokenizer import DEFAULT_SEGMENT_SIZE, Tokenizer, segment_text
+from stylometry_ttr.ttr import TTRCalculator, TTRConfig
+
+
+class Document(NamedTuple):
+    """A raw text with its identifying metadata."""
+
+    text_id: str
+    text: str
+    title: str = ""
+    author: str = ""
+
+
+# Scalar TTRResult fields exchanged through shared memory, in slot order.
+# None is encoded as NaN.
+_METRIC_FIELDS = (
+    "total_words",
+    "unique_words",
+    "ttr",
+    "root_ttr",
+    "log_ttr",
+    "sttr",
+    "sttr_std",
+    "sttr_se",
+    "chunk_count",
+    "sttr_sample_count",
+    "delta_mean",
+    "delta_std",
+    "delta_min",
+    "delta_max",
+)
+_INT_FIELDS = frozenset({"total_words", "unique_words", "chunk_count", "sttr_sample_count"})
+
+# One extra slot per document holds the number of chunk details written (NaN for None)
+_SLOTS_PER_DOC = len(_METRIC_FIELDS) + 1
+
+# Each chunk detail takes two slots: chunk number and TTR
+_SLOTS_PER_CHUNK = 2
+
+# MinHash values are 32-bit, so each takes one float64 slot exactly. A document's
+# MinHash slots come first in its detail region, followed by its chunk slots.
+
+_FLOAT_SIZE = 8
+
+# Estimated shingle overlap at which deduplicated batches flag near-duplicates
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.9
+
+# Target number of tasks per worker; more tasks balance better but cost more dispatches
+_TASKS_PER_WORKER = 4
+
+BACKENDS = ("auto", "process", "thread")
+
+
+def _gil_enabled() -> bool:
+    """Whether the GIL is active (always True before CPython 3.13)."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def _resolve_backend(backend: str) -> str:
+    """Map "auto" to threads on free-threaded interpreters and processes otherwise."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {', '.join(BACKENDS)}")
+    if backend == "auto":
+        return "process" if _gil_enabled() else "thread"
+    return backend
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing segment without handing it to this process's tracker."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+
+def _utf8_size(text: str) -> int:
+    """UTF-8 size of a text, without encoding it when it is ASCII."""
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+
+def _timed(function: Callable[..., Any], *args: Any) -> tuple[str, float, Any]:
+    """Run a task and report which worker ran it and for how long."""
+    started = time.perf_counter()
+    value = function(*args)
+    worker = f"{os.getpid()}/{threading.current_thread().name}"
+    return worker, time.perf_counter() - started, value
+
+
+def _exact_duplicates(docs: list[Document]) -> dict[int, int]:
+    """Map each document whose text repeats an earlier one to its first occurrence."""
+    first: dict[str, int] = {}
+    duplicates: dict[int, int] = {}
+    for i, doc in enumerate(docs):
+        original = first.setdefault(doc.text, i)
+        if original != i:
+            duplicates[i] = original
+    return duplicates
+
+
+def _near_duplicates(
+    signatures: list[MinHashSignature], threshold: float
+) -> list[tuple[int, int, float]]:
+    """
+    Look each shingle signature up in an LSH index of the signatures before it.
+
+    Returns:
+        (index, most similar earlier index, estimated overlap) for every
+        signature whose best match reaches threshold
+    """
+    index = MinHashIndex(threshold=threshold)
+    near_duplicates: list[tuple[int, int, float]] = []
+    for i, signature in enumerate(signatures):
+        best = index.query(signature, k=1)
+        if best and best[0][1] >= threshold:
+            near_duplicates.append((i, int(best[0][0]), best[0][1]))
+        index.add(str(i), signature)
+    return near_duplicates
+
+
+def _shingle_signatures(texts: list[str]) -> list[MinHashSignature]:
+    """Fingerprint a list of texts (pickle transport)."""
+    return [shingle_signature(text) for text in texts]
+
+
+def _shingle_signatures_shared_memory(
+    input_name: str, spans: list[tuple[int, int]]
+) -> list[MinHashSignature]:
+    """Fingerprint texts stored in shared memory at (byte offset, byte length) spans."""
+    source_shm = _attach(input_name)
+    try:
+        return [
+            shingle_signature(str(source_shm.buf[offset : offset + length], "utf-8"))
+            for offset, length in spans
+        ]
+    finally:
+        source_shm.close()
+
+
+def compute_documents(
+    documents: list[Document], config: TTRConfig, tokenizer: Tokenizer
+) -> list[TTRResult]:
+    """
+    Compute results for a list of documents in the calling process.
+
+    This is the task BatchRunner and the scoring server submit to workers
+    when documents are pickled, and what CorpusJob runs without workers.
+
+    Args:
+        documents: Documents to compute
+        config: TTR configuration
+        tokenizer: Tokenizer to apply
+
+    Returns:
+        One TTRResult per document, in order
+    """
+    calculator = TTRCalculator(config=config)
+    return [
+        calculator.compute_text(
+            doc.text,
+            text_id=doc.text_id,
+            title=doc.title,
+            author=doc.author,
+            tokenizer=tokenizer,
+        )
+        for doc in documents
+    ]
+
+
+def _shared_memory_worker(
+    input_name: str,
+    output_name: str,
+    tasks: list[tuple[int, int, int, int]],
+    config: TTRConfig,
+    tokenizer: Tokenizer,
+) -> None:
+    """
+    Compute results for documents stored in shared memory.
+
+    Args:
+        input_name: Segment holding the UTF-8 texts
+        output_name: Segment receiving float64 metric and chunk slots
+        tasks: (document index, byte offset, byte length, first detail slot) tuples
+        config: TTR configuration
+        tokenizer: Tokenizer to apply
+    """
+    source_shm = _attach(input_name)
+    output_shm = _attach(output_name)
+    source = source_shm.buf
+    slots = output_shm.buf.cast("d")
+    try:
+        calculator = TTRCalculator(config=config)
+        for index, offset, length, detail_slot in tasks:
+            text = str(source[offset : offset + length], "utf-8")
+            result = calculator.compute_text(text, text_id="", tokenizer=tokenizer)
+
+            base = index * _SLOTS_PER_DOC
+            for k, name in enumerate(_METRIC_FIELDS):
+                value = getattr(result, name)
+                slots[base + k] = math.nan if value is None else value
+
+            if result.minhash is not None:
+                for value in result.minhash:
+                    slots[detail_slot] = value
+                    detail_slot += 1
+
+            if result.chunk_ttrs is None:
+                slots[base + len(_METRIC_FIELDS)] = math.nan
+                continue
+            chunks = result.chunk_ttrs
+            slots[base + len(_METRIC_FIELDS)] = len(chunks)
+            if isinstance(chunks, ChunkSeries):
+                pairs = enumerate(chunks.values, start=1)
+            else:
+                pairs = ((chunk.chunk_number, chunk.ttr) for chunk in chunks)
+            for number, ttr in pairs:
+                slots[detail_slot] = number
+                slots[detail_slot + 1] = ttr
+                detail_slot += _SLOTS_PER_CHUNK
+    finally:
+        slots.release()
+        source_shm.close()
+        output_shm.close()
+
+
+def _tokenize_shared_memory(
+    input_name: str, offset: int, length: int, tokenizer: Tokenizer
+) -> list[str]:
+    """Tokenize one segment of a document stored in shared memory."""
+    source_shm = _attach(input_name)
+    try:
+        return tokenizer.tokenize(str(source_shm.buf[offset : offset + length], "utf-8"))
+    finally:
+        source_shm.close()
+
+
+class WorkerUsage(NamedTuple):
+    """Work done by one pool worker during a batch."""
+
+    worker: str
+    tasks: int
+    busy_seconds: float
+    utilization: float
+
+
+class DuplicateMatch(NamedTuple):
+    """A document whose text duplicates (or nearly duplicates) an earlier one."""
+
+    text_id: str
+    match_id: str
+    similarity: float
+
+
+class BatchStats(NamedTuple):
+    """Scheduling report for one BatchRunner.run() call."""
+
+    documents: int
+    tasks: int
+    split_documents: int
+    segments: int
+    max_workers: int
+    wall_seconds: float
+    parent_seconds: float
+    workers: tuple[WorkerUsage, ...]
+    duplicates: tuple[DuplicateMatch, ...] = ()
+    near_duplicates: tuple[DuplicateMatch, ...] = ()
+    fingerprint_seconds: float = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Busy fraction of the whole pool (idle workers count as 0)."""
+        if not self.wall_seconds:
+            return 0.0
+        busy = sum(usage.busy_seconds for usage in self.workers)
+        return busy / (self.max_workers * self.wall_seconds)
+
+    def to_table(self) -> str:
+        """Return ASCII table representation."""
+        header = f"Batch: {self.documents} documents, {self.tasks} tasks"
+        lines = [
+            f"+{'-' * 58}+",
+            f"| {header:<56} |",
+            f"+{'-' * 28}+{'-' * 9}+{'-' * 9}+{'-' * 9}+",
+            f"| {'Worker':<26} | {'Tasks':>7} | {'Busy s':>7} | {'Util':>7} |",
+            f"+{'-' * 28}+{'-' * 9}+{'-' * 9}+{'-' * 9}+",
+        ]
+        for usage in self.workers:
+            lines.append(
+                f"| {usage.worker:<26} | {usage.tasks:>7} | {usage.busy_seconds:>7.2f}"
+                f" | {usage.utilization:>7.1%} |"
+            )
+        lines += [
+            f"+{'-' * 28}+{'-' * 9}+{'-' * 9}+{'-' * 9}+",
+            f"| {'Wall Seconds':<26} | {self.wall_seconds:>27.2f} |",
+            f"| {'Split Documents':<26} | {self.split_documents:>27} |",
+            f"| {'Exact Duplicates':<26} | {len(self.duplicates):>27} |",
+            f"| {'Near Duplicates':<26} | {len(self.near_duplicates):>27} |",
+            f"| {'Pool Utilization':<26} | {self.utilization:>27.1%} |",
+            f"+{'-' * 28}+{'-' * 29}+",
+        ]
+        return "\n".join(lines)
+
+
+class _Schedule(NamedTuple):
+    """Document indices to split into segments, and packed tasks in dispatch order."""
+
+    split: list[int]
+    tasks: list[list[int]]
+
+
+class BatchRunner:
+    """
+    Computes TTR results for many documents in a pool of worker processes or threads.
+
+    Results are identical to calling compute_ttr() on each document in turn.
+
+    Work is scheduled by estimated cost (UTF-8 size): tasks are dispatched
+    largest first, small documents are packed together into tasks of
+    similar cost, and a document larger than its workers' fair share is
+    tokenized in parallel segments so that no worker is left alone with it
+    at the end of the batch.
+    """
+
+    def __init__(
+        self,
+        config: Optional[TTRConfig] = None,
+        tokenizer: Optional[Tokenizer] = None,
+        max_workers: Optional[int] = None,
+        shared_memory: bool = True,
+        backend: str = "auto",
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        deduplicate: bool = False,
+        near_duplicate_threshold: Optional[float] = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    ):
+        """
+        Initialize batch runner.
+
+        Args:
+            config: TTR configuration (uses defaults if not provided)
+            tokenizer: Tokenizer to apply (uses defaults if not provided)
+            max_workers: Worker processes or threads (default: CPU count)
+            shared_memory: Exchange texts and results through shared memory
+                instead of pickling them (process backend only)
+            backend: "process", "thread", or "auto" (threads when the
+                interpreter runs without the GIL, processes otherwise)
+            segment_size: Target characters per tokenization segment when
+                an oversized document is split
+            deduplicate: Fingerprint raw texts first; exact duplicates reuse
+                the result of their first occurrence
+            near_duplicate_threshold: Estimated shingle overlap at which a
+                deduplicated batch flags near-duplicates (None to skip)
+        """
+        self._config = config or TTRConfig()
+        self._tokenizer = tokenizer or Tokenizer()
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._shared_memory = shared_memory
+        self._backend = _resolve_backend(backend)
+        self._segment_size = segment_size
+        self._deduplicate = deduplicate
+        self._near_duplicate_threshold = near_duplicate_threshold
+        self._last_stats: Optional[BatchStats] = None
+
+        if segment_size < 1:
+            raise ValueError("segment_size must be at least 1")
+        if near_duplicate_threshold is not None and not 0.0 < near_duplicate_threshold <= 1.0:
+            raise ValueError("near_duplicate_threshold must be in (0, 1]")
+        if self._config.type_vocabulary is not None and self._backend == "process":
+            raise ValueError(
+                "type_vocabulary cannot be shared with worker processes; "
+                'use backend="thread" or compute type signatures sequentially'
+            )
+
+    @property
+    def backend(self) -> str:
+        """Backend in use ("process" or "thread")."""
+        return self._backend
+
+    @property
+    def last_stats(self) -> Optional[BatchStats]:
+        """Scheduling and per-worker utilization report of the last run (None before)."""
+        return self._last_stats
+
+    def run(self, documents: Iterable[Document]) -> list[TTRResult]:
+        """
+        Compute TTR results for a batch of documents.
+
+        Args:
+            documents: Documents (or (text_id, text[, title[, author]]) tuples)
+
+        Returns:
+            List of TTRResult, in input order
+        """
+        docs = [Document(*doc) for doc in documents]
+        started = time.perf_counter()
+
+        duplicates = _exact_duplicates(docs) if self._deduplicate else {}
+        positions = [i for i in range(len(docs)) if i not in duplicates]
+        unique = [docs[i] for i in positions]
+        fingerprint_seconds = time.perf_counter() - started
+
+        timings: list[tuple[str, float]] = []
+        segments: list[tuple[int, list[Future]]] = []
+        computed: list[Optional[TTRResult]] = []
+        signatures: Optional[list[MinHashSignature]] = None
+        if self._deduplicate and self._near_duplicate_threshold is not None:
+            signatures = []
+        parent_seconds = 0.0
+        if unique:
+            if self._backend == "thread":
+                pool: Executor = ThreadPoolExecutor(max_workers=self._max_workers)
+            else:
+                pool = ProcessPoolExecutor(max_workers=self._max_workers)
+            with pool:
+                if self._backend == "process" and self._shared_memory:
+                    computed, parent_seconds = self._run_shared_memory(
+                        unique, pool, segments, timings, signatures
+                    )
+                else:
+                    computed, parent_seconds = self._run_partitions(
+                        unique, pool, segments, timings, signatures
+                    )
+
+        near_duplicates: list[tuple[int, int, float]] = []
+        if signatures:
+            searched = time.perf_counter()
+            near_duplicates = [
+                (positions[i], positions[match], similarity)
+                for i, match, similarity in _near_duplicates(
+                    signatures, self._near_duplicate_threshold
+                )
+            ]
+            fingerprint_seconds += time.perf_counter() - searched
+
+        results: list[Optional[TTRResult]] = [None] * len(docs)
+        for i, result in zip(positions, computed):
+            results[i] = result
+        for i, original in duplicates.items():
+            doc = docs[i]
+            results[i] = results[original].model_copy(
+                update={"text_id": doc.text_id, "title": doc.title, "author": doc.author}
+            )
+
+        matches = [
+            DuplicateMatch(docs[i].text_id, docs[original].text_id, 1.0)
+            for i, original in duplicates.items()
+        ]
+        near_matches = [
+            DuplicateMatch(docs[i].text_id, docs[match].text_id, similarity)
+            for i, match, similarity in near_duplicates
+        ]
+        self._last_stats = self._summarize(
+            docs,
+            segments,
+            timings,
+            parent_seconds,
+            started,
+            matches,
+            near_matches,
+            fingerprint_seconds,
+        )
+        return results
+
+    def _schedule(self, costs: list[int], splittable: Optional[list[bool]] = None) -> _Schedule:
+        """
+        Plan tasks from estimated document costs.
+
+        Documents costing more than a fair share of the batch (and more than
+        one segment) are split, unless splittable marks them otherwise. The
+        rest are taken largest first: documents costing at least the target
+        task cost (an even share of the rest over a few tasks per worker) get
+        a task of their own, and smaller ones are packed into tasks until they
+        reach it.
+        """
+        total = sum(costs)
+        order = sorted(range(len(costs)), key=lambda i: -costs[i])
+        fair_share = total / self._max_workers
+        split = [
+            i
+            for i in order
+            if self._max_workers > 1
+            and costs[i] > max(fair_share, self._segment_size)
+            and (splittable is None or splittable[i])
+        ]
+
+        skipped = set(split)
+        remaining = total - sum(costs[i] for i in split)
+        target = max(remaining / (self._max_workers * _TASKS_PER_WORKER), 1)
+        tasks: list[list[int]] = []
+        packed: list[int] = []
+        packed_cost = 0
+        for i in order:
+            if i in skipped:
+                continue
+            if costs[i] >= target:
+                tasks.append([i])
+                continue
+            packed.append(i)
+            packed_cost += costs[i]
+            if packed_cost >= target:
+                tasks.append(packed)
+                packed, packed_cost = [], 0
+        if packed:
+            tasks.append(packed)
+        return _Schedule(split, tasks)
+
+    def _fingerprint_tasks(self, docs: list[Document]) -> list[list[int]]:
+        """Pack documents into shingle-signature tasks of similar size, never split."""
+        costs = [_utf8_size(doc.text) for doc in docs]
+        return self._schedule(costs, [False] * len(docs)).tasks
+
+    @staticmethod
+    def _collect_signatures(
+        count: int,
+        fingerprints: list[tuple[list[int], Future]],
+        timings: list[tuple[str, float]],
+    ) -> list[MinHashSignature]:
+        """Gather shingle signatures from their tasks, in document order."""
+        signatures: list[Optional[MinHashSignature]] = [None] * count
+        for indices, future in fingerprints:
+            worker, seconds, computed = future.result()
+            timings.append((worker, seconds))
+            for i, signature in zip(indices, computed):
+                signatures[i] = signature
+        return signatures
+
+    def _submit_segments(
+        self,
+        docs: list[Document],
+        split: list[int],
+        pool: Executor,
+        input_name: Optional[str] = None,
+        offsets: Optional[list[int]] = None,
+    ) -> list[tuple[int, list[Future]]]:
+        """
+        Queue the tokenization of each segment of the documents to split.
+
+        With input_name, workers read each segment from the shared-memory input
+        at its byte offset instead of receiving its text; their tokens are
+        still pickled back.
+        """
+        submitted = []
+        for i in split:
+            futures = []
+            position = offsets[i] if offsets is not None else 0
+            for segment in segment_text(docs[i].text, self._segment_size):
+                if input_name is None:
+                    futures.append(pool.submit(_timed, self._tokenizer.tokenize, segment))
+                    continue
+                size = _utf8_size(segment)
+                futures.append(
+                    pool.submit(
+                        _timed, _tokenize_shared_memory, input_name, position, size, self._tokenizer
+                    )
+                )
+                position += size
+            submitted.append((i, futures))
+        return submitted
+
+    def _drain(
+        self,
+        docs: list[Document],
+        tasks: list[tuple[list[int], Future]],
+        segments: list[tuple[int, list[Future]]],
+        results: list[Optional[TTRResult]],
+        timings: list[tuple[str, float]],
+    ) -> float:
+        """
+        Wait for every task, scoring each split document here as soon as its segments are done.
+
+        Task futures that return results (pickle transport) fill them in;
+        split documents are computed from their joined segment tokens while
+        workers carry on with the remaining tasks.
+
+        Returns:
+            Seconds spent scoring split documents in this process
+        """
+        calculator = TTRCalculator(config=self._config)
+        task_indices = {future: indices for indices, future in tasks}
+        split_of = {future: i for i, futures in segments for future in futures}
+        segment_futures = dict(segments)
+        outstanding = {i: len(futures) for i, futures in segments}
+
+        busy = 0.0
+        pending = set(task_indices) | set(split_of)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            ready: list[int] = []
+            for future in done:
+                worker, seconds, value = future.result()
+                timings.append((worker, seconds))
+                if future in task_indices:
+                    # Shared-memory tasks return None; their results are read afterwards
+                    if value is not None:
+                        for i, result in zip(task_indices[future], value):
+                            results[i] = result
+                    continue
+                i = split_of[future]
+                outstanding[i] -= 1
+                if not outstanding[i]:
+                    ready.append(i)
+
+            for i in ready:
+                tokens: list[str] = []
+                for future in segment_futures[i]:
+                    tokens.extend(future.result()[2])
+                started = time.perf_counter()
+                doc = docs[i]
+                results[i] = calculator.compute(
+                    tokens, text_id=doc.text_id, title=doc.title, author=doc.author
+                )
+                busy += time.perf_counter() - started
+        return busy
+
+    def _summarize(
+        self,
+        docs: list[Document],
+        segments: list[tuple[int, list[Future]]],
+        timings: list[tuple[str, float]],
+        parent_seconds: float,
+        started: float,
+        duplicates: list[DuplicateMatch],
+        near_duplicates: list[DuplicateMatch],
+        fingerprint_seconds: float,
+    ) -> BatchStats:
+        """Build the scheduling report from per-task worker timings."""
+        wall = time.perf_counter() - started
+        busy: dict[str, float] = {}
+        counts: dict[str, int] = {}
+        for worker, seconds in timings:
+            busy[worker] = busy.get(worker, 0.0) + seconds
+            counts[worker] = counts.get(worker, 0) + 1
+        workers = tuple(
+            WorkerUsage(worker, counts[worker], busy[worker], busy[worker] / wall if wall else 0.0)
+            for worker in sorted(busy)
+        )
+        return BatchStats(
+            documents=len(docs),
+            tasks=len(timings),
+            split_documents=len(segments),
+            segments=sum(len(futures) for _, futures in segments),
+            max_workers=self._max_workers,
+            wall_seconds=wall,
+            parent_seconds=parent_seconds,
+            workers=workers,
+            duplicates=tuple(duplicates),
+            near_duplicates=tuple(near_duplicates),
+            fingerprint_seconds=fingerprint_seconds,
+        )
+
+    def _run_partitions(
+        self,
+        docs: list[Document],
+        pool: Executor,
+        segments: list[tuple[int, list[Future]]],
+        timings: list[tuple[str, float]],
+        signatures: Optional[list[MinHashSignature]] = None,
+    ) -> tuple[list[Optional[TTRResult]], float]:
+        """
+        Hand documents to workers directly (pickled when workers are processes).
+
+        When signatures is a list, it receives the shingle signature of each
+        document, computed in the pool after the TTR tasks are queued.
+        """
+        schedule = self._schedule([_utf8_size(doc.text) for doc in docs])
+        segments.extend(self._submit_segments(docs, schedule.split, pool))
+        tasks = [
+            (
+                indices,
+                pool.submit(
+                    _timed,
+                    compute_documents,
+                    [docs[i] for i in indices],
+                    self._config,
+                    self._tokenizer,
+                ),
+            )
+            for indices in schedule.tasks
+        ]
+        fingerprints = []
+        if signatures is not None:
+            fingerprints = [
+                (
+                    indices,
+                    pool.submit(_timed, _shingle_signatures, [docs[i].text for i in indices]),
+                )
+                for indices in self._fingerprint_tasks(docs)
+            ]
+
+        results: list[Optional[TTRResult]] = [None] * len(docs)
+        parent_seconds = self._drain(docs, tasks, segments, results, timings)
+        if signatures is not None:
+            signatures.extend(self._collect_signatures(len(docs), fingerprints, timings))
+        return results, parent_seconds
+
+    def _run_shared_memory(
+        self,
+        docs: list[Document],
+        pool: Executor,
+        segments: list[tuple[int, list[Future]]],
+        timings: list[tuple[str, float]],
+        signatures: Optional[list[MinHashSignature]] = None,
+    ) -> tuple[list[Optional[TTRResult]], float]:
+        """
+        Exchange documents and results with workers through shared memory.
+
+        When signatures is a list, it receives the shingle signature of each
+        document, computed in the pool from the input segment.
+        """
+        encoded = [doc.text.encode("utf-8") for doc in docs]
+
+        # Byte offsets of each text in the input segment
+        lengths = [len(data) for data in encoded]
+        offsets: list[int] = []
+        position = 0
+        for length in lengths:
+            offsets.append(position)
+            position += length
+
+        # Normalized text never has more characters than UTF-8 bytes, so a text
+        # of n bytes has at most n // chunk_size full chunks.
+        detail_slots: list[int] = []
+        slot = len(docs) * _SLOTS_PER_DOC
+        for length in lengths:
+            detail_slots.append(slot)
+            slot += self._config.minhash_permutations or 0
+            if self._config.return_chunk_details:
+                slot += length // self._config.sttr_chunk_size * _SLOTS_PER_CHUNK
+
+        schedule = self._schedule(lengths)
+
+        input_shm = shared_memory.SharedMemory(create=True, size=max(position, 1))
+        try:
+            output_shm = shared_memory.SharedMemory(create=True, size=slot * _FLOAT_SIZE)
+            try:
+                for offset, data in zip(offsets, encoded):
+                    input_shm.buf[offset : offset + len(data)] = data
+                del encoded
+
+                # Workers start with the first submission; creating the segments
+                # first lets them share this process's resource tracker.
+                segments.extend(
+                    self._submit_segments(docs, schedule.split, pool, input_shm.name, offsets)
+                )
+                tasks = [
+                    (
+                        indices,
+                        pool.submit(
+                            _timed,
+                            _shared_memory_worker,
+                            input_shm.name,
+                            output_shm.name,
+                            [(i, offsets[i], lengths[i], detail_slots[i]) for i in indices],
+                            self._config,
+                            self._tokenizer,
+                        ),
+                    )
+                    for indices in schedule.tasks
+                ]
+                fingerprints = []
+                if signatures is not None:
+                    fingerprints = [
+                        (
+                            indices,
+                            pool.submit(
+                                _timed,
+                                _shingle_signatures_shared_memory,
+                                input_shm.name,
+                                [(offsets[i], lengths[i]) for i in indices],
+                            ),
+                        )
+                        for indices in self._fingerprint_tasks(docs)
+                    ]
+                split_results: list[Optional[TTRResult]] = [None] * len(docs)
+                parent_seconds = self._drain(docs, tasks, segments, split_results, timings)
+                if signatures is not None:
+                    signatures.extend(self._collect_signatures(len(docs), fingerprints, timings))
+
+                results = self._read_results(
+                    docs, output_shm, detail_slots, self._config, skip=set(schedule.split)
+                )
+                for i in schedule.split:
+                    results[i] = split_results[i]
+                return results, parent_seconds
+            finally:
+                output_shm.close()
+                output_shm.unlink()
+        finally:
+            input_shm.close()
+            input_shm.unlink()
+
+    @staticmethod
+    def _read_results(
+        docs: list[Document],
+        output_shm: shared_memory.SharedMemory,
+        detail_slots: list[int],
+        config: TTRConfig,
+        skip: Collection[int] = (),
+    ) -> list[Optional[TTRResult]]:
+        """Rebuild TTRResult objects from the output segment (None for skipped documents)."""
+        permutations = config.minhash_permutations or 0
+        slots = output_shm.buf.cast("d")
+        try:
+            results: list[Optional[TTRResult]] = []
+            for i, doc in enumerate(docs):
+                if i in skip:
+                    results.append(None)
+                    continue
+                base = i * _SLOTS_PER_DOC
+                fields: dict[str, Optional[float]] = {}
+                for k, name in enumerate(_METRIC_FIELDS):
+                    value = slots[base + k]
+                    if math.isnan(value):
+                        fields[name] = None
+                    elif name in _INT_FIELDS:
+                        fields[name] = int(value)
+                    else:
+                        fields[name] = value
+
+                minhash = None
+                if permutations:
+                    start = detail_slots[i]
+                    minhash = MinHashSignature(
+                        int(value) for value in slots[start : start + permutations]
+                    )
+
+                chunk_ttrs: Optional[Union[ChunkSeries, list[ChunkTTR]]] = None
+                detail_count = slots[base + len(_METRIC_FIELDS)]
+                if not math.isnan(detail_count):
+                    start = detail_slots[i] + permutations
+                    stop = start + int(detail_count) * _SLOTS_PER_CHUNK
+                    if config.compact_chunk_details and fields["sttr_sample_count"] is None:
+                        chunk_ttrs = ChunkSeries(slots[start + 1 : stop : _SLOTS_PER_CHUNK])
+                    else:
+                        chunk_ttrs = [
+                            ChunkTTR(chunk_number=int(slots[s]), ttr=slots[s + 1])
+                            for s in range(start, stop, _SLOTS_PER_CHUNK)
+                        ]
+
+                results.append(
+                    TTRResult(
+                        text_id=doc.text_id,
+                        title=doc.title,
+                        author=doc.author,
+                        chunk_ttrs=chunk_ttrs,
+                        minhash=minhash,
+                        **fields,
+                    )
+                )
+            return results
+        finally:
+            slots.release()
+
+
+def compute_ttr_batch(
+    documents: Iterable[Document],
+    config: Optional[TTRConfig] = None,
+    max_workers: Optional[int] = None,
+    shared_memory: bool = True,
+    backend: str = "auto",
+    deduplicate: bool = False,
+) -> list[TTRResult]:
+    """
+    Compute TTR metrics for many raw texts in parallel.
+
+    Args:
+        documents: Documents (or (text_id, text[, title[, author]]) tuples)
+        config: TTR configuration (optional)
+        max_workers: Worker processes or threads (default: CPU count)
+        shared_memory: Exchange texts and results through shared memory (default: True)
+        backend: "process", "thread", or "auto" (default: threads only without the GIL)
+        deduplicate: Compute each distinct text once and copy its result to duplicates
+
+    Returns:
+        List of TTRResult, in input order. To see which documents were
+        duplicates or near-duplicates, run a BatchRunner(deduplicate=True)
+        and read its last_stats.
+    """
+    runner = BatchRunner(
+        config=config,
+        max_workers=max_workers,
+        shared_memory=shared_memory,
+        backend=backend,
+        deduplicate=deduplicate,
+    )
+    return runner.run(documents)
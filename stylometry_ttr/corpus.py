@@ -0,0 +1,134 @@
+"""
+Streaming corpus readers.
+
+Reads texts straight out of compressed files (.gz, .bz2, .xz) and
+archives (.zip, .tar and compressed tarballs) without extracting them to
+disk. Each member is decoded incrementally and its tokens are streamed
+into TTRCalculator.compute_iter, so neither a whole member nor its token
+list is ever held in memory.
+"""
+
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+from fnmatch import fnmatch
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Iterator, Optional, Union
+
+from stylometry_ttr.models import TTRResult
+from stylometry_ttr.tokenizer import Tokenizer
+from stylometry_ttr.ttr import TTRCalculator, TTRConfig
+
+
+_COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+_TAR_SUFFIXES = (".tar", ".tgz", ".tbz2", ".txz", ".tar.gz", ".tar.bz2", ".tar.xz")
+
+DEFAULT_BLOCK_SIZE = 1 << 20  # Bytes decompressed and decoded per read
+
+
+def _text_id(name: str) -> str:
+    """Derive a text_id from a file or member path by dropping its extension."""
+    return str(PurePosixPath(name).with_suffix(""))
+
+
+def _iter_members(path: Path, pattern: str) -> Iterator[tuple[str, BinaryIO]]:
+    """
+    Yield (text_id, binary stream) for each text in a file or archive.
+
+    Each stream must be consumed before the next member is requested.
+    """
+    name = path.name.lower()
+
+    if name.endswith(_TAR_SUFFIXES):
+        # "r|*" reads the archive as a forward-only stream with any compression
+        with tarfile.open(path, mode="r|*") as archive:
+            for member in archive:
+                if member.isfile() and fnmatch(member.name, pattern):
+                    stream = archive.extractfile(member)
+                    if stream is not None:
+                        yield _text_id(member.name), stream
+        return
+
+    if name.endswith(".zip"):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and fnmatch(info.filename, pattern):
+                    with archive.open(info) as stream:
+                        yield _text_id(info.filename), stream
+        return
+
+    opener = _COMPRESSED_OPENERS.get(path.suffix.lower())
+    if opener is not None:
+        with opener(path, "rb") as stream:
+            yield _text_id(path.stem), stream
+        return
+
+    with open(path, "rb") as stream:
+        yield _text_id(path.name), stream
+
+
+def _iter_blocks(stream: BinaryIO, encoding: str, errors: str, block_size: int) -> Iterator[str]:
+    """
+    Decode a binary stream incrementally into blocks of text.
+
+    Newlines are translated as in open() text mode, so results match
+    compute_ttr() on text read with Path.read_text().
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder(encoding)(errors), translate=True
+    )
+    for data in iter(lambda: stream.read(block_size), b""):
+        block = decoder.decode(data)
+        if block:
+            yield block
+
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_corpus(
+    path: Union[str, Path],
+    config: Optional[TTRConfig] = None,
+    tokenizer: Optional[Tokenizer] = None,
+    pattern: str = "*",
+    encoding: str = "utf-8",
+    errors: str = "strict",
+    block_size: int = DEFAULT_BLOCK_SIZE,
+) -> Iterator[TTRResult]:
+    """
+    Compute TTR metrics for every text in a compressed file or archive.
+
+    Supports plain text, .gz, .bz2 and .xz files, .zip archives, and .tar
+    archives (optionally compressed as .tar.gz/.tgz, .tar.bz2/.tbz2,
+    .tar.xz/.txz). The text_id of each result is the member path without
+    its extension (e.g. "texts/doyle" for "texts/doyle.txt"). Results are
+    identical to compute_ttr() on the decoded text.
+
+    Args:
+        path: Path to the file or archive
+        config: TTR configuration (optional)
+        tokenizer: Tokenizer to apply (optional)
+        pattern: Glob matched against archive member paths (default: all files)
+        encoding: Text encoding of the members
+        errors: Decoding error handling, as for bytes.decode()
+        block_size: Bytes decompressed and decoded per read
+
+    Yields:
+        One TTRResult per member
+    """
+    tokenizer = tokenizer or Tokenizer()
+    calculator = TTRCalculator(config=config)
+
+    for text_id, stream in _iter_members(Path(path), pattern):
+        blocks = _iter_blocks(stream, encoding, errors, block_size)
+        yield calculator.compute_iter(tokenizer.tokenize_stream(blocks), text_id=text_id)
@@ -0,0 +1,197 @@
+"""
+Resumable, checkpointed corpus jobs.
+
+A CorpusJob computes TTR for a stream of documents, appends each result
+to a JSON Lines output file, and keeps one RunningAggregate per group.
+At intervals it makes the output durable and records its length in a
+checkpoint file, so a checkpoint costs the same however many documents
+are done. If a run dies, the next run with the same paths truncates the
+output back to the last checkpoint, rebuilds the completed text_ids and
+aggregates by reading the output back, skips every document already
+recorded, and carries on, so the final output and aggregates are
+identical to an uninterrupted run.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator, Optional, Union
+
+from stylometry_ttr.batch import BatchRunner, Document, compute_documents
+from stylometry_ttr.models import TTRAggregate, TTRResult
+from stylometry_ttr.tokenizer import Tokenizer
+from stylometry_ttr.ttr import RunningAggregate, TTRConfig, by_author
+
+
+_CHECKPOINT_VERSION = 2
+
+
+class CorpusJob:
+    """
+    Checkpointed TTR computation over a large document stream.
+
+    Documents whose text_id has already been recorded (in this run or a
+    previous one) are skipped, so text_ids must be unique.
+
+    With TTRConfig.type_vocabulary, the vocabulary is saved in each
+    checkpoint and restored on resume, so type signatures written before
+    and after an interruption share the same IDs.
+    """
+
+    def __init__(
+        self,
+        output_path: Union[str, Path],
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        config: Optional[TTRConfig] = None,
+        tokenizer: Optional[Tokenizer] = None,
+        checkpoint_every: int = 100,
+        group_by: Callable[[TTRResult], str] = by_author,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Initialize job.
+
+        Args:
+            output_path: JSON Lines file receiving one TTRResult per line
+            checkpoint_path: Checkpoint file (default: output_path + ".checkpoint")
+            config: TTR configuration (uses defaults if not provided)
+            tokenizer: Tokenizer to apply (uses defaults if not provided)
+            checkpoint_every: Documents computed between checkpoints
+            group_by: Maps a result to its aggregate group (default: author)
+            max_workers: Compute each checkpoint interval with a BatchRunner of
+                this many processes (default: sequential)
+        """
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+
+        self._output_path = Path(output_path)
+        self._checkpoint_path = Path(
+            checkpoint_path if checkpoint_path is not None else f"{output_path}.checkpoint"
+        )
+        self._config = config or TTRConfig()
+        self._tokenizer = tokenizer or Tokenizer()
+        self._checkpoint_every = checkpoint_every
+        self._group_by = group_by
+        self._max_workers = max_workers
+
+        self._groups: dict[str, RunningAggregate] = {}
+        self._completed: set[str] = set()
+        self._output_offset = 0
+
+    @property
+    def completed(self) -> frozenset[str]:
+        """text_ids recorded so far, including those from previous runs."""
+        return frozenset(self._completed)
+
+    def aggregates(self) -> dict[str, TTRAggregate]:
+        """Return the current aggregate for each group."""
+        return {
+            group_id: running.to_aggregate(group_id) for group_id, running in self._groups.items()
+        }
+
+    def run(self, documents: Iterable[Document]) -> dict[str, TTRAggregate]:
+        """
+        Compute and record results for every document not yet completed.
+
+        Args:
+            documents: Documents (or (text_id, text[, title[, author]]) tuples)
+
+        Returns:
+            Aggregate for each group over all completed documents
+        """
+        self._load_checkpoint()
+        pending = (Document(*doc) for doc in documents)
+
+        with open(self._output_path, "a+b") as output:
+            # Drop results written after the last checkpoint; they are recomputed
+            if output.seek(0, os.SEEK_END) < self._output_offset:
+                raise ValueError(
+                    f"{self._output_path} is shorter than its checkpoint records; "
+                    "delete the checkpoint to start over"
+                )
+            output.truncate(self._output_offset)
+            self._replay(output)
+
+            for batch in iter(lambda: self._next_batch(pending), []):
+                for result in self._compute(batch):
+                    output.write(result.model_dump_json().encode("utf-8") + b"\n")
+                    self._record(result)
+                self._save_checkpoint(output)
+
+        return self.aggregates()
+
+    def _next_batch(self, pending: Iterator[Document]) -> list[Document]:
+        """Take the next checkpoint interval of documents, dropping repeated text_ids."""
+        batch: list[Document] = []
+        seen: set[str] = set()
+        for doc in pending:
+            if doc.text_id in seen or doc.text_id in self._completed:
+                continue
+            seen.add(doc.text_id)
+            batch.append(doc)
+            if len(batch) == self._checkpoint_every:
+                break
+        return batch
+
+    def _compute(self, batch: list[Document]) -> list[TTRResult]:
+        """Compute results for one checkpoint interval."""
+        if self._max_workers is None:
+            return compute_documents(batch, self._config, self._tokenizer)
+        runner = BatchRunner(
+            config=self._config, tokenizer=self._tokenizer, max_workers=self._max_workers
+        )
+        return runner.run(batch)
+
+    def _record(self, result: TTRResult) -> None:
+        """Add a result to the completed set and its group aggregate."""
+        self._completed.add(result.text_id)
+        group_id = self._group_by(result)
+        self._groups.setdefault(group_id, RunningAggregate()).add(result)
+
+    def _replay(self, output: BinaryIO) -> None:
+        """Record every result in the (truncated) output, leaving it positioned at the end."""
+        output.seek(0)
+        for line in output:
+            self._record(TTRResult.model_validate_json(line))
+
+    def _load_checkpoint(self) -> None:
+        """Restore the output offset and vocabulary from the checkpoint file, or start fresh."""
+        self._groups = {}
+        self._completed = set()
+        self._output_offset = 0
+
+        if not self._checkpoint_path.exists():
+            return
+
+        state = json.loads(self._checkpoint_path.read_text(encoding="utf-8"))
+        # Version 1 also saved the completed set and aggregates, which are now rebuilt
+        if state.get("version") not in (1, _CHECKPOINT_VERSION):
+            raise ValueError(f"Unsupported checkpoint version in {self._checkpoint_path}")
+
+        self._output_offset = state["output_offset"]
+
+        vocabulary = self._config.type_vocabulary
+        if vocabulary is not None and "vocabulary" in state:
+            saved = state["vocabulary"]
+            if vocabulary.to_list()[: len(saved)] != saved[: len(vocabulary)]:
+                raise ValueError(
+                    f"type_vocabulary does not match the vocabulary in {self._checkpoint_path}"
+                )
+            vocabulary.update(saved)
+
+    def _save_checkpoint(self, output: BinaryIO) -> None:
+        """Make the output durable, then atomically replace the checkpoint."""
+        output.flush()
+        os.fsync(output.fileno())
+        self._output_offset = output.tell()
+
+        state = {"version": _CHECKPOINT_VERSION, "output_offset": self._output_offset}
+        if self._config.type_vocabulary is not None:
+            state["vocabulary"] = self._config.type_vocabulary.to_list()
+
+        temp_path = self._checkpoint_path.with_name(self._checkpoint_path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(state, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self._checkpoint_path)
@@ -0,0 +1,347 @@
+"""
+MinHash signatures and vocabulary-overlap search.
+
+A MinHash signature estimates the Jaccard overlap of two texts' type
+sets from a fixed number of slots, however large the vocabularies are.
+Signatures use one-permutation hashing: each type is hashed once with a
+stable 64-bit hash that picks a slot and a value, and each slot keeps its
+minimum. Slots that no type reached are filled by optimal densification
+(borrowing the value of a slot chosen by a data-independent probe
+sequence), so even short texts give unbiased estimates.
+
+MinHashIndex buckets signatures by bands of slots (locality-sensitive
+hashing) so that the most similar texts to a query are found by
+comparing only against texts that share a bucket, not the whole corpus.
+"""
+
+import random
+from collections import defaultdict
+from functools import lru_cache
+from hashlib import blake2b
+from typing import Iterable, Iterator, Optional, Sequence
+
+from stylometry_ttr.models import MinHashSignature, TTRResult
+
+
+DEFAULT_NUM_PERM = 128
+
+
+DEFAULT_SHINGLE_SIZE = 5
+
+
+def _stable_hash(word: str, seed: int) -> int:
+    """Stable 64-bit hash of a string (independent of PYTHONHASHSEED)."""
+    digest = blake2b(word.encode("utf-8"), digest_size=8, key=seed.to_bytes(8, "little"))
+    return int.from_bytes(digest.digest(), "little")
+
+
+# Types recur across texts, so their hashes are memoized
+_type_hash = lru_cache(maxsize=1 << 20)(_stable_hash)
+
+
+def minhash_signature(
+    types: Iterable[str], num_perm: int = DEFAULT_NUM_PERM, seed: int = 0
+) -> MinHashSignature:
+    """
+    Compute the MinHash signature of a set of types.
+
+    Args:
+        types: Types of one text (duplicates are ignored)
+        num_perm: Signature slots; more slots give lower estimation error
+        seed: Hash seed; only signatures with the same seed are comparable
+
+    Returns:
+        MinHashSignature with num_perm slots
+    """
+    return _signature((_type_hash(word, seed) for word in types), num_perm, seed)
+
+
+def shingle_signature(
+    text: str,
+    num_perm: int = DEFAULT_NUM_PERM,
+    shingle_size: int = DEFAULT_SHINGLE_SIZE,
+    seed: int = 0,
+) -> MinHashSignature:
+    """
+    Compute the MinHash signature of a raw text's word shingles.
+
+    A cheap near-duplicate fingerprint: words are the lowercased
+    whitespace-separated runs of the raw text (no tokenization), and a
+    shingle is a run of shingle_size consecutive words. Texts with fewer
+    words form a single shingle. Unlike type signatures, shingles capture
+    word order, so reordered texts with the same vocabulary do not match.
+
+    Args:
+        text: Raw input text
+        num_perm: Signature slots
+        shingle_size: Words per shingle
+        seed: Hash seed; only signatures with the same seed are comparable
+
+    Returns:
+        MinHashSignature with num_perm slots
+    """
+    if shingle_size < 1:
+        raise ValueError("shingle_size must be at least 1")
+    words = text.lower().split()
+    hashed = [_type_hash(word, seed) for word in words]
+    size = min(shingle_size, len(hashed))
+    # Tuples of ints hash deterministically (unlike tuples of strings), so each
+    # shingle costs one C-level hash; negative hashes still pick valid slots.
+    shingles = set(map(hash, zip(*(hashed[k:] for k in range(size)))))
+    return _signature(shingles, num_perm, seed)
+
+
+@lru_cache(maxsize=8)
+def _probe_orders(
+    seed: int, num_perm: int
+) -> tuple[tuple[tuple[int, ...], ...], tuple[tuple[int, ...], ...]]:
+    """
+    Densification probe order of every slot, drawn once per (seed, num_perm).
+
+    Returns:
+        For each slot, the other slots in the order its probe sequence first
+        visits them, and the rank of every slot in that order
+    """
+    orders = []
+    ranks = []
+    for i in range(num_perm):
+        probe = random.Random(f"{seed}:{num_perm}:{i}")
+        rank = [-1] * num_perm
+        order: list[int] = []
+        while len(order) < num_perm:
+            j = probe.randrange(num_perm)
+            if rank[j] < 0:
+                rank[j] = len(order)
+                order.append(j)
+        orders.append(tuple(order))
+        ranks.append(tuple(rank))
+    return tuple(orders), tuple(ranks)
+
+
+def _signature(hashes: Iterable[int], num_perm: int, seed: int) -> MinHashSignature:
+    """One-permutation MinHash of (signed or unsigned) 64-bit hashes, densified."""
+    empty = MinHashSignature.EMPTY
+    slots = [empty] * num_perm
+    for h in hashes:
+        slot = h % num_perm
+        value = (h // num_perm) % empty
+        if value < slots[slot]:
+            slots[slot] = value
+
+    missing = [i for i, value in enumerate(slots) if value == empty]
+    if missing and len(missing) < num_perm:
+        filled = slots[:]
+        orders, ranks = _probe_orders(seed, num_perm)
+        present = [j for j, value in enumerate(filled) if value != empty]
+        # Each empty slot borrows from the first filled slot its probe sequence
+        # visits: with few filled slots, compare their ranks; otherwise the
+        # probe order reaches one within a few steps.
+        if len(present) ** 2 < num_perm:
+            for i in missing:
+                slots[i] = filled[min(present, key=ranks[i].__getitem__)]
+        else:
+            for i in missing:
+                slots[i] = next(filled[j] for j in orders[i] if filled[j] != empty)
+
+    return MinHashSignature(slots)
+
+
+def overlap_matrix(signatures: Sequence[MinHashSignature]) -> list[list[float]]:
+    """
+    Estimate the Jaccard vocabulary overlap of every pair of texts.
+
+    Compares all pairs, so use MinHashIndex for large corpora.
+
+    Args:
+        signatures: One signature per text
+
+    Returns:
+        Symmetric matrix of estimates with 1.0 on the diagonal
+        (0.0 for texts with no types)
+    """
+    n = len(signatures)
+    matrix = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        if not signatures[i].is_empty:
+            matrix[i][i] = 1.0
+        for j in range(i + 1, n):
+            matrix[i][j] = matrix[j][i] = signatures[i].jaccard(signatures[j])
+    return matrix
+
+
+def _choose_bands(num_perm: int, threshold: float) -> tuple[int, int]:
+    """
+    Pick (bands, rows) so that pairs near the threshold start to collide.
+
+    Two signatures with Jaccard overlap s share at least one bucket with
+    probability 1 - (1 - s^rows)^bands, which rises steeply around
+    (1 / bands)^(1 / rows).
+    """
+    best = (1, num_perm)
+    best_error = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashIndex:
+    """
+    Locality-sensitive hashing index for top-k vocabulary-overlap queries.
+
+    Each signature is cut into bands of consecutive slots; texts whose
+    signatures agree on every slot of some band share a bucket and become
+    candidates. Candidates are ranked by their estimated Jaccard overlap.
+    Texts much less similar than the threshold are rarely candidates, so
+    results are approximate: a query may return fewer than k texts.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = DEFAULT_NUM_PERM,
+        threshold: float = 0.5,
+        bands: Optional[int] = None,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            num_perm: Slots per signature
+            threshold: Jaccard overlap around which texts become candidates
+            bands: Number of bands (default: chosen from threshold)
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if bands is None:
+            bands, rows = _choose_bands(num_perm, threshold)
+        else:
+            if not 1 <= bands <= num_perm:
+                raise ValueError("bands must be between 1 and num_perm")
+            rows = num_perm // bands
+
+        self._num_perm = num_perm
+        self._bands = bands
+        self._rows = rows
+        self._buckets: list[defaultdict[bytes, list[str]]] = [
+            defaultdict(list) for _ in range(bands)
+        ]
+        self._signatures: dict[str, MinHashSignature] = {}
+
+    @classmethod
+    def from_results(
+        cls, results: Iterable[TTRResult], threshold: float = 0.5, bands: Optional[int] = None
+    ) -> "MinHashIndex":
+        """
+        Build an index from results computed with TTRConfig.minhash_permutations.
+
+        Results are keyed by text_id.
+        """
+        index: Optional[MinHashIndex] = None
+        for result in results:
+            if result.minhash is None:
+                raise ValueError(f"Result {result.text_id!r} has no MinHash signature")
+            if index is None:
+                index = cls(len(result.minhash), threshold=threshold, bands=bands)
+            index.add(result.text_id, result.minhash)
+        return index if index is not None else cls(threshold=threshold, bands=bands)
+
+    @property
+    def bands(self) -> int:
+        return self._bands
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._signatures
+
+    def add(self, key: str, signature: MinHashSignature) -> None:
+        """
+        Add a signature under a unique key.
+
+        Signatures of empty type sets are stored but never become candidates.
+
+        Raises:
+            ValueError: If the key is already present or the length is wrong
+        """
+        if key in self._signatures:
+            raise ValueError(f"Key {key!r} is already in the index")
+        if len(signature) != self._num_perm:
+            raise ValueError(f"Expected a signature of {self._num_perm} slots")
+        self._signatures[key] = signature
+        if signature.is_empty:
+            return
+        for band, bucket in zip(self._buckets, self._band_keys(signature)):
+            band[bucket].append(key)
+
+    def candidates(self, signature: MinHashSignature) -> set[str]:
+        """Keys sharing at least one bucket with a signature."""
+        found: set[str] = set()
+        if signature.is_empty:
+            return found
+        for band, bucket in zip(self._buckets, self._band_keys(signature)):
+            found.update(band.get(bucket, ()))
+        return found
+
+    def query(self, signature: MinHashSignature, k: int = 10) -> list[tuple[str, float]]:
+        """
+        Find the k indexed texts with the highest estimated overlap.
+
+        Args:
+            signature: Signature to compare against
+            k: Maximum number of texts to return
+
+        Returns:
+            (key, estimated Jaccard overlap) pairs, most similar first
+        """
+        return self._rank(signature, self.candidates(signature), k)
+
+    def top_k(self, key: str, k: int = 10) -> list[tuple[str, float]]:
+        """Find the k texts most similar to an indexed text, excluding itself."""
+        signature = self._signatures[key]
+        found = self.candidates(signature)
+        found.discard(key)
+        return self._rank(signature, found, k)
+
+    def similar_pairs(self, min_similarity: float = 0.0) -> Iterator[tuple[str, str, float]]:
+        """
+        Yield each candidate pair once with its estimated overlap.
+
+        Args:
+            min_similarity: Skip pairs estimated below this overlap
+
+        Yields:
+            (key, key, estimated Jaccard overlap), keys in insertion order
+        """
+        order = {key: i for i, key in enumerate(self._signatures)}
+        seen: set[tuple[str, str]] = set()
+        for band in self._buckets:
+            for keys in band.values():
+                for i, left in enumerate(keys):
+                    for right in keys[i + 1 :]:
+                        pair = (left, right) if order[left] < order[right] else (right, left)
+                        if pair in seen:
+                            continue
+                        seen.add(pair)
+                        similarity = self._signatures[left].jaccard(self._signatures[right])
+                        if similarity >= min_similarity:
+                            yield pair[0], pair[1], similarity
+
+    def _band_keys(self, signature: MinHashSignature) -> Iterator[bytes]:
+        values = signature.values
+        for band in range(self._bands):
+            start = band * self._rows
+            yield values[start : start + self._rows].tobytes()
+
+    def _rank(
+        self, signature: MinHashSignature, keys: Iterable[str], k: int
+    ) -> list[tuple[str, float]]:
+        scored = [(key, signature.jaccard(self._signatures[key])) for key in keys]
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:k]
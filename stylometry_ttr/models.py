@@ -4,10 +4,14 @@ Pydantic models for TTR computation.
 These models define the data structures for TTR results and aggregates.
 """
 
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Iterable, Iterator, Optional, Union, overload
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
 
 
 class ChunkTTR(BaseModel):
@@ -19,6 +23,254 @@ class ChunkTTR(BaseModel):
     ttr: float = Field(..., ge=0.0, le=1.0, description="TTR for this chunk")
 
 
+class ChunkSeries(Sequence[ChunkTTR]):
+    """
+    Compact per-chunk TTR values backed by a float array.
+
+    Chunk numbers are implicit: the value at index i belongs to chunk i + 1.
+    ChunkTTR objects are only created when the series is indexed or iterated,
+    and the series serializes as a plain numeric array.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Iterable[float]):
+        """
+        Initialize series.
+
+        Args:
+            values: TTR of each chunk, in chunk order
+        """
+        self._values = array("d", values)
+
+    @property
+    def values(self) -> memoryview:
+        """Read-only view of the chunk TTR values."""
+        return memoryview(self._values).toreadonly()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @overload
+    def __getitem__(self, index: int) -> ChunkTTR: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ChunkTTR]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[ChunkTTR, list[ChunkTTR]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._values)))]
+        if index < 0:
+            index += len(self._values)
+            if index < 0:
+                raise IndexError("ChunkSeries index out of range")
+        return ChunkTTR(chunk_number=index + 1, ttr=self._values[index])
+
+    def __iter__(self) -> Iterator[ChunkTTR]:
+        for i, ttr in enumerate(self._values, start=1):
+            yield ChunkTTR(chunk_number=i, ttr=ttr)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, ChunkSeries):
+            return self._values == other._values
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ChunkSeries({self._values.tolist()!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from_floats = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.float_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_floats,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_floats]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda series: series._values.tolist()
+            ),
+        )
+
+
+class TypeSignature(Sequence[int]):
+    """
+    Compact set of a text's types as sorted IDs in a shared Vocabulary.
+
+    Signatures from the same Vocabulary can be unioned to count the pooled
+    vocabulary of a group without re-tokenizing its texts. The signature
+    serializes as a plain integer array.
+    """
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids: Iterable[int]):
+        """
+        Initialize signature.
+
+        Args:
+            ids: Vocabulary IDs of the text's types (sorted and deduplicated here)
+        """
+        self._ids = array("I", sorted(set(ids)))
+
+    @property
+    def ids(self) -> memoryview:
+        """Read-only view of the sorted type IDs."""
+        return memoryview(self._ids).toreadonly()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, list[int]]:
+        if isinstance(index, slice):
+            return self._ids[index].tolist()
+        return self._ids[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __contains__(self, value: object) -> bool:
+        if not isinstance(value, int):
+            return False
+        i = bisect_left(self._ids, value)
+        return i < len(self._ids) and self._ids[i] == value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TypeSignature):
+            return self._ids == other._ids
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TypeSignature({self._ids.tolist()!r})"
+
+    @classmethod
+    def union(cls, signatures: Iterable["TypeSignature"]) -> "TypeSignature":
+        """Return the signature of the combined vocabulary of several texts."""
+        return cls(set().union(*(signature._ids for signature in signatures)))
+
+    @staticmethod
+    def union_size(signatures: Iterable["TypeSignature"]) -> int:
+        """Count the distinct types across several signatures."""
+        return len(set().union(*(signature._ids for signature in signatures)))
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from_ints = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.int_schema(ge=0))
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_ints,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_ints]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda signature: signature._ids.tolist()
+            ),
+        )
+
+
+class MinHashSignature(Sequence[int]):
+    """
+    MinHash sketch of a text's type set.
+
+    Each slot holds a 32-bit minimum hash value. The fraction of slots two
+    signatures share estimates the Jaccard overlap of their vocabularies.
+    The signature serializes as a plain integer array.
+    """
+
+    __slots__ = ("_values",)
+
+    EMPTY = 0xFFFFFFFF  # Every slot of the signature of an empty type set
+
+    def __init__(self, values: Iterable[int]):
+        """
+        Initialize signature.
+
+        Args:
+            values: Minimum hash value of each slot
+        """
+        self._values = array("I", values)
+
+    @property
+    def values(self) -> memoryview:
+        """Read-only view of the slot values."""
+        return memoryview(self._values).toreadonly()
+
+    @property
+    def is_empty(self) -> bool:
+        """True if this is the signature of an empty type set."""
+        return not self._values or self._values[0] == self.EMPTY
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[int]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, list[int]]:
+        if isinstance(index, slice):
+            return self._values[index].tolist()
+        return self._values[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, MinHashSignature):
+            return self._values == other._values
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"MinHashSignature({self._values.tolist()!r})"
+
+    def jaccard(self, other: "MinHashSignature") -> float:
+        """
+        Estimate the Jaccard overlap of two texts' vocabularies.
+
+        Returns 0.0 if either type set is empty.
+
+        Raises:
+            ValueError: If the signatures have different lengths
+        """
+        if len(self._values) != len(other._values):
+            raise ValueError("Cannot compare MinHash signatures of different lengths")
+        if self.is_empty or other.is_empty:
+            return 0.0
+        matches = sum(a == b for a, b in zip(self._values, other._values))
+        return matches / len(self._values)
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from_ints = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.int_schema(ge=0, le=cls.EMPTY))
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_ints,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_ints]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda signature: signature._values.tolist()
+            ),
+        )
+
+
 class TTRResult(BaseModel):
     """Type-Token Ratio results for a single text."""
 
@@ -36,7 +288,13 @@ class TTRResult(BaseModel):
         None, ge=0.0, le=1.0, description="Standardized TTR (1000-word chunks)"
     )
     sttr_std: Optional[float] = Field(None, ge=0.0, description="STTR standard deviation")
+    sttr_se: Optional[float] = Field(
+        None, ge=0.0, description="Standard error of a sampled STTR estimate"
+    )
     chunk_count: Optional[int] = Field(None, ge=0, description="Number of chunks for STTR")
+    sttr_sample_count: Optional[int] = Field(
+        None, ge=0, description="Chunks evaluated for a sampled STTR estimate"
+    )
 
     # Delta metrics: TTR(n) - TTR(n-1) between consecutive chunks
     delta_mean: Optional[float] = Field(None, description="Mean of chunk-to-chunk TTR deltas")
@@ -45,10 +303,20 @@ class TTRResult(BaseModel):
     delta_max: Optional[float] = Field(None, description="Largest positive swing")
 
     # Per-chunk TTR data (opt-in via TTRConfig.return_chunk_details)
-    chunk_ttrs: Optional[list[ChunkTTR]] = Field(
+    chunk_ttrs: Optional[Union[ChunkSeries, list[ChunkTTR]]] = Field(
         None, description="Per-chunk TTR values (1-indexed)"
     )
 
+    # Vocabulary IDs of the text's types (opt-in via TTRConfig.type_vocabulary)
+    type_signature: Optional[TypeSignature] = Field(
+        None, description="Sorted shared-vocabulary IDs of the text's types"
+    )
+
+    # MinHash sketch of the text's types (opt-in via TTRConfig.minhash_permutations)
+    minhash: Optional[MinHashSignature] = Field(
+        None, description="MinHash signature of the text's types"
+    )
+
     def to_json(self, indent: int = 2, exclude_none: bool = True) -> str:
         """Return JSON string representation."""
         return self.model_dump_json(indent=indent, exclude_none=exclude_none)
@@ -72,8 +340,12 @@ class TTRResult(BaseModel):
             lines.append(f"| {'STTR':<26} | {self.sttr:>27.6f} |")
         if self.sttr_std is not None:
             lines.append(f"| {'STTR Std':<26} | {self.sttr_std:>27.6f} |")
+        if self.sttr_se is not None:
+            lines.append(f"| {'STTR Std Error':<26} | {self.sttr_se:>27.6f} |")
         if self.chunk_count is not None:
             lines.append(f"| {'Chunk Count':<26} | {self.chunk_count:>27} |")
+        if self.sttr_sample_count is not None:
+            lines.append(f"| {'Sampled Chunks':<26} | {self.sttr_sample_count:>27} |")
         if self.delta_mean is not None:
             lines.append(f"| {'Delta Mean':<26} | {self.delta_mean:>27.6f} |")
         if self.delta_std is not None:
@@ -90,6 +362,29 @@ class TTRResult(BaseModel):
         return self.to_table()
 
 
+class STTREstimate(BaseModel):
+    """STTR of a text estimated from sampled windows of its raw text."""
+
+    model_config = ConfigDict(frozen=True)
+
+    text_id: str = Field(..., description="Unique identifier for the text")
+    title: str = Field(default="", description="Title of the text")
+    author: str = Field(default="", description="Author identifier")
+    sttr: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Estimated STTR (None if text too short)"
+    )
+    sttr_std: Optional[float] = Field(None, ge=0.0, description="Std dev of sampled chunk TTRs")
+    sttr_se: Optional[float] = Field(None, ge=0.0, description="Standard error of the estimate")
+    sttr_sample_count: Optional[int] = Field(None, ge=0, description="Chunks evaluated")
+    windowed: bool = Field(
+        ..., description="Whether only sampled windows were tokenized, not the whole text"
+    )
+
+    def to_json(self, indent: int = 2, exclude_none: bool = True) -> str:
+        """Return JSON string representation."""
+        return self.model_dump_json(indent=indent, exclude_none=exclude_none)
+
+
 class TTRAggregate(BaseModel):
     """Aggregated TTR statistics for a collection of texts."""
 
@@ -116,6 +411,14 @@ class TTRAggregate(BaseModel):
 
     delta_std_mean: Optional[float] = None
 
+    # Pooled vocabulary of the whole group (requires type signatures on every result)
+    pooled_unique_words: Optional[int] = Field(
+        None, ge=0, description="Distinct types across all texts in the group"
+    )
+    pooled_ttr: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Pooled TTR: pooled_unique_words/total_words"
+    )
+
     generated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
     def to_json(self, indent: int = 2, exclude_none: bool = True) -> str:
@@ -148,6 +451,10 @@ class TTRAggregate(BaseModel):
             lines.append(f"| {'STTR Std':<26} | {self.sttr_std:>27.6f} |")
         if self.delta_std_mean is not None:
             lines.append(f"| {'Delta Std Mean':<26} | {self.delta_std_mean:>27.6f} |")
+        if self.pooled_unique_words is not None:
+            lines.append(f"| {'Pooled Unique Words':<26} | {self.pooled_unique_words:>27,} |")
+        if self.pooled_ttr is not None:
+            lines.append(f"| {'Pooled TTR':<26} | {self.pooled_ttr:>27.6f} |")
         lines.append(f"+{'-' * 28}+{'-' * 29}+")
         return "\n".join(lines)
 
@@ -0,0 +1,692 @@
+"""
+Local HTTP scoring service.
+
+ScoringServer exposes compute_ttr() and TTRAggregator over JSON on a
+stdlib HTTP server. Documents are computed in a pool of worker processes
+that is started once and kept warm, so request threads only parse JSON
+and wait. Requests that arrive close together are coalesced into
+micro-batches that share one round trip to a worker; documents above a
+size threshold are dispatched on their own so a novel-length text never
+holds up a batch of short ones. If a worker process dies, the broken
+pool is replaced with a fresh one; only the batches that were in flight
+on it fail.
+
+Endpoints:
+    POST /ttr        One document, or {"documents": [...]}
+    POST /aggregate  {"group_id": ..., "results": [TTRResult, ...]}
+    GET  /metrics    Latency and throughput statistics
+    GET  /health     Liveness and worker pool state
+
+Run from the command line with ``python -m stylometry_ttr.server``.
+"""
+
+import argparse
+import dataclasses
+import json
+import math
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from stylometry_ttr.batch import Document, compute_documents
+from stylometry_ttr.models import TTRResult
+from stylometry_ttr.tokenizer import Tokenizer
+from stylometry_ttr.ttr import TTRAggregator, TTRConfig
+
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_BATCH_WINDOW = 0.005  # Seconds to wait for more requests to join a batch
+DEFAULT_LARGE_DOCUMENT_SIZE = 100_000  # Characters; larger documents run alone
+DEFAULT_LATENCY_WINDOW = 1024  # Most recent requests kept for percentiles
+
+_MAX_BODY_SIZE = 256 * 1024 * 1024
+
+
+class _BadRequest(ValueError):
+    """A request body that cannot be served."""
+
+
+class _Pending(NamedTuple):
+    """A document waiting to be dispatched, with the future its caller waits on."""
+
+    document: Document
+    config: TTRConfig
+    future: "Future[TTRResult]"
+
+
+def _warm_worker(tokenizer: Tokenizer) -> None:
+    """Import the library and exercise the tokenizer in a fresh worker."""
+    tokenizer.tokenize("warm up")
+
+
+def _noop() -> None:
+    """Probe task: submitting it fails at once if the pool is broken."""
+
+
+def _percentile(ordered: list[float], percent: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(math.ceil(percent / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+# =============================================================================
+# METRICS
+# =============================================================================
+
+
+class ServiceMetrics:
+    """
+    Thread-safe request, batch and latency counters for a ScoringServer.
+
+    Latency percentiles cover the most recent requests only; counts and
+    rates cover the lifetime of the server.
+    """
+
+    def __init__(self, latency_window: int = DEFAULT_LATENCY_WINDOW):
+        """
+        Initialize counters.
+
+        Args:
+            latency_window: Number of recent request latencies kept for percentiles
+        """
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._latencies: deque[float] = deque(maxlen=latency_window)
+        self._requests = 0
+        self._errors = 0
+        self._documents = 0
+        self._batches = 0
+        self._batched_documents = 0
+
+    def record_request(self, latency: float, documents: int = 0, error: bool = False) -> None:
+        """Record one completed HTTP request and the documents it scored."""
+        with self._lock:
+            self._requests += 1
+            self._documents += documents
+            if error:
+                self._errors += 1
+            self._latencies.append(latency)
+
+    def record_batch(self, size: int) -> None:
+        """Record one batch dispatched to the worker pool."""
+        with self._lock:
+            self._batches += 1
+            self._batched_documents += size
+
+    def snapshot(self, queue_depth: int = 0) -> dict[str, Any]:
+        """
+        Return current statistics as a JSON-serializable dict.
+
+        Args:
+            queue_depth: Documents waiting to be dispatched
+
+        Returns:
+            Counters, rates (per second) and latency percentiles (milliseconds)
+        """
+        with self._lock:
+            uptime = time.perf_counter() - self._started
+            latencies = sorted(self._latencies)
+            stats: dict[str, Any] = {
+                "uptime_seconds": uptime,
+                "requests": self._requests,
+                "errors": self._errors,
+                "documents": self._documents,
+                "batches": self._batches,
+                "mean_batch_size": (
+                    self._batched_documents / self._batches if self._batches else None
+                ),
+                "requests_per_second": self._requests / uptime if uptime else None,
+                "documents_per_second": self._documents / uptime if uptime else None,
+                "queue_depth": queue_depth,
+            }
+
+        if latencies:
+            stats["latency_ms"] = {
+                "count": len(latencies),
+                "mean": sum(latencies) / len(latencies) * 1000,
+                "p50": _percentile(latencies, 50) * 1000,
+                "p90": _percentile(latencies, 90) * 1000,
+                "p99": _percentile(latencies, 99) * 1000,
+                "max": latencies[-1] * 1000,
+            }
+        else:
+            stats["latency_ms"] = None
+        return stats
+
+
+# =============================================================================
+# MICRO-BATCHING
+# =============================================================================
+
+
+class _MicroBatcher:
+    """
+    Coalesces submitted documents into batches for a warm process pool.
+
+    A batch is dispatched when it reaches max_batch_size documents or
+    large_document_size characters, or when batch_window seconds have
+    passed since its first document arrived. Documents of at least
+    large_document_size characters are dispatched immediately on their own.
+
+    When the pool turns out to be broken, replace_pool(broken) is called for
+    a fresh one: a failed submission is retried once on it, while callers of
+    a batch that was in flight when a worker died receive the error.
+    """
+
+    def __init__(
+        self,
+        pool: ProcessPoolExecutor,
+        replace_pool: Callable[[ProcessPoolExecutor], ProcessPoolExecutor],
+        tokenizer: Tokenizer,
+        metrics: ServiceMetrics,
+        max_batch_size: int,
+        batch_window: float,
+        large_document_size: int,
+    ):
+        self._pool = pool
+        self._replace_pool = replace_pool
+        self._tokenizer = tokenizer
+        self._metrics = metrics
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._large_document_size = large_document_size
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, name="ttr-batcher", daemon=True)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Dispatch whatever is queued, then stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(self, document: Document, config: TTRConfig) -> "Future[TTRResult]":
+        """Queue a document; the returned future resolves to its TTRResult."""
+        future: "Future[TTRResult]" = Future()
+        self._queue.put(_Pending(document, config, future))
+        return future
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            if len(first.document.text) >= self._large_document_size:
+                self._dispatch([first])
+                continue
+
+            batch = [first]
+            size = len(first.document.text)
+            deadline = time.monotonic() + self._batch_window
+            stopping = False
+            while len(batch) < self._max_batch_size and size < self._large_document_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                if len(pending.document.text) >= self._large_document_size:
+                    self._dispatch([pending])
+                    continue
+                batch.append(pending)
+                size += len(pending.document.text)
+
+            self._dispatch(batch)
+            if stopping:
+                return
+
+    def _dispatch(self, batch: list[_Pending]) -> None:
+        """Submit a batch to the pool, one task per distinct configuration."""
+        groups: list[tuple[TTRConfig, list[_Pending]]] = []
+        for pending in batch:
+            for config, members in groups:
+                if config == pending.config:
+                    members.append(pending)
+                    break
+            else:
+                groups.append((pending.config, [pending]))
+
+        for config, members in groups:
+            self._metrics.record_batch(len(members))
+            documents = [pending.document for pending in members]
+            pool = self._pool
+            try:
+                try:
+                    task = pool.submit(compute_documents, documents, config, self._tokenizer)
+                except BrokenProcessPool:
+                    # A worker died since the last batch; retry once on a fresh pool
+                    pool = self._pool = self._replace_pool(pool)
+                    task = pool.submit(compute_documents, documents, config, self._tokenizer)
+            except Exception as exc:
+                for pending in members:
+                    pending.future.set_exception(exc)
+                continue
+            task.add_done_callback(
+                lambda done, pool=pool, members=members: self._resolve(done, pool, members)
+            )
+
+    def _resolve(
+        self, task: "Future[list[TTRResult]]", pool: ProcessPoolExecutor, members: list[_Pending]
+    ) -> None:
+        """Hand each caller its result, or the batch's exception."""
+        exc = task.exception()
+        if exc is not None:
+            if isinstance(exc, BrokenProcessPool):
+                try:
+                    self._pool = self._replace_pool(pool)
+                except RuntimeError:
+                    pass  # Shutting down
+            for pending in members:
+                pending.future.set_exception(exc)
+            return
+        for pending, result in zip(members, task.result()):
+            pending.future.set_result(result)
+
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Routes JSON requests to the owning ScoringServer."""
+
+    server: "_HTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        service = self.server.service
+        if self.path == "/metrics":
+            self._send(HTTPStatus.OK, service.metrics_snapshot())
+        elif self.path == "/health":
+            health = service.health()
+            status = HTTPStatus.OK if health["status"] == "ok" else HTTPStatus.SERVICE_UNAVAILABLE
+            self._send(status, health)
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self) -> None:
+        service = self.server.service
+        routes = {"/ttr": service._handle_ttr, "/aggregate": service._handle_aggregate}
+        handler = routes.get(self.path)
+        if handler is None:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {self.path}"})
+            return
+
+        started = time.perf_counter()
+        documents = 0
+        try:
+            body = self._read_json()
+            payload, documents = handler(body)
+            status = HTTPStatus.OK
+        except (_BadRequest, ValidationError) as exc:
+            payload, status = {"error": str(exc)}, HTTPStatus.BAD_REQUEST
+        except Exception as exc:
+            payload, status = {"error": repr(exc)}, HTTPStatus.INTERNAL_SERVER_ERROR
+
+        self._send(status, payload)
+        service.metrics.record_request(
+            time.perf_counter() - started, documents=documents, error=status != HTTPStatus.OK
+        )
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > _MAX_BODY_SIZE:
+            raise _BadRequest("Request body too large")
+        try:
+            return json.loads(self.rfile.read(length) or b"null")
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise _BadRequest(f"Invalid JSON: {exc}") from exc
+
+    def _send(self, status: HTTPStatus, payload: Any) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence per-request logging; see /metrics instead."""
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], service: "ScoringServer"):
+        super().__init__(address, _Handler)
+        self.service = service
+
+
+class ScoringServer:
+    """
+    HTTP service computing TTR results in warm worker processes.
+
+    POST /ttr accepts {"text_id", "text", "title"?, "author"?, "chunk_size"?,
+    "return_chunks"?} and returns the TTRResult as JSON, or accepts
+    {"documents": [...]} and returns {"results": [...]} in input order.
+    POST /aggregate accepts {"group_id", "results": [TTRResult, ...]} and
+    returns the TTRAggregate. Results are identical to compute_ttr() and
+    TTRAggregator.aggregate().
+
+    Use as a context manager, or call start() and shutdown():
+
+        with ScoringServer(port=8000) as server:
+            server.serve_forever()
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        config: Optional[TTRConfig] = None,
+        tokenizer: Optional[Tokenizer] = None,
+        max_workers: Optional[int] = None,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+        large_document_size: int = DEFAULT_LARGE_DOCUMENT_SIZE,
+        latency_window: int = DEFAULT_LATENCY_WINDOW,
+    ):
+        """
+        Initialize server. Nothing is bound or started until start().
+
+        Args:
+            host: Interface to bind (default: localhost only)
+            port: Port to bind (0 picks a free port; see address)
+            config: Default TTR configuration for requests
+            tokenizer: Tokenizer to apply (uses defaults if not provided)
+            max_workers: Worker processes (default: CPU count)
+            max_batch_size: Most documents coalesced into one worker task
+            batch_window: Seconds a batch waits for more documents to join
+            large_document_size: Characters at which a document is dispatched alone
+            latency_window: Recent request latencies kept for /metrics percentiles
+
+        Raises:
+            ValueError: If a limit is out of range, or config has a
+                type_vocabulary (worker processes cannot share it)
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if batch_window < 0:
+            raise ValueError("batch_window must not be negative")
+        if config is not None and config.type_vocabulary is not None:
+            raise ValueError(
+                "type_vocabulary cannot be shared with worker processes; "
+                "ScoringServer requires type_vocabulary=None"
+            )
+
+        self._address = (host, port)
+        self._config = config or TTRConfig()
+        self._tokenizer = tokenizer or Tokenizer()
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._max_batch_size = max_batch_size
+        self._batch_window = batch_window
+        self._large_document_size = large_document_size
+        self.metrics = ServiceMetrics(latency_window)
+
+        self._aggregator = TTRAggregator()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._pool_restarts = 0
+        self._batcher: Optional[_MicroBatcher] = None
+        self._httpd: Optional[_HTTPServer] = None
+        self._serve_thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """(host, port) the server is bound to."""
+        if self._httpd is None:
+            return self._address
+        host, port = self._httpd.server_address[:2]
+        return host, port
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ScoringServer":
+        """Start the worker pool, bind the socket and begin serving in the background."""
+        if self._httpd is not None:
+            raise RuntimeError("Server already started")
+
+        self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+        warmups = [
+            self._pool.submit(_warm_worker, self._tokenizer) for _ in range(self._max_workers)
+        ]
+        for future in warmups:
+            future.result()
+
+        self._batcher = _MicroBatcher(
+            self._pool,
+            self._replace_pool,
+            self._tokenizer,
+            self.metrics,
+            self._max_batch_size,
+            self._batch_window,
+            self._large_document_size,
+        )
+        self._batcher.start()
+
+        self._httpd = _HTTPServer(self._address, self)
+        self._serve_thread = threading.Thread(
+            target=self._httpd.serve_forever, name="ttr-http", daemon=True
+        )
+        self._serve_thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Block until shutdown() is called from another thread or the process is interrupted."""
+        if self._serve_thread is None:
+            self.start()
+        try:
+            while self._serve_thread is not None and self._serve_thread.is_alive():
+                self._serve_thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            pass
+
+    def shutdown(self) -> None:
+        """Stop serving, finish queued documents and stop the worker pool."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        self._serve_thread = None
+        if self._batcher is not None:
+            self._batcher.stop()
+            self._batcher = None
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def __enter__(self) -> "ScoringServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def health(self) -> dict[str, Any]:
+        """
+        Current /health payload.
+
+        Probes the worker pool with a no-op submission, which fails at once if
+        a worker has died, and replaces a broken pool before reporting.
+
+        Returns:
+            {"status": "ok", "pool": {"workers", "restarts"}}, or a status of
+            "stopped" or "unavailable" with an "error" when no pool can take work
+        """
+        pool = self._pool
+        if pool is None:
+            return {"status": "stopped", "error": "Server is not running"}
+        try:
+            try:
+                pool.submit(_noop)
+            except BrokenProcessPool:
+                self._replace_pool(pool).submit(_noop)
+        except Exception as exc:
+            return {"status": "unavailable", "error": repr(exc)}
+        return {
+            "status": "ok",
+            "pool": {"workers": self._max_workers, "restarts": self._pool_restarts},
+        }
+
+    def metrics_snapshot(self) -> dict[str, Any]:
+        """Current /metrics payload."""
+        depth = self._batcher.queue_depth if self._batcher is not None else 0
+        return self.metrics.snapshot(queue_depth=depth)
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        """
+        Swap a pool broken by a dead worker for a fresh one.
+
+        Every batch that was on the broken pool reports it, so only the first
+        call replaces it; later calls return the replacement.
+
+        Raises:
+            RuntimeError: If the server has been shut down
+        """
+        with self._pool_lock:
+            if self._pool is None:
+                raise RuntimeError("Server is not running")
+            if self._pool is broken:
+                self._pool = ProcessPoolExecutor(max_workers=self._max_workers)
+                self._pool_restarts += 1
+                broken.shutdown(wait=False)
+            return self._pool
+
+    # -------------------------------------------------------------------------
+    # Request handlers: return (JSON payload, documents scored)
+    # -------------------------------------------------------------------------
+
+    def _handle_ttr(self, body: Any) -> tuple[Any, int]:
+        if not isinstance(body, dict):
+            raise _BadRequest("Expected a JSON object")
+        if self._batcher is None:
+            raise RuntimeError("Server is not running")
+
+        if "documents" in body:
+            items = body["documents"]
+            if not isinstance(items, list):
+                raise _BadRequest("'documents' must be a list")
+            parsed = [self._parse_document(item) for item in items]
+        else:
+            parsed = [self._parse_document(body)]
+
+        futures = [self._batcher.submit(document, config) for document, config in parsed]
+        results = [future.result().model_dump(mode="json") for future in futures]
+
+        if "documents" in body:
+            return {"results": results}, len(results)
+        return results[0], 1
+
+    def _handle_aggregate(self, body: Any) -> tuple[Any, int]:
+        if not isinstance(body, dict):
+            raise _BadRequest("Expected a JSON object")
+        group_id = body.get("group_id")
+        items = body.get("results")
+        if not isinstance(group_id, str):
+            raise _BadRequest("'group_id' must be a string")
+        if not isinstance(items, list) or not items:
+            raise _BadRequest("'results' must be a non-empty list")
+
+        results = [TTRResult.model_validate(item) for item in items]
+        aggregate = self._aggregator.aggregate(results, group_id=group_id)
+        return aggregate.model_dump(mode="json"), 0
+
+    def _parse_document(self, item: Any) -> tuple[Document, TTRConfig]:
+        """Validate one document object and resolve its configuration."""
+        if not isinstance(item, dict):
+            raise _BadRequest("Each document must be a JSON object")
+        for field in ("text_id", "text"):
+            if not isinstance(item.get(field), str):
+                raise _BadRequest(f"'{field}' must be a string")
+        for field in ("title", "author"):
+            if not isinstance(item.get(field, ""), str):
+                raise _BadRequest(f"'{field}' must be a string")
+
+        config = self._config
+        overrides: dict[str, Any] = {}
+        if "chunk_size" in item:
+            chunk_size = item["chunk_size"]
+            if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+                raise _BadRequest("'chunk_size' must be a positive integer")
+            overrides["sttr_chunk_size"] = chunk_size
+        if "return_chunks" in item:
+            if not isinstance(item["return_chunks"], bool):
+                raise _BadRequest("'return_chunks' must be a boolean")
+            overrides["return_chunk_details"] = item["return_chunks"]
+        if overrides:
+            config = dataclasses.replace(config, **overrides)
+
+        document = Document(
+            item["text_id"], item["text"], item.get("title", ""), item.get("author", "")
+        )
+        return document, config
+
+
+# =============================================================================
+# COMMAND LINE
+# =============================================================================
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run a ScoringServer from the command line."""
+    parser = argparse.ArgumentParser(description="Serve TTR computation over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Words per STTR chunk")
+    parser.add_argument(
+        "--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="Documents per batch"
+    )
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=DEFAULT_BATCH_WINDOW * 1000,
+        help="Milliseconds a batch waits for more documents",
+    )
+    parser.add_argument(
+        "--large-document-size",
+        type=int,
+        default=DEFAULT_LARGE_DOCUMENT_SIZE,
+        help="Characters at which a document is dispatched alone",
+    )
+    args = parser.parse_args(argv)
+
+    server = ScoringServer(
+        host=args.host,
+        port=args.port,
+        config=TTRConfig(sttr_chunk_size=args.chunk_size),
+        max_workers=args.workers,
+        max_batch_size=args.max_batch_size,
+        batch_window=args.batch_window_ms / 1000,
+        large_document_size=args.large_document_size,
+    )
+    with server:
+        print(f"Serving TTR on {server.url}")
+        server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+"""
+Persistent SQLite store for TTR results.
+
+TTRStore keeps every TTRResult in one SQLite file, with its scalar
+metrics in indexed columns so results can be selected by author, group
+and metric ranges without loading the rest. Each group's TTRAggregate is
+stored alongside and refreshed whenever a result in that group is
+inserted, replaced or removed, so reading an aggregate is a single-row
+lookup. Each group also keeps running state: its text and word counts,
+exact sums and sums of squares of every aggregated metric, and the set
+of type IDs pooled from its signatures. An insert updates that state
+from the new row alone and reads the minimum, maximum and median TTR
+through the (group_id, ttr) index, so its cost does not grow with the
+group. Only replacing or removing a result rebuilds the group's state
+from its rows. The Vocabulary type signature IDs refer to is saved in
+the same file and restored
+into the vocabulary the store is opened with, so signatures made in a
+later session share IDs with the stored ones.
+"""
+
+import json
+import math
+import sqlite3
+from array import array
+from fractions import Fraction
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+from stylometry_ttr.models import TTRAggregate, TTRResult, TypeSignature
+from stylometry_ttr.ttr import by_author
+from stylometry_ttr.vocabulary import Vocabulary
+
+
+_SCHEMA_VERSION = 3
+
+# Metric columns that query() accepts ranges on and can order by
+_METRIC_COLUMNS = (
+    "total_words",
+    "unique_words",
+    "ttr",
+    "root_ttr",
+    "log_ttr",
+    "sttr",
+    "sttr_std",
+    "chunk_count",
+    "delta_std",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    text_id TEXT PRIMARY KEY,
+    group_id TEXT NOT NULL,
+    author TEXT NOT NULL,
+    title TEXT NOT NULL,
+    total_words INTEGER NOT NULL,
+    unique_words INTEGER NOT NULL,
+    ttr REAL NOT NULL,
+    root_ttr REAL NOT NULL,
+    log_ttr REAL NOT NULL,
+    sttr REAL,
+    sttr_std REAL,
+    chunk_count INTEGER,
+    delta_std REAL,
+    type_signature BLOB,
+    result TEXT NOT NULL
+);
+DROP INDEX IF EXISTS results_group;
+CREATE INDEX IF NOT EXISTS results_group_ttr ON results (group_id, ttr);
+CREATE INDEX IF NOT EXISTS results_author ON results (author);
+CREATE INDEX IF NOT EXISTS results_total_words ON results (total_words);
+CREATE INDEX IF NOT EXISTS results_ttr ON results (ttr);
+CREATE INDEX IF NOT EXISTS results_root_ttr ON results (root_ttr);
+CREATE INDEX IF NOT EXISTS results_sttr ON results (sttr);
+CREATE TABLE IF NOT EXISTS aggregates (
+    group_id TEXT PRIMARY KEY,
+    aggregate TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_state (
+    group_id TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_types (
+    group_id TEXT NOT NULL,
+    type_id INTEGER NOT NULL,
+    PRIMARY KEY (group_id, type_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS vocabulary (
+    word_id INTEGER PRIMARY KEY,
+    word TEXT NOT NULL
+);
+"""
+
+_INSERT = f"""
+INSERT OR REPLACE INTO results (
+    text_id, group_id, author, title, {", ".join(_METRIC_COLUMNS)}, type_signature, result
+) VALUES ({", ".join("?" * (len(_METRIC_COLUMNS) + 6))})
+"""
+
+
+# Per-text metrics whose means and standard deviations a group aggregates
+_AGGREGATED = ("ttr", "root_ttr", "log_ttr", "sttr", "delta_std")
+
+
+def _signature_bytes(signature: Optional[TypeSignature]) -> Optional[bytes]:
+    """Pack a type signature's IDs for the type_signature column."""
+    return None if signature is None else signature.ids.tobytes()
+
+
+class _GroupState:
+    """
+    Running totals of one group, enough to aggregate it without its rows.
+
+    Sums are kept as exact Fractions, the arithmetic statistics.mean() and
+    statistics.stdev() use, so the aggregates match TTRAggregator's.
+    """
+
+    def __init__(self) -> None:
+        self.text_count = 0
+        self.total_words = 0
+        self.signature_count = 0
+        self.pooled_unique_words = 0
+        # metric -> [count, sum, sum of squares] over its non-None values
+        self.sums: dict[str, list] = {
+            metric: [0, Fraction(0), Fraction(0)] for metric in _AGGREGATED
+        }
+
+    def add(self, total_words: int, values: Iterable[Optional[float]], signed: bool) -> None:
+        """Count one text: its word count, _AGGREGATED values and whether it is signed."""
+        self.text_count += 1
+        self.total_words += total_words
+        self.signature_count += signed
+        for metric, value in zip(_AGGREGATED, values):
+            if value is not None:
+                sums = self.sums[metric]
+                value = Fraction(value)
+                sums[0] += 1
+                sums[1] += value
+                sums[2] += value * value
+
+    def mean(self, metric: str) -> Optional[float]:
+        count, total, _ = self.sums[metric]
+        return float(total / count) if count else None
+
+    def stdev(self, metric: str) -> Optional[float]:
+        """Sample standard deviation, or None with fewer than two values."""
+        count, total, squares = self.sums[metric]
+        if count < 2:
+            return None
+        return math.sqrt((squares - total * total / count) / (count - 1))
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "text_count": self.text_count,
+                "total_words": self.total_words,
+                "signature_count": self.signature_count,
+                "pooled_unique_words": self.pooled_unique_words,
+                "sums": {
+                    metric: [count, str(total), str(squares)]
+                    for metric, (count, total, squares) in self.sums.items()
+                },
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "_GroupState":
+        saved = json.loads(data)
+        state = cls()
+        state.text_count = saved["text_count"]
+        state.total_words = saved["total_words"]
+        state.signature_count = saved["signature_count"]
+        state.pooled_unique_words = saved["pooled_unique_words"]
+        state.sums = {
+            metric: [count, Fraction(total), Fraction(squares)]
+            for metric, (count, total, squares) in saved["sums"].items()
+        }
+        return state
+
+
+class TTRStore:
+    """
+    SQLite-backed TTRResult store with per-group aggregates kept up to date.
+
+    Results are keyed by text_id; adding a result with an existing text_id
+    replaces it. aggregate() returns the same statistics as
+    TTRAggregator.aggregate() on the group's current results.
+
+    Inserting a new text_id updates its group's running state from that
+    row alone, so add() costs the same however large the group is.
+    Replacing or removing a result rebuilds its group from the group's
+    rows. add_many() does all of its inserts in one transaction.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        group_by: Callable[[TTRResult], str] = by_author,
+        vocabulary: Optional[Vocabulary] = None,
+    ):
+        """
+        Open or create a store.
+
+        Args:
+            path: SQLite database file (default: in-memory)
+            group_by: Maps a result to its aggregate group (default: author).
+                Must be the same function every time a given file is opened.
+            vocabulary: The TTRConfig.type_vocabulary of results with type
+                signatures. Required to add such results. The saved vocabulary
+                is restored into it, so open the store before computing
+                results with a fresh Vocabulary.
+
+        Raises:
+            ValueError: If the file has an unsupported schema version, or
+                vocabulary already assigns IDs that differ from the saved ones
+        """
+        self._group_by = group_by
+        self._vocabulary = vocabulary
+        self._connection = sqlite3.connect(str(path))
+
+        version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, 1, 2, _SCHEMA_VERSION):
+            self._connection.close()
+            raise ValueError(f"Unsupported store schema version {version} in {path}")
+        with self._connection:
+            self._connection.executescript(_SCHEMA)
+            if version < _SCHEMA_VERSION:
+                # Older files have no running state; build it from their rows
+                groups = self._connection.execute("SELECT DISTINCT group_id FROM results")
+                self._refresh({}, {group_id for (group_id,) in groups})
+            self._connection.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+        if vocabulary is not None:
+            saved = [
+                word
+                for (word,) in self._connection.execute(
+                    "SELECT word FROM vocabulary ORDER BY word_id"
+                )
+            ]
+            if vocabulary.to_list()[: len(saved)] != saved[: len(vocabulary)]:
+                self._connection.close()
+                raise ValueError(f"vocabulary does not match the vocabulary saved in {path}")
+            vocabulary.update(saved)
+
+    @property
+    def vocabulary(self) -> Optional[Vocabulary]:
+        """The vocabulary stored type signatures refer to, if one was given."""
+        return self._vocabulary
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self._connection.close()
+
+    def __enter__(self) -> "TTRStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, text_id: object) -> bool:
+        row = self._connection.execute(
+            "SELECT 1 FROM results WHERE text_id = ?", (text_id,)
+        ).fetchone()
+        return row is not None
+
+    def add(self, result: TTRResult) -> None:
+        """
+        Insert a result, replacing any earlier result with the same text_id.
+
+        A new text_id updates its group's aggregate incrementally; a
+        replacement rebuilds the groups it leaves and joins.
+        """
+        self.add_many([result])
+
+    def add_many(self, results: Iterable[TTRResult]) -> None:
+        """
+        Insert results in one transaction, replacing any with existing text_ids.
+
+        New text_ids update their group's running state; a group that loses
+        a replaced result is rebuilt from its rows, once, after all inserts.
+        Each affected group's aggregate is rewritten once. Any IDs the
+        vocabulary has assigned since the last insert are saved in the same
+        transaction.
+
+        Raises:
+            ValueError: If a result has a type signature that the store's
+                vocabulary did not make
+        """
+        with self._connection:
+            states: dict[str, _GroupState] = {}
+            rebuild: set[str] = set()
+            for result in results:
+                self._check_signature(result.type_signature)
+                replaced = self._groups_of([result.text_id])
+                group_id = self._group_by(result)
+                if replaced:
+                    rebuild.update(replaced | {group_id})
+                elif group_id not in rebuild:
+                    if group_id not in states:
+                        states[group_id] = self._load_state(group_id)
+                    state = states[group_id]
+                    state.add(
+                        result.total_words,
+                        [getattr(result, metric) for metric in _AGGREGATED],
+                        result.type_signature is not None,
+                    )
+                    if result.type_signature is not None:
+                        state.pooled_unique_words += self._pool(
+                            group_id, result.type_signature.ids
+                        )
+                self._connection.execute(
+                    _INSERT,
+                    (
+                        result.text_id,
+                        group_id,
+                        result.author,
+                        result.title,
+                        *(getattr(result, column) for column in _METRIC_COLUMNS),
+                        _signature_bytes(result.type_signature),
+                        result.model_dump_json(),
+                    ),
+                )
+            self._save_vocabulary()
+            self._refresh(states, rebuild)
+
+    def remove(self, text_id: str) -> None:
+        """Remove the result for text_id (KeyError if absent)."""
+        with self._connection:
+            touched = self._groups_of([text_id])
+            if not touched:
+                raise KeyError(text_id)
+            self._connection.execute("DELETE FROM results WHERE text_id = ?", (text_id,))
+            self._refresh({}, touched)
+
+    def get(self, text_id: str) -> Optional[TTRResult]:
+        """Return the result for text_id, or None if absent."""
+        row = self._connection.execute(
+            "SELECT result FROM results WHERE text_id = ?", (text_id,)
+        ).fetchone()
+        return None if row is None else TTRResult.model_validate_json(row[0])
+
+    def query(
+        self,
+        author: Optional[str] = None,
+        group_id: Optional[str] = None,
+        order_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+        **ranges: tuple[Optional[float], Optional[float]],
+    ) -> Iterator[TTRResult]:
+        """
+        Select results by author, group and inclusive metric ranges.
+
+        Args:
+            author: Only results with this author
+            group_id: Only results in this aggregate group
+            order_by: Metric column to sort by (default: text_id)
+            descending: Sort in descending order
+            limit: Maximum number of results
+            **ranges: (low, high) bounds per metric, e.g. ttr=(0.3, 0.5) or
+                total_words=(10_000, None); None leaves that side open.
+                Results whose metric is None never match a range.
+
+        Yields:
+            Matching TTRResults
+
+        Raises:
+            ValueError: If order_by or a range names an unknown metric
+        """
+        clauses: list[str] = []
+        params: list[object] = []
+        if author is not None:
+            clauses.append("author = ?")
+            params.append(author)
+        if group_id is not None:
+            clauses.append("group_id = ?")
+            params.append(group_id)
+        for column, (low, high) in ranges.items():
+            self._check_column(column)
+            clauses.append(f"{column} IS NOT NULL")
+            if low is not None:
+                clauses.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                clauses.append(f"{column} <= ?")
+                params.append(high)
+
+        sql = "SELECT result FROM results"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by is not None:
+            self._check_column(order_by)
+            sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}, text_id"
+        else:
+            sql += " ORDER BY text_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        for (data,) in self._connection.execute(sql, params):
+            yield TTRResult.model_validate_json(data)
+
+    def aggregate(self, group_id: str) -> TTRAggregate:
+        """
+        Return the stored aggregate for a group.
+
+        Raises:
+            KeyError: If the group has no results
+        """
+        row = self._connection.execute(
+            "SELECT aggregate FROM aggregates WHERE group_id = ?", (group_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(group_id)
+        return TTRAggregate.model_validate_json(row[0])
+
+    def aggregates(self) -> dict[str, TTRAggregate]:
+        """Return the stored aggregate for every group."""
+        rows = self._connection.execute(
+            "SELECT group_id, aggregate FROM aggregates ORDER BY group_id"
+        )
+        return {group_id: TTRAggregate.model_validate_json(data) for group_id, data in rows}
+
+    @staticmethod
+    def _check_column(column: str) -> None:
+        if column not in _METRIC_COLUMNS:
+            raise ValueError(f"Unknown metric {column!r}; expected one of {_METRIC_COLUMNS}")
+
+    def _check_signature(self, signature: Optional[TypeSignature]) -> None:
+        """Reject a signature whose IDs the store's vocabulary cannot account for."""
+        if signature is None:
+            return
+        if self._vocabulary is None:
+            raise ValueError(
+                "Results with type signatures need a store opened with their type_vocabulary"
+            )
+        if len(signature) and signature.ids[-1] >= len(self._vocabulary):
+            raise ValueError("Type signature has IDs the store's vocabulary never assigned")
+
+    def _save_vocabulary(self) -> None:
+        """Append the vocabulary's IDs assigned since the last save."""
+        if self._vocabulary is None:
+            return
+        saved = self._connection.execute("SELECT COUNT(*) FROM vocabulary").fetchone()[0]
+        words = self._vocabulary.to_list()[saved:]
+        self._connection.executemany(
+            "INSERT INTO vocabulary (word_id, word) VALUES (?, ?)",
+            enumerate(words, start=saved),
+        )
+
+    def _groups_of(self, text_ids: list[str]) -> set[str]:
+        """Groups currently holding any of the given text_ids."""
+        rows = self._connection.execute(
+            f"SELECT group_id FROM results WHERE text_id IN ({', '.join('?' * len(text_ids))})",
+            text_ids,
+        )
+        return {group_id for (group_id,) in rows}
+
+    def _load_state(self, group_id: str) -> _GroupState:
+        """The saved running state of a group, or an empty one for a new group."""
+        row = self._connection.execute(
+            "SELECT state FROM group_state WHERE group_id = ?", (group_id,)
+        ).fetchone()
+        return _GroupState() if row is None else _GroupState.from_json(row[0])
+
+    def _pool(self, group_id: str, type_ids: Iterable[int]) -> int:
+        """Add type IDs to a group's pooled set; return how many were new."""
+        cursor = self._connection.executemany(
+            "INSERT OR IGNORE INTO group_types (group_id, type_id) VALUES (?, ?)",
+            ((group_id, type_id) for type_id in type_ids),
+        )
+        return max(cursor.rowcount, 0)
+
+    def _rebuild(self, group_id: str) -> Optional[_GroupState]:
+        """Recompute a group's running state from its rows (None if it has none)."""
+        self._connection.execute("DELETE FROM group_types WHERE group_id = ?", (group_id,))
+        rows = self._connection.execute(
+            f"SELECT total_words, {', '.join(_AGGREGATED)}, type_signature "
+            "FROM results WHERE group_id = ?",
+            (group_id,),
+        )
+        state = _GroupState()
+        for total_words, *values, signature in rows:
+            state.add(total_words, values, signature is not None)
+            if signature is not None:
+                state.pooled_unique_words += self._pool(group_id, array("I", signature))
+        return state if state.text_count else None
+
+    def _refresh(self, states: dict[str, _GroupState], rebuild: set[str]) -> None:
+        """Save updated running states, rebuild the given groups, and store their aggregates."""
+        updated: dict[str, Optional[_GroupState]] = {
+            group_id: state for group_id, state in states.items() if group_id not in rebuild
+        }
+        updated.update((group_id, self._rebuild(group_id)) for group_id in rebuild)
+        for group_id, state in updated.items():
+            if state is None:
+                self._connection.execute("DELETE FROM group_state WHERE group_id = ?", (group_id,))
+                self._connection.execute("DELETE FROM aggregates WHERE group_id = ?", (group_id,))
+                continue
+            self._connection.execute(
+                "INSERT OR REPLACE INTO group_state (group_id, state) VALUES (?, ?)",
+                (group_id, state.to_json()),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO aggregates (group_id, aggregate) VALUES (?, ?)",
+                (group_id, self._aggregate(group_id, state).model_dump_json()),
+            )
+
+    def _aggregate(self, group_id: str, state: _GroupState) -> TTRAggregate:
+        """Build a group's aggregate from its state, rounded as TTRAggregator rounds."""
+        count = state.text_count
+        # Order statistics come from the (group_id, ttr) index, not the whole group
+        ordered = "SELECT ttr FROM results WHERE group_id = ? ORDER BY ttr"
+        lowest = self._connection.execute(f"{ordered} LIMIT 1", (group_id,)).fetchone()[0]
+        highest = self._connection.execute(f"{ordered} DESC LIMIT 1", (group_id,)).fetchone()[0]
+        middle = [
+            ttr
+            for (ttr,) in self._connection.execute(
+                f"{ordered} LIMIT ? OFFSET ?", (group_id, 2 - count % 2, (count - 1) // 2)
+            )
+        ]
+        median = middle[0] if count % 2 else (middle[0] + middle[1]) / 2
+
+        def std(metric: str, digits: int) -> Optional[float]:
+            value = state.stdev(metric)
+            return None if value is None else round(value, digits)
+
+        def mean(metric: str, digits: int) -> Optional[float]:
+            value = state.mean(metric)
+            return None if value is None else round(value, digits)
+
+        pooled = state.pooled_unique_words if state.signature_count == count else None
+        pooled_ttr = None
+        if pooled is not None:
+            pooled_ttr = round(pooled / state.total_words, 6) if state.total_words else 0.0
+        return TTRAggregate(
+            group_id=group_id,
+            text_count=count,
+            total_words=state.total_words,
+            ttr_mean=mean("ttr", 6),
+            ttr_std=std("ttr", 6) if count > 1 else 0.0,
+            ttr_min=round(lowest, 6),
+            ttr_max=round(highest, 6),
+            ttr_median=round(median, 6),
+            root_ttr_mean=mean("root_ttr", 4),
+            root_ttr_std=std("root_ttr", 4) if count > 1 else 0.0,
+            log_ttr_mean=mean("log_ttr", 6),
+            log_ttr_std=std("log_ttr", 6) if count > 1 else 0.0,
+            sttr_mean=mean("sttr", 6),
+            sttr_std=std("sttr", 6),
+            delta_std_mean=mean("delta_std", 6),
+            pooled_unique_words=pooled,
+            pooled_ttr=pooled_ttr,
+        )
@@ -3,10 +3,20 @@ Text tokenizer for stylometric analysis.
 
 Handles unicode normalization, text cleaning, and tokenization
 for vocabulary analysis.
+
+Module-level patterns and translation tables are built once at import and
+never mutated, and a Tokenizer's only mutable state is its normalizer
+cache (an lru_cache, which is thread-safe), so tokenizers can be shared
+between threads, including on free-threaded interpreters.
 """
 
 import re
-from typing import Iterator
+from array import array
+from bisect import bisect_right
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional, Union
 
 
 # =============================================================================
@@ -68,6 +78,9 @@ def _multi_char_replacer(match: re.Match) -> str:
 
 def normalize_unicode(text: str) -> str:
     """Replace smart quotes, em-dashes, ligatures, and other unicode with ASCII."""
+    if text.isascii():
+        # The grave accent is the only ASCII character with a replacement
+        return text.replace("`", "'")
     text = text.translate(_UNICODE_TABLE)
     text = _MULTI_CHAR_PATTERN.sub(_multi_char_replacer, text)
     return text
@@ -95,6 +108,21 @@ def clean_text_artifacts(text: str) -> str:
     return text
 
 
+# Bytes variants of the cleaning patterns for ASCII text. Bytes "\s" omits the
+# ASCII separators \x1c-\x1f that str "\s" matches, so they are listed explicitly.
+_ASCII_ITALICS_PATTERN = re.compile(rb"_([^_]+)_")
+_ASCII_BRACKET_PATTERN = re.compile(rb"\[[^\]]*\]")
+_ASCII_LINEBREAK_HYPHEN_PATTERN = re.compile(rb"(\w+)-[\s\x1c-\x1f]*\n[\s\x1c-\x1f]*(\w+)")
+
+
+def _clean_ascii_artifacts(data: bytes) -> bytes:
+    """Bytes equivalent of clean_text_artifacts for ASCII text."""
+    data = _ASCII_ITALICS_PATTERN.sub(rb"\1", data)
+    data = _ASCII_BRACKET_PATTERN.sub(b" ", data)
+    data = _ASCII_LINEBREAK_HYPHEN_PATTERN.sub(rb"\1\2", data)
+    return data
+
+
 # =============================================================================
 # TOKEN PATTERN
 # =============================================================================
@@ -140,6 +168,375 @@ _TOKEN_PATTERN = re.compile(
     re.VERBOSE | re.IGNORECASE,
 )
 
+# Bytes variant for ASCII text. On ASCII input "\b", "\d" and case folding agree
+# with the str pattern, so both find the same token spans.
+_ASCII_TOKEN_PATTERN = re.compile(
+    _TOKEN_PATTERN.pattern.encode("ascii"), re.VERBOSE | re.IGNORECASE
+)
+
+
+# =============================================================================
+# SEGMENTATION
+# =============================================================================
+
+# Whitespace runs at which a text may be cut. Line breaks are preferred, and
+# plain whitespace is the fallback for texts without them.
+_LINE_BREAK_PATTERN = re.compile(r"\s*\n\s*")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Characters that must not precede a cut: anything that is (or normalizes to) a
+# hyphen could start a line-break hyphenation join, and "_" / "]" can vanish
+# during cleaning and expose a hyphen to the join.
+_UNSAFE_BEFORE_CUT = frozenset("-\u2012\u2013\u2014\u2015_]")
+
+DEFAULT_SEGMENT_SIZE = 1_000_000  # Characters per segment for parallel tokenization
+
+# Unprocessed text kept back from each block when tokenizing a stream; the cut
+# is searched for in this tail so that most of every block is tokenized at once.
+_STREAM_LOOKBACK = 4096
+
+DEFAULT_NORMALIZER_CACHE_SIZE = 65536  # Distinct surface forms memoized per tokenizer
+
+# Segment size used to route the ASCII stretches of mostly-ASCII text to the fast path
+_ASCII_SEGMENT_SIZE = 8192
+
+
+def _next_cut(
+    text: str, start: int, target: int, pattern: re.Pattern, complete: bool = True
+) -> int:
+    """
+    Find the first safe cut at or after target, or -1 if there is none.
+
+    A cut sits at the end of a whitespace run. It is safe when no cleaning
+    pattern can match across it: no italics pair or bracket span may be open at
+    the cut, and the run must not be preceded by a possible hyphenation join.
+    Tokens never contain whitespace, so tokenizing the text on either side of a
+    safe cut gives the same tokens as tokenizing the whole text.
+
+    Args:
+        text: Raw input text
+        start: Start of the current segment (a previous safe cut or 0)
+        target: Earliest acceptable cut position
+        pattern: Whitespace-run pattern to search with
+        complete: False if more text may follow, in which case an open span
+            is never safe to cut
+
+    Returns:
+        Cut position, or -1
+    """
+    scan = start
+    italics_open = -1
+
+    for match in pattern.finditer(text, target):
+        run_start, cut = match.start(), match.end()
+        if cut >= len(text):
+            return -1
+
+        # Extend a partial run found mid-whitespace back to its true start
+        while run_start > start and text[run_start - 1].isspace():
+            run_start -= 1
+        if run_start <= start or text[run_start - 1] in _UNSAFE_BEFORE_CUT:
+            continue
+
+        # Italics markers pair up left to right; "__" never opens a span
+        underscore = text.find("_", scan, run_start)
+        while underscore >= 0:
+            if italics_open < 0 or underscore == italics_open + 1:
+                italics_open = underscore
+            else:
+                italics_open = -1
+            underscore = text.find("_", underscore + 1, run_start)
+        scan = run_start
+        if italics_open >= 0 and (not complete or text.find("_", cut) >= 0):
+            continue
+
+        # An unclosed "[" would swallow text up to the next "]"
+        bracket = text.rfind("[", start, run_start)
+        if (
+            bracket >= 0
+            and text.find("]", bracket, run_start) < 0
+            and (not complete or text.find("]", cut) >= 0)
+        ):
+            continue
+
+        return cut
+
+    return -1
+
+
+def segment_text(text: str, segment_size: int = DEFAULT_SEGMENT_SIZE) -> list[str]:
+    """
+    Split text into segments that can be tokenized independently.
+
+    Concatenating the tokens of each segment, in order, gives exactly the tokens
+    of the whole text. Segments are roughly segment_size characters; a segment
+    grows past that when no safe cut is available.
+
+    Args:
+        text: Raw input text
+        segment_size: Target characters per segment
+
+    Returns:
+        List of segments covering the whole text
+    """
+    if segment_size < 1:
+        raise ValueError("segment_size must be at least 1")
+
+    segments: list[str] = []
+    start = 0
+
+    while len(text) - start > segment_size:
+        target = start + segment_size
+        cut = _next_cut(text, start, target, _LINE_BREAK_PATTERN)
+        if cut < 0:
+            cut = _next_cut(text, start, target, _WHITESPACE_PATTERN)
+        if cut < 0:
+            break
+        segments.append(text[start:cut])
+        start = cut
+
+    segments.append(text[start:])
+    return segments
+
+
+# =============================================================================
+# TOKEN SPANS
+# =============================================================================
+
+# Characters that normalize_unicode() expands to several characters. Every other
+# replacement is one-for-one and leaves offsets unchanged.
+_EXPANSIONS: dict[str, str] = {
+    **{chr(code): text for code, text in _SINGLE_CHAR_MAP.items() if len(text) != 1},
+    **_MULTI_CHAR_REPLACEMENTS,
+}
+_EXPANSION_PATTERN = re.compile("|".join(re.escape(k) for k in _EXPANSIONS))
+
+
+class _OffsetMap:
+    """
+    Maps offsets in a rewritten text back to the text it was rewritten from.
+
+    The rewritten text is a sequence of pieces, each either copied from a
+    source range (offsets map one-to-one) or replacing one (offsets inside
+    map to the edges of the replaced range). Source text between pieces
+    was deleted.
+    """
+
+    __slots__ = ("_starts", "_sources", "_source_ends", "_copied")
+
+    def __init__(self):
+        self._starts: list[int] = []
+        self._sources: list[int] = []
+        self._source_ends: list[int] = []
+        self._copied: list[bool] = []
+
+    def add(self, start: int, source: int, source_end: int, copied: bool) -> None:
+        self._starts.append(start)
+        self._sources.append(source)
+        self._source_ends.append(source_end)
+        self._copied.append(copied)
+
+    def source_start(self, pos: int) -> int:
+        """Map the start of a range in the rewritten text to the source."""
+        k = max(bisect_right(self._starts, pos) - 1, 0)
+        if self._copied[k]:
+            return min(self._sources[k] + pos - self._starts[k], self._source_ends[k])
+        return self._sources[k] if pos == self._starts[k] else self._source_ends[k]
+
+    def source_end(self, pos: int) -> int:
+        """Map the (exclusive) end of a range in the rewritten text to the source."""
+        if pos <= 0:
+            return self.source_start(pos)
+        k = max(bisect_right(self._starts, pos - 1) - 1, 0)
+        if self._copied[k]:
+            return self._sources[k] + pos - self._starts[k]
+        return self._source_ends[k]
+
+
+def _tracked_sub(
+    pattern: re.Pattern, text: str, expand: Callable[[re.Match], tuple[Union[str, int], ...]]
+) -> tuple[str, Optional[_OffsetMap]]:
+    """
+    Rewrite every match of pattern, recording where each output piece came from.
+
+    Equivalent to pattern.sub(): expand(match) lists the replacement as literal
+    strings and group numbers (copied from the source).
+
+    Returns:
+        Rewritten text and its offset map (None if nothing matched)
+    """
+    parts: list[str] = []
+    offsets = _OffsetMap()
+    out = 0
+    last = 0
+    matched = False
+
+    def copy(start: int, end: int) -> None:
+        nonlocal out
+        if end > start:
+            offsets.add(out, start, end, True)
+            parts.append(text[start:end])
+            out += end - start
+
+    for match in pattern.finditer(text):
+        matched = True
+        copy(last, match.start())
+        for item in expand(match):
+            if isinstance(item, int):
+                copy(*match.span(item))
+            elif item:
+                offsets.add(out, match.start(), match.end(), False)
+                parts.append(item)
+                out += len(item)
+        last = match.end()
+
+    if not matched:
+        return text, None
+    copy(last, len(text))
+    return "".join(parts), offsets
+
+
+def _normalize_tracked(text: str) -> tuple[str, list[_OffsetMap]]:
+    """
+    Apply normalize_unicode() and clean_text_artifacts(), keeping offset maps.
+
+    Returns:
+        The same text as clean_text_artifacts(normalize_unicode(text)), and the
+        offset map of each step that changed offsets, in order
+    """
+    maps: list[_OffsetMap] = []
+    if text.isascii():
+        text = text.replace("`", "'")
+    else:
+        text, offsets = _tracked_sub(
+            _EXPANSION_PATTERN, text, lambda m: (_EXPANSIONS[m.group(0)],)
+        )
+        text = text.translate(_UNICODE_TABLE)
+        maps.append(offsets)
+
+    for pattern, template in (
+        (_ITALICS_PATTERN, (1,)),
+        (_BRACKET_PATTERN, (" ",)),
+        (_LINEBREAK_HYPHEN_PATTERN, (1, 2)),
+    ):
+        text, offsets = _tracked_sub(pattern, text, lambda m, template=template: template)
+        maps.append(offsets)
+
+    return text, [offsets for offsets in maps if offsets is not None]
+
+
+class TokenSpans:
+    """
+    Tokens of a text as (start, end) offsets into one normalized buffer.
+
+    The buffer is the text after unicode normalization and artifact
+    cleaning, lowercased once up front (when the tokenizer lowercases), so
+    tokens are slices of it rather than separately allocated strings.
+    Offsets are kept in compact arrays and can be mapped back to character
+    offsets in the original source text.
+    """
+
+    __slots__ = ("buffer", "_starts", "_ends", "_maps", "_lower", "_normalize")
+
+    def __init__(
+        self,
+        buffer: str,
+        starts: array,
+        ends: array,
+        maps: list[_OffsetMap],
+        lower: bool = False,
+        normalize: Optional[Callable[[str], str]] = None,
+    ):
+        self.buffer = buffer
+        self._starts = starts
+        self._ends = ends
+        self._maps = maps
+        self._lower = lower
+        self._normalize = normalize
+
+    @property
+    def starts(self) -> memoryview:
+        """Read-only view of token start offsets into the buffer."""
+        return memoryview(self._starts).toreadonly()
+
+    @property
+    def ends(self) -> memoryview:
+        """Read-only view of token end offsets into the buffer."""
+        return memoryview(self._ends).toreadonly()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> str:
+        token = self.buffer[self._starts[index] : self._ends[index]]
+        if self._normalize is not None:
+            return self._normalize(token)
+        return token.lower() if self._lower else token
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.buffer
+        tokens = (buffer[start:end] for start, end in zip(self._starts, self._ends))
+        if self._normalize is not None:
+            return map(self._normalize, tokens)
+        if self._lower:
+            return map(str.lower, tokens)
+        return tokens
+
+    def tokens(self) -> list[str]:
+        """Return the tokens, identical to Tokenizer.tokenize() on the source text."""
+        buffer = self.buffer
+        tokens = [buffer[start:end] for start, end in zip(self._starts, self._ends)]
+        if self._normalize is not None:
+            return list(map(self._normalize, tokens))
+        if self._lower:
+            return [token.lower() for token in tokens]
+        return tokens
+
+    def source_offset(self, pos: int, end: bool = False) -> int:
+        """
+        Map a buffer offset to a character offset in the source text.
+
+        Args:
+            pos: Offset into the buffer
+            end: Treat pos as the exclusive end of a range
+
+        Returns:
+            Offset into the source text
+        """
+        for offsets in reversed(self._maps):
+            pos = offsets.source_end(pos) if end else offsets.source_start(pos)
+        return pos
+
+    def source_span(self, index: int) -> tuple[int, int]:
+        """Return the (start, end) character offsets of a token in the source text."""
+        return (
+            self.source_offset(self._starts[index]),
+            self.source_offset(self._ends[index], end=True),
+        )
+
+    def chunk_offsets(self, chunk_size: int) -> list[tuple[int, int]]:
+        """
+        Return the source (start, end) character offsets of each full chunk.
+
+        Entry i covers chunk i + 1 of STTR, from the start of its first token
+        to the end of its last, so it lines up with TTRResult.chunk_ttrs.
+
+        Args:
+            chunk_size: Tokens per chunk (TTRConfig.sttr_chunk_size)
+
+        Returns:
+            List of (start, end) source offsets
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        return [
+            (
+                self.source_offset(self._starts[i]),
+                self.source_offset(self._ends[i + chunk_size - 1], end=True),
+            )
+            for i in range(0, len(self._starts) - chunk_size + 1, chunk_size)
+        ]
+
 
 # =============================================================================
 # TOKENIZER IMPLEMENTATION
@@ -151,15 +548,29 @@ class Tokenizer:
     Text tokenizer for stylometric analysis.
 
     Handles unicode normalization, text cleaning, and tokenization.
+
+    An optional normalizer (stemmer, lemmatizer, spelling-variant mapper)
+    maps each token to the form that is counted, e.g. for lemma-level TTR.
+    It is applied once per distinct surface form through a bounded memo
+    cache rather than once per token.
     """
 
-    __slots__ = ("_lowercase", "_min_length", "_strip_numbers")
+    __slots__ = (
+        "_lowercase",
+        "_min_length",
+        "_strip_numbers",
+        "_normalizer",
+        "_normalizer_cache_size",
+        "_normalize_cached",
+    )
 
     def __init__(
         self,
         lowercase: bool = True,
         min_length: int = 1,
         strip_numbers: bool = False,
+        normalizer: Optional[Callable[[str], str]] = None,
+        normalizer_cache_size: Optional[int] = DEFAULT_NORMALIZER_CACHE_SIZE,
     ):
         """
         Initialize tokenizer.
@@ -168,13 +579,80 @@ class Tokenizer:
             lowercase: Normalize tokens to lowercase
             min_length: Minimum token length
             strip_numbers: Exclude numeric tokens
+            normalizer: Maps each (lowercased) token to the form counted as its
+                type. Must be deterministic, thread-safe for thread pools, and
+                picklable for process pools.
+                min_length and strip_numbers apply to the surface form.
+            normalizer_cache_size: Distinct surface forms memoized (None = unbounded)
         """
         self._lowercase = lowercase
         self._min_length = min_length
         self._strip_numbers = strip_numbers
+        self._normalizer = normalizer
+        self._normalizer_cache_size = normalizer_cache_size
+        self._normalize_cached: Optional[Callable[[str], str]] = None
+        if normalizer is not None:
+            self._normalize_cached = lru_cache(maxsize=normalizer_cache_size)(
+                self._apply_normalizer
+            )
+
+    def __reduce__(self):
+        # The memo cache is rebuilt empty rather than pickled
+        return (
+            self.__class__,
+            (
+                self._lowercase,
+                self._min_length,
+                self._strip_numbers,
+                self._normalizer,
+                self._normalizer_cache_size,
+            ),
+        )
+
+    @property
+    def lowercase(self) -> bool:
+        """Whether tokens are normalized to lowercase."""
+        return self._lowercase
+
+    @property
+    def min_length(self) -> int:
+        """Minimum token length."""
+        return self._min_length
+
+    @property
+    def strip_numbers(self) -> bool:
+        """Whether numeric tokens are excluded."""
+        return self._strip_numbers
+
+    @property
+    def normalizer(self) -> Optional[Callable[[str], str]]:
+        """Per-type token normalizer, if any."""
+        return self._normalizer
+
+    def _apply_normalizer(self, surface: str) -> str:
+        return self._normalizer(surface.lower() if self._lowercase else surface)
+
+    def normalize_token(self, surface: str) -> str:
+        """
+        Map a matched surface form to the token this tokenizer yields.
+
+        Applies lowercasing and the normalizer (memoized), but not the
+        min_length or strip_numbers filters.
+
+        Args:
+            surface: Token as matched in the text
+
+        Returns:
+            Normalized token
+        """
+        if self._normalize_cached is not None:
+            return self._normalize_cached(surface)
+        return surface.lower() if self._lowercase else surface
 
     def _iter_tokens(self, text: str) -> Iterator[str]:
         """Yield tokens with filtering applied during iteration."""
+        normalize = self._normalize_cached
+
         for match in _TOKEN_PATTERN.finditer(text):
             token = match.group(0)
 
@@ -184,15 +662,50 @@ class Tokenizer:
             if self._strip_numbers and token[0].isdigit():
                 continue
 
-            if self._lowercase:
+            if normalize is not None:
+                token = normalize(token)
+            elif self._lowercase:
                 token = token.lower()
 
             yield token
 
+    def _ascii_tokens(self, text: str) -> list[str]:
+        """
+        Tokenize normalized ASCII text at the bytes level.
+
+        The buffer is lowercased once up front rather than per token. Because
+        the token pattern ignores case, this does not change which spans match.
+        """
+        data = _clean_ascii_artifacts(text.encode("ascii"))
+        if self._lowercase:
+            data = data.lower()
+
+        tokens = _ASCII_TOKEN_PATTERN.findall(data)
+        if self._min_length > 1 or self._strip_numbers:
+            tokens = [
+                token
+                for token in tokens
+                if len(token) >= self._min_length
+                and not (self._strip_numbers and token[:1].isdigit())
+            ]
+        if not tokens:
+            return []
+
+        # Tokens never contain spaces: decode them all in one pass
+        decoded = b" ".join(tokens).decode("ascii").split(" ")
+        if self._normalize_cached is not None:
+            return list(map(self._normalize_cached, decoded))
+        return decoded
+
     def tokenize(self, text: str) -> list[str]:
         """
         Tokenize text into words.
 
+        ASCII text (after unicode normalization) takes a bytes-level fast path
+        that yields the same tokens. Mostly-ASCII text is cut at safe boundaries
+        so that only the segments containing non-ASCII characters take the
+        general path.
+
         Args:
             text: Raw input text
 
@@ -200,8 +713,57 @@ class Tokenizer:
             List of tokens
         """
         text = normalize_unicode(text)
-        text = clean_text_artifacts(text)
-        return list(self._iter_tokens(text))
+        if text.isascii():
+            return self._ascii_tokens(text)
+
+        tokens: list[str] = []
+        for segment in segment_text(text, _ASCII_SEGMENT_SIZE):
+            if segment.isascii():
+                tokens.extend(self._ascii_tokens(segment))
+            else:
+                tokens.extend(self._iter_tokens(clean_text_artifacts(segment)))
+        return tokens
+
+    def tokenize_spans(self, text: str) -> TokenSpans:
+        """
+        Tokenize text into offsets over a single normalized buffer.
+
+        The text is normalized and cleaned once, the buffer is lowercased once,
+        and each token is recorded only as (start, end) offsets. The tokens are
+        identical to tokenize(), and every offset can be mapped back to the
+        source text (e.g. to highlight STTR chunks).
+
+        Args:
+            text: Raw input text
+
+        Returns:
+            TokenSpans over the normalized buffer
+        """
+        buffer, maps = _normalize_tracked(text)
+
+        starts = array("Q")
+        ends = array("Q")
+        min_length = self._min_length
+        strip_numbers = self._strip_numbers
+        for match in _TOKEN_PATTERN.finditer(buffer):
+            start, end = match.span()
+            if end - start < min_length:
+                continue
+            if strip_numbers and buffer[start].isdigit():
+                continue
+            starts.append(start)
+            ends.append(end)
+
+        # Lowercase the whole buffer once, unless that would shift offsets
+        lower = False
+        if self._lowercase and self._normalize_cached is None:
+            lowered = buffer.lower()
+            if len(lowered) == len(buffer):
+                buffer = lowered
+            else:
+                lower = True
+
+        return TokenSpans(buffer, starts, ends, maps, lower, self._normalize_cached)
 
     def tokenize_iter(self, text: str) -> Iterator[str]:
         """
@@ -217,6 +779,107 @@ class Tokenizer:
         text = clean_text_artifacts(text)
         yield from self._iter_tokens(text)
 
+    def tokenize_stream(self, blocks: Iterable[str]) -> Iterator[str]:
+        """
+        Lazily tokenize text that arrives in blocks (e.g. from a decoder).
+
+        Blocks may split words, markup or hyphenated line breaks anywhere. Text
+        is buffered until a safe cut is available, so the tokens are identical
+        to tokenize() on the joined blocks while only a small tail of the text
+        is held at a time.
+
+        Args:
+            blocks: Consecutive pieces of the raw input text
+
+        Yields:
+            Individual tokens
+        """
+        buffer = ""
+        for block in blocks:
+            buffer += block
+            target = max(1, len(buffer) - _STREAM_LOOKBACK)
+            cut = _next_cut(buffer, 0, target, _LINE_BREAK_PATTERN, complete=False)
+            if cut < 0:
+                cut = _next_cut(buffer, 0, target, _WHITESPACE_PATTERN, complete=False)
+            if cut < 0:
+                continue
+            yield from self.tokenize(buffer[:cut])
+            buffer = buffer[cut:]
+
+        if buffer:
+            yield from self.tokenize(buffer)
+
+    def tokenize_window(
+        self, text: str, position: int, count: int, window: int
+    ) -> Optional[list[str]]:
+        """
+        Tokenize count consecutive tokens from inside a text.
+
+        The window starts at the first safe cut at or after position (see
+        segment_text) and ends at a safe cut at least window characters later,
+        doubling until it holds count tokens. Only the window is normalized and
+        tokenized. Unless an italics or bracket span opened before position is
+        still open there, the tokens are those tokenize() gives for that
+        stretch of the whole text.
+
+        Args:
+            text: Raw input text
+            position: Character offset to start from
+            count: Tokens to return
+            window: Initial window size in characters
+
+        Returns:
+            The first count tokens of the window, or None if the text ends first
+        """
+        start = 0
+        if position > 0:
+            start = _next_cut(text, position, position, _WHITESPACE_PATTERN)
+            if start < 0:
+                return None
+
+        while True:
+            end = _next_cut(text, start, start + window, _WHITESPACE_PATTERN)
+            tokens = self.tokenize(text[start:end] if end >= 0 else text[start:])
+            if len(tokens) >= count:
+                return tokens[:count]
+            if end < 0:
+                return None
+            window *= 2
+
+    def tokenize_parallel(
+        self,
+        text: str,
+        max_workers: Optional[int] = None,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        executor: Optional[Executor] = None,
+    ) -> list[str]:
+        """
+        Tokenize a large text across multiple processes.
+
+        The text is cut at safe whitespace boundaries (see segment_text), each
+        segment is tokenized in a worker, and the token streams are joined in
+        order. The result is identical to tokenize(), so unique counts and STTR
+        chunk alignment are unaffected.
+
+        Args:
+            text: Raw input text
+            max_workers: Worker processes (default: CPU count)
+            segment_size: Target characters per segment
+            executor: Existing executor to use instead of a new process pool
+
+        Returns:
+            List of tokens
+        """
+        segments = segment_text(text, segment_size)
+        if len(segments) == 1:
+            return self.tokenize(text)
+
+        if executor is not None:
+            return list(chain.from_iterable(executor.map(self.tokenize, segments)))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            return list(chain.from_iterable(pool.map(self.tokenize, segments)))
+
 
 # =============================================================================
 # CONVENIENCE FUNCTIONS
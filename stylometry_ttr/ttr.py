@@ -11,11 +11,23 @@ to total words (tokens). This module provides four variants:
 """
 
 import math
+import random
 import statistics
-from dataclasses import dataclass
-from typing import Optional
-
-from stylometry_ttr.models import TTRResult, TTRAggregate, ChunkTTR
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Iterable, NamedTuple, Optional, Union
+
+from stylometry_ttr.models import (
+    TTRResult,
+    TTRAggregate,
+    ChunkTTR,
+    ChunkSeries,
+    STTREstimate,
+    TypeSignature,
+)
+from stylometry_ttr.minhash import minhash_signature
+from stylometry_ttr.tokenizer import Tokenizer
+from stylometry_ttr.vocabulary import Vocabulary
 
 
 @dataclass
@@ -25,6 +37,35 @@ class TTRConfig:
     sttr_chunk_size: int = 1000  # Words per chunk for STTR
     min_words_for_sttr: int = 2000  # Minimum words to compute STTR
     return_chunk_details: bool = False  # Return per-chunk TTR data
+    compact_chunk_details: bool = False  # Return chunk data as a ChunkSeries array
+    sttr_sample_size: Optional[int] = None  # Chunks to sample for approximate STTR (None = all)
+    sttr_sample_method: str = "random"  # "random" or "stratified"
+    sttr_sample_seed: Optional[int] = None  # Seed for reproducible chunk sampling
+    type_vocabulary: Optional[Vocabulary] = None  # Shared vocabulary for type signatures
+    minhash_permutations: Optional[int] = None  # MinHash signature slots (None = no signature)
+    minhash_seed: int = 0  # Hash seed; signatures are comparable only with the same seed
+
+
+_SAMPLE_METHODS = ("random", "stratified")
+
+# Raw characters per token assumed when sizing sampled windows of a text. English
+# averages about six, so most windows hold a full chunk on the first try.
+_CHARS_PER_TOKEN = 8
+
+
+class _STTRStats(NamedTuple):
+    """Chunk-based metrics for one text (all None when STTR is not computed)."""
+
+    sttr: Optional[float] = None
+    sttr_std: Optional[float] = None
+    sttr_se: Optional[float] = None
+    chunk_count: Optional[int] = None
+    sample_count: Optional[int] = None
+    delta_mean: Optional[float] = None
+    delta_std: Optional[float] = None
+    delta_min: Optional[float] = None
+    delta_max: Optional[float] = None
+    chunk_details: Optional[Union[ChunkSeries, list[ChunkTTR]]] = None
 
 
 class TTRCalculator:
@@ -43,6 +84,19 @@ class TTRCalculator:
         """
         self._config = config or TTRConfig()
 
+        if self._config.sttr_sample_method not in _SAMPLE_METHODS:
+            raise ValueError(
+                f"Unknown sttr_sample_method {self._config.sttr_sample_method!r}; "
+                f"expected one of {_SAMPLE_METHODS}"
+            )
+        if self._config.sttr_sample_size is not None and self._config.sttr_sample_size < 2:
+            raise ValueError("sttr_sample_size must be at least 2")
+        permutations = self._config.minhash_permutations
+        if permutations is not None and permutations < 1:
+            raise ValueError("minhash_permutations must be at least 1")
+        if not 0 <= self._config.minhash_seed < 2**64:
+            raise ValueError("minhash_seed must be a non-negative 64-bit integer")
+
     def compute(
         self,
         tokens: list[str],
@@ -65,42 +119,191 @@ class TTRCalculator:
         total_words = len(tokens)
 
         if total_words == 0:
-            return TTRResult(
-                text_id=text_id,
-                title=title,
-                author=author,
-                total_words=0,
-                unique_words=0,
-                ttr=0.0,
-                root_ttr=0.0,
-                log_ttr=0.0,
-                sttr=None,
-                sttr_std=None,
-                chunk_count=None,
-                delta_mean=None,
-                delta_std=None,
-                delta_min=None,
-                delta_max=None,
-                chunk_ttrs=None,
-            )
+            return self._build_result(text_id, title, author, 0, 0, _STTRStats(), set())
 
         # Count unique words
-        unique_words = len(set(tokens))
+        types = set(tokens)
+        unique_words = len(types)
+
+        # Standardized TTR and deltas (computed on fixed-size chunks)
+        if self._should_sample(total_words):
+            stats = self._compute_sampled_sttr(tokens)
+        else:
+            stats = self._compute_sttr(tokens)
 
-        # Raw TTR
-        ttr = unique_words / total_words
+        return self._build_result(text_id, title, author, total_words, unique_words, stats, types)
 
-        # Root TTR (Guiraud's index)
-        root_ttr = unique_words / math.sqrt(total_words)
+    def compute_text(
+        self,
+        text: str,
+        text_id: str,
+        title: str = "",
+        author: str = "",
+        tokenizer: Optional[Tokenizer] = None,
+        max_workers: Optional[int] = None,
+    ) -> TTRResult:
+        """
+        Compute all TTR variants from raw text.
 
-        # Log TTR (Herdan's C)
-        log_ttr = math.log(unique_words) / math.log(total_words) if total_words > 1 else 0.0
+        This is compute() on the tokenized text, so every count is exact. To
+        estimate STTR without tokenizing a long text in full, use
+        estimate_sttr().
 
-        # Standardized TTR and deltas (computed on fixed-size chunks)
-        sttr, sttr_std, chunk_count, delta_mean, delta_std, delta_min, delta_max, chunk_details = (
-            self._compute_sttr(tokens)
+        Args:
+            text: Raw input text
+            text_id: Unique identifier for the text
+            title: Title of the text (optional)
+            author: Author identifier (optional)
+            tokenizer: Tokenizer to apply (uses defaults if not provided)
+            max_workers: Tokenize a whole text across this many processes
+                (default: sequential)
+
+        Returns:
+            TTRResult with all computed metrics
+        """
+        tokenizer = tokenizer or Tokenizer()
+        if max_workers is None:
+            tokens = tokenizer.tokenize(text)
+        else:
+            tokens = tokenizer.tokenize_parallel(text, max_workers=max_workers)
+        return self.compute(tokens, text_id=text_id, title=title, author=author)
+
+    def estimate_sttr(
+        self,
+        text: str,
+        text_id: str,
+        title: str = "",
+        author: str = "",
+        tokenizer: Optional[Tokenizer] = None,
+    ) -> STTREstimate:
+        """
+        Estimate STTR from sampled windows of raw text.
+
+        With sttr_sample_size, a text long enough that the sample covers only
+        part of it is never tokenized in full: the text is divided into equal
+        character slots, slots are sampled like chunks, and each sampled chunk
+        is the first sttr_chunk_size tokens after a safe cut in its slot. Only
+        those windows are tokenized, and sttr_se omits the finite population
+        correction. Shorter texts, and configs without sttr_sample_size, are
+        tokenized in full and give the STTR of compute().
+
+        Args:
+            text: Raw input text
+            text_id: Unique identifier for the text
+            title: Title of the text (optional)
+            author: Author identifier (optional)
+            tokenizer: Tokenizer to apply (uses defaults if not provided)
+
+        Returns:
+            STTREstimate; windowed tells whether only sampled windows were read
+        """
+        tokenizer = tokenizer or Tokenizer()
+        stats = self._sample_text(text, tokenizer) if self._samples_text(text) else None
+        windowed = stats is not None
+        if stats is None:
+            # Types are not needed for STTR, so skip signatures of the full text
+            config = replace(self._config, type_vocabulary=None, minhash_permutations=None)
+            result = TTRCalculator(config).compute(tokenizer.tokenize(text), text_id=text_id)
+            stats = _STTRStats(
+                sttr=result.sttr,
+                sttr_std=result.sttr_std,
+                sttr_se=result.sttr_se,
+                sample_count=result.sttr_sample_count,
+            )
+        return STTREstimate(
+            text_id=text_id,
+            title=title,
+            author=author,
+            sttr=_round(stats.sttr),
+            sttr_std=_round(stats.sttr_std),
+            sttr_se=_round(stats.sttr_se),
+            sttr_sample_count=stats.sample_count,
+            windowed=windowed,
         )
 
+    def compute_iter(
+        self,
+        tokens: Iterable[str],
+        text_id: str,
+        title: str = "",
+        author: str = "",
+    ) -> TTRResult:
+        """
+        Compute all TTR variants from a token stream.
+
+        Only one chunk of tokens is held at a time, so memory is bounded by the
+        vocabulary rather than the text length. The result is identical to
+        compute() on the same tokens. With sttr_sample_size, every chunk is
+        still evaluated as it streams past and the sample is drawn afterwards.
+
+        Args:
+            tokens: Iterable of word tokens
+            text_id: Unique identifier for the text
+            title: Title of the text (optional)
+            author: Author identifier (optional)
+
+        Returns:
+            TTRResult with all computed metrics
+        """
+        chunk_size = self._config.sttr_chunk_size
+        stream = iter(tokens)
+
+        types: set[str] = set()
+        chunk_ttrs: list[float] = []
+        total_words = 0
+
+        for chunk in iter(lambda: list(islice(stream, chunk_size)), []):
+            types.update(chunk)
+            total_words += len(chunk)
+            if len(chunk) == chunk_size:
+                chunk_ttrs.append(len(set(chunk)) / chunk_size)
+
+        if total_words == 0:
+            return self._build_result(text_id, title, author, 0, 0, _STTRStats(), types)
+
+        if total_words < self._config.min_words_for_sttr:
+            stats = _STTRStats()
+        elif self._should_sample(total_words):
+            indices = self._sample_chunk_indices(len(chunk_ttrs))
+            stats = self._summarize_sample(
+                len(chunk_ttrs), indices, [chunk_ttrs[i] for i in indices]
+            )
+        else:
+            stats = self._summarize_chunks(chunk_ttrs)
+
+        return self._build_result(text_id, title, author, total_words, len(types), stats, types)
+
+    def _build_result(
+        self,
+        text_id: str,
+        title: str,
+        author: str,
+        total_words: int,
+        unique_words: int,
+        stats: _STTRStats,
+        types: set[str],
+    ) -> TTRResult:
+        """Derive the length-based TTR variants and assemble the result."""
+        vocabulary = self._config.type_vocabulary
+        signature = vocabulary.signature(types) if vocabulary is not None else None
+        minhash = None
+        if self._config.minhash_permutations is not None:
+            minhash = minhash_signature(
+                types, self._config.minhash_permutations, self._config.minhash_seed
+            )
+
+        if total_words == 0:
+            ttr = root_ttr = log_ttr = 0.0
+        else:
+            # Raw TTR
+            ttr = unique_words / total_words
+
+            # Root TTR (Guiraud's index)
+            root_ttr = unique_words / math.sqrt(total_words)
+
+            # Log TTR (Herdan's C)
+            log_ttr = math.log(unique_words) / math.log(total_words) if total_words > 1 else 0.0
+
         return TTRResult(
             text_id=text_id,
             title=title,
@@ -110,49 +313,39 @@ class TTRCalculator:
             ttr=round(ttr, 6),
             root_ttr=round(root_ttr, 4),
             log_ttr=round(log_ttr, 6),
-            sttr=round(sttr, 6) if sttr is not None else None,
-            sttr_std=round(sttr_std, 6) if sttr_std is not None else None,
-            chunk_count=chunk_count,
-            delta_mean=round(delta_mean, 6) if delta_mean is not None else None,
-            delta_std=round(delta_std, 6) if delta_std is not None else None,
-            delta_min=round(delta_min, 6) if delta_min is not None else None,
-            delta_max=round(delta_max, 6) if delta_max is not None else None,
-            chunk_ttrs=chunk_details,
+            sttr=_round(stats.sttr),
+            sttr_std=_round(stats.sttr_std),
+            sttr_se=_round(stats.sttr_se),
+            chunk_count=stats.chunk_count,
+            sttr_sample_count=stats.sample_count,
+            delta_mean=_round(stats.delta_mean),
+            delta_std=_round(stats.delta_std),
+            delta_min=_round(stats.delta_min),
+            delta_max=_round(stats.delta_max),
+            chunk_ttrs=stats.chunk_details,
+            type_signature=signature,
+            minhash=minhash,
         )
 
-    def _compute_sttr(
-        self, tokens: list[str]
-    ) -> tuple[
-        Optional[float],
-        Optional[float],
-        Optional[int],
-        Optional[float],
-        Optional[float],
-        Optional[float],
-        Optional[float],
-        Optional[list[ChunkTTR]],
-    ]:
+    def _compute_sttr(self, tokens: list[str]) -> _STTRStats:
         """
         Compute Standardized TTR and delta metrics using fixed-size chunks.
 
         STTR averages the TTR across non-overlapping chunks of text,
         which normalizes for document length.
 
-        Delta metrics capture chunk-to-chunk variability: TTR(n) - TTR(n-1)
-
         Args:
             tokens: List of tokens
 
         Returns:
-            Tuple of (mean_sttr, std_sttr, chunk_count, delta_mean, delta_std,
-                      delta_min, delta_max, chunk_details)
+            Chunk-based metrics
         """
         total_words = len(tokens)
         chunk_size = self._config.sttr_chunk_size
 
         # Need minimum words
         if total_words < self._config.min_words_for_sttr:
-            return None, None, None, None, None, None, None, None
+            return _STTRStats()
 
         # Compute TTR for each chunk
         chunk_ttrs: list[float] = []
@@ -163,15 +356,31 @@ class TTRCalculator:
             chunk_ttr = chunk_unique / chunk_size
             chunk_ttrs.append(chunk_ttr)
 
+        return self._summarize_chunks(chunk_ttrs)
+
+    def _summarize_chunks(self, chunk_ttrs: list[float]) -> _STTRStats:
+        """
+        Summarize the TTR of every chunk into STTR and delta metrics.
+
+        Delta metrics capture chunk-to-chunk variability: TTR(n) - TTR(n-1)
+
+        Args:
+            chunk_ttrs: TTR of each chunk, in order
+
+        Returns:
+            Chunk-based metrics
+        """
         if not chunk_ttrs:
-            return None, None, None, None, None, None, None, None
+            return _STTRStats()
 
         mean_sttr = statistics.mean(chunk_ttrs)
         std_sttr = statistics.stdev(chunk_ttrs) if len(chunk_ttrs) > 1 else 0.0
 
         # Build chunk details if requested
-        chunk_details: Optional[list[ChunkTTR]] = None
-        if self._config.return_chunk_details:
+        chunk_details: Optional[Union[ChunkSeries, list[ChunkTTR]]] = None
+        if self._config.return_chunk_details and self._config.compact_chunk_details:
+            chunk_details = ChunkSeries(round(ttr, 6) for ttr in chunk_ttrs)
+        elif self._config.return_chunk_details:
             chunk_details = [
                 ChunkTTR(chunk_number=i + 1, ttr=round(ttr, 6))
                 for i, ttr in enumerate(chunk_ttrs)
@@ -179,15 +388,229 @@ class TTRCalculator:
 
         # Compute deltas: TTR(n) - TTR(n-1)
         if len(chunk_ttrs) < 2:
-            return mean_sttr, std_sttr, len(chunk_ttrs), None, None, None, None, chunk_details
+            return _STTRStats(
+                sttr=mean_sttr,
+                sttr_std=std_sttr,
+                chunk_count=len(chunk_ttrs),
+                chunk_details=chunk_details,
+            )
 
         deltas = [chunk_ttrs[i] - chunk_ttrs[i - 1] for i in range(1, len(chunk_ttrs))]
-        delta_mean = statistics.mean(deltas)
-        delta_std = statistics.stdev(deltas) if len(deltas) > 1 else 0.0
-        delta_min = min(deltas)
-        delta_max = max(deltas)
 
-        return mean_sttr, std_sttr, len(chunk_ttrs), delta_mean, delta_std, delta_min, delta_max, chunk_details
+        return _STTRStats(
+            sttr=mean_sttr,
+            sttr_std=std_sttr,
+            chunk_count=len(chunk_ttrs),
+            delta_mean=statistics.mean(deltas),
+            delta_std=statistics.stdev(deltas) if len(deltas) > 1 else 0.0,
+            delta_min=min(deltas),
+            delta_max=max(deltas),
+            chunk_details=chunk_details,
+        )
+
+    def _should_sample(self, total_words: int) -> bool:
+        """Return True if STTR should be estimated from a subset of chunks."""
+        sample_size = self._config.sttr_sample_size
+        if sample_size is None or total_words < self._config.min_words_for_sttr:
+            return False
+        return sample_size < total_words // self._config.sttr_chunk_size
+
+    def _samples_text(self, text: str) -> bool:
+        """Return True if estimate_sttr() reads only sampled windows of the raw text."""
+        config = self._config
+        if config.sttr_sample_size is None:
+            return False
+        if len(text) < config.min_words_for_sttr * _CHARS_PER_TOKEN:
+            return False
+        return config.sttr_sample_size < len(text) // (config.sttr_chunk_size * _CHARS_PER_TOKEN)
+
+    def _sample_text(self, text: str, tokenizer: Tokenizer) -> Optional[_STTRStats]:
+        """
+        Estimate STTR from sampled windows of the raw text.
+
+        The text is divided into equal character slots, sampled like chunks,
+        and the first chunk of tokens after the start of each sampled slot is
+        evaluated.
+
+        Args:
+            text: Raw input text
+            tokenizer: Tokenizer to apply to each window
+
+        Returns:
+            Chunk-based metrics, or None if a window ran past the end of the text
+        """
+        chunk_size = self._config.sttr_chunk_size
+        window = chunk_size * _CHARS_PER_TOKEN
+        chunk_ttrs: list[float] = []
+        for index in self._sample_chunk_indices(len(text) // window):
+            tokens = tokenizer.tokenize_window(text, index * window, chunk_size, window)
+            if tokens is None:
+                return None
+            chunk_ttrs.append(len(set(tokens)) / chunk_size)
+
+        std_sttr = statistics.stdev(chunk_ttrs)
+        return _STTRStats(
+            sttr=statistics.mean(chunk_ttrs),
+            sttr_std=std_sttr,
+            sttr_se=std_sttr / math.sqrt(len(chunk_ttrs)),
+            sample_count=len(chunk_ttrs),
+        )
+
+    def _sample_chunk_indices(self, chunk_count: int) -> list[int]:
+        """
+        Choose which chunks to evaluate for a sampled STTR estimate.
+
+        "random" draws chunks uniformly without replacement. "stratified" splits
+        the text into equal-width strata and draws one chunk from each, so the
+        sample covers the beginning, middle and end of the text evenly.
+
+        Args:
+            chunk_count: Total number of full chunks in the text
+
+        Returns:
+            Sorted 0-indexed chunk positions
+        """
+        sample_size = self._config.sttr_sample_size
+        rng = random.Random(self._config.sttr_sample_seed)
+
+        if self._config.sttr_sample_method == "stratified":
+            return [
+                rng.randrange(k * chunk_count // sample_size, (k + 1) * chunk_count // sample_size)
+                for k in range(sample_size)
+            ]
+
+        return sorted(rng.sample(range(chunk_count), sample_size))
+
+    def _compute_sampled_sttr(self, tokens: list[str]) -> _STTRStats:
+        """
+        Estimate STTR from a sample of chunks instead of every chunk.
+
+        Only the sampled chunks are sliced and reduced to type sets.
+
+        Args:
+            tokens: List of tokens
+
+        Returns:
+            Chunk-based metrics
+        """
+        chunk_size = self._config.sttr_chunk_size
+        chunk_count = len(tokens) // chunk_size
+        indices = self._sample_chunk_indices(chunk_count)
+
+        chunk_ttrs = [
+            len(set(tokens[i * chunk_size : (i + 1) * chunk_size])) / chunk_size for i in indices
+        ]
+        return self._summarize_sample(chunk_count, indices, chunk_ttrs)
+
+    def _summarize_sample(
+        self, chunk_count: int, indices: list[int], chunk_ttrs: list[float]
+    ) -> _STTRStats:
+        """
+        Summarize sampled chunk TTRs into an STTR estimate with standard error.
+
+        The standard error uses the finite population correction, since chunks
+        are drawn without replacement from a known number of chunks. For
+        stratified samples this is a conservative approximation.
+
+        Delta metrics are not estimated: they require consecutive chunks. Chunk
+        details are always ChunkTTR objects, since sampled chunk numbers are
+        not consecutive.
+
+        Args:
+            chunk_count: Total number of full chunks in the text
+            indices: 0-indexed positions of the sampled chunks
+            chunk_ttrs: TTR of each sampled chunk
+
+        Returns:
+            Chunk-based metrics
+        """
+        sample_count = len(chunk_ttrs)
+
+        mean_sttr = statistics.mean(chunk_ttrs)
+        std_sttr = statistics.stdev(chunk_ttrs)
+        fpc = (chunk_count - sample_count) / (chunk_count - 1)
+        standard_error = std_sttr / math.sqrt(sample_count) * math.sqrt(fpc)
+
+        chunk_details: Optional[list[ChunkTTR]] = None
+        if self._config.return_chunk_details:
+            chunk_details = [
+                ChunkTTR(chunk_number=i + 1, ttr=round(ttr, 6))
+                for i, ttr in zip(indices, chunk_ttrs)
+            ]
+
+        return _STTRStats(
+            sttr=mean_sttr,
+            sttr_std=std_sttr,
+            sttr_se=standard_error,
+            chunk_count=chunk_count,
+            sample_count=sample_count,
+            chunk_details=chunk_details,
+        )
+
+
+def _round(value: Optional[float], digits: int = 6) -> Optional[float]:
+    """Round a metric that may be None."""
+    return round(value, digits) if value is not None else None
+
+
+class _TextMetrics(NamedTuple):
+    """The per-text metrics that group aggregates are computed from."""
+
+    total_words: int
+    ttr: float
+    root_ttr: float
+    log_ttr: float
+    sttr: Optional[float]
+    delta_std: Optional[float]
+
+    @classmethod
+    def from_result(cls, result: TTRResult) -> "_TextMetrics":
+        return cls(
+            result.total_words,
+            result.ttr,
+            result.root_ttr,
+            result.log_ttr,
+            result.sttr,
+            result.delta_std,
+        )
+
+
+def _aggregate_metrics(
+    metrics: list[_TextMetrics], group_id: str, pooled_unique_words: Optional[int] = None
+) -> TTRAggregate:
+    """Compute aggregate statistics from per-text metrics."""
+    total_words = sum(m.total_words for m in metrics)
+    ttrs = [m.ttr for m in metrics]
+    root_ttrs = [m.root_ttr for m in metrics]
+    log_ttrs = [m.log_ttr for m in metrics]
+    sttrs = [m.sttr for m in metrics if m.sttr is not None]
+    delta_stds = [m.delta_std for m in metrics if m.delta_std is not None]
+
+    return TTRAggregate(
+        group_id=group_id,
+        text_count=len(metrics),
+        total_words=total_words,
+        ttr_mean=round(statistics.mean(ttrs), 6),
+        ttr_std=round(statistics.stdev(ttrs), 6) if len(ttrs) > 1 else 0.0,
+        ttr_min=round(min(ttrs), 6),
+        ttr_max=round(max(ttrs), 6),
+        ttr_median=round(statistics.median(ttrs), 6),
+        root_ttr_mean=round(statistics.mean(root_ttrs), 4),
+        root_ttr_std=round(statistics.stdev(root_ttrs), 4) if len(root_ttrs) > 1 else 0.0,
+        log_ttr_mean=round(statistics.mean(log_ttrs), 6),
+        log_ttr_std=round(statistics.stdev(log_ttrs), 6) if len(log_ttrs) > 1 else 0.0,
+        sttr_mean=round(statistics.mean(sttrs), 6) if sttrs else None,
+        sttr_std=round(statistics.stdev(sttrs), 6) if len(sttrs) > 1 else None,
+        delta_std_mean=round(statistics.mean(delta_stds), 6) if delta_stds else None,
+        pooled_unique_words=pooled_unique_words,
+        pooled_ttr=_pooled_ttr(pooled_unique_words, total_words),
+    )
+
+
+def _pooled_ttr(pooled_unique_words: Optional[int], total_words: int) -> Optional[float]:
+    if pooled_unique_words is None:
+        return None
+    return round(pooled_unique_words / total_words, 6) if total_words else 0.0
 
 
 class TTRAggregator:
@@ -197,6 +620,9 @@ class TTRAggregator:
         """
         Compute aggregate statistics from multiple TTR results.
 
+        If every result carries a type signature (see TTRConfig.type_vocabulary),
+        the pooled vocabulary size and pooled TTR of the group are included.
+
         Args:
             results: List of per-text TTR results
             group_id: Identifier for the group (e.g., author name)
@@ -207,26 +633,88 @@ class TTRAggregator:
         if not results:
             raise ValueError("Cannot aggregate empty results list")
 
-        ttrs = [r.ttr for r in results]
-        root_ttrs = [r.root_ttr for r in results]
-        log_ttrs = [r.log_ttr for r in results]
-        sttrs = [r.sttr for r in results if r.sttr is not None]
-        delta_stds = [r.delta_std for r in results if r.delta_std is not None]
-
-        return TTRAggregate(
-            group_id=group_id,
-            text_count=len(results),
-            total_words=sum(r.total_words for r in results),
-            ttr_mean=round(statistics.mean(ttrs), 6),
-            ttr_std=round(statistics.stdev(ttrs), 6) if len(ttrs) > 1 else 0.0,
-            ttr_min=round(min(ttrs), 6),
-            ttr_max=round(max(ttrs), 6),
-            ttr_median=round(statistics.median(ttrs), 6),
-            root_ttr_mean=round(statistics.mean(root_ttrs), 4),
-            root_ttr_std=round(statistics.stdev(root_ttrs), 4) if len(root_ttrs) > 1 else 0.0,
-            log_ttr_mean=round(statistics.mean(log_ttrs), 6),
-            log_ttr_std=round(statistics.stdev(log_ttrs), 6) if len(log_ttrs) > 1 else 0.0,
-            sttr_mean=round(statistics.mean(sttrs), 6) if sttrs else None,
-            sttr_std=round(statistics.stdev(sttrs), 6) if len(sttrs) > 1 else None,
-            delta_std_mean=round(statistics.mean(delta_stds), 6) if delta_stds else None,
-        )
+        signatures = [r.type_signature for r in results]
+        pooled = None
+        if all(signature is not None for signature in signatures):
+            pooled = TypeSignature.union_size(signatures)
+
+        return _aggregate_metrics([_TextMetrics.from_result(r) for r in results], group_id, pooled)
+
+
+def by_author(result: TTRResult) -> str:
+    """Default group key of CorpusJob and TTRStore: the result's author."""
+    return result.author
+
+
+class RunningAggregate:
+    """
+    Group aggregate maintained one result at a time.
+
+    Keeps only the per-text metrics that aggregation needs, keyed by text_id,
+    plus each text's type signature when it has one, so results can be added
+    or replaced incrementally and the state can be saved and restored.
+    to_aggregate() returns the same statistics as TTRAggregator.aggregate()
+    on the same results, including the pooled vocabulary.
+    """
+
+    __slots__ = ("_texts", "_signatures")
+
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        self._texts: dict[str, _TextMetrics] = {}
+        self._signatures: dict[str, TypeSignature] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text_id: object) -> bool:
+        return text_id in self._texts
+
+    def add(self, result: TTRResult) -> None:
+        """Add a result, replacing any earlier result with the same text_id."""
+        self._texts[result.text_id] = _TextMetrics.from_result(result)
+        if result.type_signature is None:
+            self._signatures.pop(result.text_id, None)
+        else:
+            self._signatures[result.text_id] = result.type_signature
+
+    def remove(self, text_id: str) -> None:
+        """Remove the result for text_id (KeyError if absent)."""
+        del self._texts[text_id]
+        self._signatures.pop(text_id, None)
+
+    def to_aggregate(self, group_id: str) -> TTRAggregate:
+        """
+        Compute aggregate statistics for the results added so far.
+
+        Args:
+            group_id: Identifier for the group (e.g., author name)
+
+        Returns:
+            TTRAggregate with aggregate statistics
+        """
+        if not self._texts:
+            raise ValueError("Cannot aggregate empty results list")
+        pooled = None
+        if len(self._signatures) == len(self._texts):
+            pooled = TypeSignature.union_size(self._signatures.values())
+        return _aggregate_metrics(list(self._texts.values()), group_id, pooled)
+
+    def to_dict(self) -> dict[str, list]:
+        """Return a JSON-serializable snapshot of the state."""
+        data = {}
+        for text_id, metrics in self._texts.items():
+            signature = self._signatures.get(text_id)
+            data[text_id] = [*metrics, None if signature is None else signature.ids.tolist()]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, list]) -> "RunningAggregate":
+        """Restore an aggregate from a to_dict() snapshot."""
+        running = cls()
+        fields = len(_TextMetrics._fields)
+        for text_id, values in data.items():
+            running._texts[text_id] = _TextMetrics(*values[:fields])
+            if values[fields:] and values[fields] is not None:
+                running._signatures[text_id] = TypeSignature(values[fields])
+        return running
@@ -0,0 +1,73 @@
+"""
+TTR under several tokenizer configurations from one tokenization pass.
+
+Tokenizer settings (lowercase, min_length, strip_numbers, normalizer)
+never change which spans of text are matched as tokens; they only filter
+or map the matched surface forms. So the text is tokenized once with case
+preserved, each distinct surface type is resolved once per
+configuration (kept or dropped, folded or not), and the per-token
+stream for each configuration is derived from those per-type lookups.
+"""
+
+from typing import Mapping, Optional
+
+from stylometry_ttr.models import TTRResult
+from stylometry_ttr.tokenizer import Tokenizer
+from stylometry_ttr.ttr import TTRCalculator, TTRConfig
+
+
+def _resolve_type(surface: str, tokenizer: Tokenizer) -> Optional[str]:
+    """Return the token a tokenizer yields for a surface form, or None if dropped."""
+    if len(surface) < tokenizer.min_length:
+        return None
+    if tokenizer.strip_numbers and surface[0].isdigit():
+        return None
+    return tokenizer.normalize_token(surface)
+
+
+def compute_ttr_variants(
+    text: str,
+    text_id: str,
+    tokenizers: Mapping[str, Tokenizer],
+    title: str = "",
+    author: str = "",
+    config: Optional[TTRConfig] = None,
+) -> dict[str, TTRResult]:
+    """
+    Compute TTR metrics under several tokenizer configurations at once.
+
+    Each result is identical to tokenizing the text with that tokenizer and
+    computing TTR on the tokens, but the normalize/clean/match pipeline runs
+    only once.
+
+    Args:
+        text: Raw input text
+        text_id: Unique identifier for the text
+        tokenizers: Tokenizer for each variant, keyed by variant name
+        title: Title of the text (optional)
+        author: Author identifier (optional)
+        config: TTR configuration (optional)
+
+    Returns:
+        TTRResult for each variant, keyed by variant name
+    """
+    surface_tokens = Tokenizer(lowercase=False).tokenize(text)
+
+    # Index each token by its distinct surface type
+    types = list(dict.fromkeys(surface_tokens))
+    type_index = {surface: i for i, surface in enumerate(types)}
+    type_ids = list(map(type_index.__getitem__, surface_tokens))
+    del surface_tokens
+
+    calculator = TTRCalculator(config=config)
+    results: dict[str, TTRResult] = {}
+
+    for name, tokenizer in tokenizers.items():
+        resolved = [_resolve_type(surface, tokenizer) for surface in types]
+        tokens = list(map(resolved.__getitem__, type_ids))
+        if None in resolved:
+            tokens = [token for token in tokens if token is not None]
+
+        results[name] = calculator.compute(tokens, text_id=text_id, title=title, author=author)
+
+    return results
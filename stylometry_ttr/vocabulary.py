@@ -0,0 +1,92 @@
+"""
+Shared corpus vocabulary for per-text type signatures.
+
+A Vocabulary assigns each distinct type a small integer ID the first
+time it is seen. With TTRConfig(type_vocabulary=...), every TTRResult
+carries a TypeSignature: the sorted IDs of its types. The pooled
+vocabulary of any group of texts is then the size of the union of their
+signatures, with no re-tokenization.
+"""
+
+import threading
+from typing import Iterable
+
+from stylometry_ttr.models import TypeSignature
+
+
+class Vocabulary:
+    """
+    Thread-safe mapping from types to stable integer IDs.
+
+    IDs are assigned in order of first appearance (new types within one
+    signature in sorted order) and never change, so signatures remain
+    comparable as the vocabulary grows. Save the
+    vocabulary with to_list() alongside any stored signatures.
+    """
+
+    __slots__ = ("_ids", "_types", "_lock")
+
+    def __init__(self, types: Iterable[str] = ()):
+        """
+        Initialize vocabulary.
+
+        Args:
+            types: Types to assign IDs 0, 1, 2, ... (e.g. a to_list() snapshot)
+        """
+        self._ids: dict[str, int] = {}
+        self._types: list[str] = []
+        self._lock = threading.Lock()
+        self.update(types)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __contains__(self, word: object) -> bool:
+        return word in self._ids
+
+    def id(self, word: str) -> int:
+        """Return the ID of a type, assigning a new one if unseen."""
+        word_id = self._ids.get(word)
+        if word_id is None:
+            self.update([word])
+            word_id = self._ids[word]
+        return word_id
+
+    def word(self, word_id: int) -> str:
+        """Return the type with the given ID (IndexError if unassigned)."""
+        return self._types[word_id]
+
+    def signature(self, types: Iterable[str]) -> TypeSignature:
+        """
+        Return the signature of a set of types, assigning IDs to unseen ones.
+
+        Args:
+            types: Distinct types of one text
+
+        Returns:
+            TypeSignature of the types' IDs
+        """
+        ids = self._ids
+        types = types if isinstance(types, (set, frozenset)) else set(types)
+        # Sorted so that ID assignment does not depend on set iteration order
+        self.update(sorted(word for word in types if word not in ids))
+        return TypeSignature(ids[word] for word in types)
+
+    def words(self, signature: TypeSignature) -> list[str]:
+        """Return the types of a signature, in ID order."""
+        return [self._types[word_id] for word_id in signature]
+
+    def to_list(self) -> list[str]:
+        """Return every type in ID order, for saving and restoring the vocabulary."""
+        return list(self._types)
+
+    def update(self, words: Iterable[str]) -> None:
+        """Assign IDs, in order, to any of the given types that have none yet."""
+        words = list(words)
+        if not words:
+            return
+        with self._lock:
+            for word in words:
+                if word not in self._ids:
+                    self._ids[word] = len(self._types)
+                    self._types.append(word)
@@ -0,0 +1,297 @@
+"""Tests for multi-process batch computation."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from stylometry_ttr import (
+    BatchRunner,
+    Document,
+    Tokenizer,
+    TTRCalculator,
+    TTRConfig,
+    batch,
+    compute_ttr,
+    compute_ttr_batch,
+)
+
+
+@pytest.fixture
+def documents(hound_text: str) -> list[Document]:
+    """A mix of long, short, empty and non-ASCII documents."""
+    return [
+        Document("hound", hound_text, title="The Hound of the Baskervilles", author="doyle"),
+        Document("short", "The quick brown fox jumps over the lazy dog."),
+        Document("empty", ""),
+        Document("unicode", "“Naïve café,” she said—ﬁnally."),
+        Document("half", hound_text[: len(hound_text) // 2], author="doyle"),
+    ]
+
+
+def _sequential(documents: list[Document], config: TTRConfig) -> list:
+    return [
+        compute_ttr(
+            doc.text, text_id=doc.text_id, title=doc.title, author=doc.author, config=config
+        )
+        for doc in documents
+    ]
+
+
+class TestBatchRunner:
+    """Tests for BatchRunner and compute_ttr_batch."""
+
+    @pytest.mark.parametrize("shared_memory", [True, False])
+    def test_matches_sequential(self, documents: list[Document], shared_memory: bool):
+        config = TTRConfig()
+        results = compute_ttr_batch(
+            documents, config=config, max_workers=2, shared_memory=shared_memory
+        )
+        assert results == _sequential(documents, config)
+
+    @pytest.mark.parametrize("shared_memory", [True, False])
+    def test_chunk_details_round_trip(self, documents: list[Document], shared_memory: bool):
+        config = TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True)
+        runner = BatchRunner(config=config, max_workers=2, shared_memory=shared_memory)
+        assert runner.run(documents) == _sequential(documents, config)
+
+    def test_compact_chunk_details_round_trip(self, documents: list[Document]):
+        config = TTRConfig(return_chunk_details=True, compact_chunk_details=True)
+        runner = BatchRunner(config=config, max_workers=2)
+        assert runner.run(documents) == _sequential(documents, config)
+
+    def test_sampled_chunk_details_round_trip(self, documents: list[Document]):
+        config = TTRConfig(sttr_sample_size=5, sttr_sample_seed=1, return_chunk_details=True)
+        runner = BatchRunner(config=config, max_workers=2)
+        assert runner.run(documents) == _sequential(documents, config)
+
+    def test_tokenizer_with_normalizer(self, documents: list[Document]):
+        tokenizer = Tokenizer(normalizer=str.upper)
+        results = BatchRunner(tokenizer=tokenizer, max_workers=2).run(documents)
+        calc = TTRCalculator()
+        for doc, result in zip(documents, results):
+            tokens = tokenizer.tokenize(doc.text)
+            expected = calc.compute(tokens, text_id=doc.text_id, title=doc.title, author=doc.author)
+            assert result == expected
+
+    def test_accepts_tuples(self):
+        results = compute_ttr_batch([("a", "one two"), ("b", "three three")], max_workers=1)
+        assert [r.text_id for r in results] == ["a", "b"]
+        assert results[1].unique_words == 1
+
+    def test_empty_batch(self):
+        assert compute_ttr_batch([], max_workers=1) == []
+
+
+class TestThreadBackend:
+    """Tests for the thread-pool backend."""
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            TTRConfig(),
+            TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True),
+            TTRConfig(return_chunk_details=True, compact_chunk_details=True),
+            TTRConfig(minhash_permutations=32),
+        ],
+    )
+    def test_matches_sequential(self, documents: list[Document], config: TTRConfig):
+        runner = BatchRunner(config=config, max_workers=4, backend="thread")
+        assert runner.backend == "thread"
+        assert runner.run(documents) == _sequential(documents, config)
+
+    def test_shared_tokenizer_across_threads(self, hound_text: str):
+        tokenizer = Tokenizer(normalizer=lambda token: token.rstrip("s"))
+        parts = [hound_text[i * 20000 : (i + 3) * 20000] for i in range(8)]
+        expected = [tokenizer.tokenize(part) for part in parts]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            assert list(pool.map(tokenizer.tokenize, parts * 4)) == expected * 4
+
+    def test_auto_backend(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(batch, "_gil_enabled", lambda: True)
+        assert BatchRunner(backend="auto").backend == "process"
+        monkeypatch.setattr(batch, "_gil_enabled", lambda: False)
+        assert BatchRunner(backend="auto").backend == "thread"
+        assert BatchRunner(backend="process").backend == "process"
+
+    def test_invalid_backend(self):
+        with pytest.raises(ValueError):
+            BatchRunner(backend="fiber")
+
+
+class TestScheduling:
+    """Tests for size-aware scheduling and utilization stats."""
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            dict(backend="process", shared_memory=True),
+            dict(backend="process", shared_memory=False),
+            dict(backend="thread"),
+        ],
+    )
+    def test_split_documents_match_sequential(self, documents: list[Document], options: dict):
+        config = TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True)
+        runner = BatchRunner(config=config, max_workers=2, segment_size=50_000, **options)
+        assert runner.run(documents) == _sequential(documents, config)
+
+        stats = runner.last_stats
+        assert stats.documents == len(documents)
+        assert stats.split_documents == 1
+        assert stats.segments > 1
+        assert stats.tasks == sum(usage.tasks for usage in stats.workers)
+        assert all(0.0 < usage.utilization <= 1.0 for usage in stats.workers)
+        assert 0.0 < stats.utilization <= 1.0
+        assert "Pool Utilization" in stats.to_table()
+
+    def test_split_non_ascii_from_shared_memory(self, hound_text: str):
+        # Segment byte offsets must account for multi-byte characters
+        text = "\n".join(f"Naïve café “{line}” ﬁnally—" for line in hound_text.splitlines())
+        documents = [Document("unicode-hound", text), Document("short", "A short note.")]
+        config = TTRConfig(return_chunk_details=True)
+        runner = BatchRunner(config=config, max_workers=2, segment_size=50_000)
+        assert runner.run(documents) == _sequential(documents, config)
+        assert runner.last_stats.split_documents == 1
+
+    def test_split_scored_while_tasks_run(self, monkeypatch, hound_text: str):
+        scored = threading.Event()
+        compute = TTRCalculator.compute
+
+        def recording_compute(self, tokens, text_id, *args, **kwargs):
+            if text_id == "hound":
+                scored.set()
+            return compute(self, tokens, text_id, *args, **kwargs)
+
+        class SlowTokenizer(Tokenizer):
+            def tokenize(self, text):
+                if text == "slow":
+                    # Holds a worker until the split document has been scored
+                    assert scored.wait(timeout=30)
+                return super().tokenize(text)
+
+        monkeypatch.setattr(TTRCalculator, "compute", recording_compute)
+        documents = [Document("hound", hound_text), Document("slow-doc", "slow")]
+        runner = BatchRunner(
+            tokenizer=SlowTokenizer(), max_workers=2, backend="thread", segment_size=50_000
+        )
+        results = runner.run(documents)
+        assert runner.last_stats.split_documents == 1
+        assert [result.text_id for result in results] == ["hound", "slow-doc"]
+
+    def test_largest_first_with_packing(self):
+        runner = BatchRunner(max_workers=2, segment_size=1000)
+        costs = [10, 5000, 1, 400, 2, 3, 900, 0]
+        split, tasks = runner._schedule(costs)
+        assert split == [1]
+        # Target task cost is (1316 unsplit) / (2 workers * 4 tasks each) = 164.5
+        assert tasks == [[6], [3], [0, 5, 4, 2, 7]]
+        assert sorted(i for task in tasks for i in task) == [0, 2, 3, 4, 5, 6, 7]
+
+    def test_no_split_with_one_worker(self, documents: list[Document]):
+        runner = BatchRunner(max_workers=1, segment_size=1000, backend="thread")
+        runner.run(documents)
+        assert runner.last_stats.split_documents == 0
+        assert runner.last_stats.max_workers == 1
+
+    def test_stats_before_and_after_empty_run(self):
+        runner = BatchRunner(max_workers=1)
+        assert runner.last_stats is None
+        assert runner.run([]) == []
+        assert runner.last_stats.documents == 0
+        assert runner.last_stats.workers == ()
+
+    def test_invalid_segment_size(self):
+        with pytest.raises(ValueError):
+            BatchRunner(segment_size=0)
+
+
+class TestDeduplication:
+    """Tests for the duplicate fingerprinting pre-pass."""
+
+    @pytest.fixture
+    def corpus(self, documents: list[Document]) -> list[Document]:
+        hound = documents[0].text
+        return documents + [
+            Document("hound-mirror", hound, title="Mirror", author="web"),
+            Document("empty-again", ""),
+            Document("hound-edited", hound[:-2000] + " A reprint note.", author="web"),
+            Document("hound-mirror-2", hound, author="web2"),
+        ]
+
+    @pytest.mark.parametrize("backend", ["process", "thread"])
+    def test_matches_sequential(self, corpus: list[Document], backend: str):
+        config = TTRConfig(return_chunk_details=True, minhash_permutations=16)
+        runner = BatchRunner(config=config, max_workers=2, backend=backend, deduplicate=True)
+        assert runner.run(corpus) == _sequential(corpus, config)
+
+        stats = runner.last_stats
+        assert stats.documents == len(corpus)
+        assert [(m.text_id, m.match_id) for m in stats.duplicates] == [
+            ("hound-mirror", "hound"),
+            ("empty-again", "empty"),
+            ("hound-mirror-2", "hound"),
+        ]
+        assert [(m.text_id, m.match_id) for m in stats.near_duplicates] == [
+            ("hound-edited", "hound")
+        ]
+        assert stats.near_duplicates[0].similarity > 0.9
+        assert sum(usage.tasks for usage in stats.workers) == stats.tasks
+
+    def test_duplicates_are_not_recomputed(self, corpus: list[Document], monkeypatch):
+        computed: list[str] = []
+        original = batch.compute_documents
+
+        def recording(docs, config, tokenizer):
+            computed.extend(doc.text for doc in docs)
+            return original(docs, config, tokenizer)
+
+        monkeypatch.setattr(batch, "compute_documents", recording)
+        BatchRunner(max_workers=2, backend="thread", deduplicate=True).run(corpus)
+        assert len(computed) == len(set(computed)) == len(corpus) - 3
+
+    def test_fingerprint_cost_is_bounded(self, monkeypatch):
+        threads: set[threading.Thread] = set()
+        original = batch.shingle_signature
+
+        def recording(text):
+            threads.add(threading.current_thread())
+            return original(text)
+
+        monkeypatch.setattr(batch, "shingle_signature", recording)
+        words = [f"word{i}" for i in range(500)]
+        documents = [
+            Document(f"doc{i}", " ".join(words[(i * 7 + k) % 500] for k in range(60)))
+            for i in range(400)
+        ]
+        runner = BatchRunner(max_workers=2, backend="thread", deduplicate=True)
+        runner.run(documents + documents[:50])
+
+        # Signatures are computed in the pool; the parent only hashes and searches
+        stats = runner.last_stats
+        assert threads and threading.main_thread() not in threads
+        assert len(stats.duplicates) == 50
+        assert stats.fingerprint_seconds < 0.25 * stats.wall_seconds
+
+    def test_near_duplicate_search_optional(self, corpus: list[Document]):
+        runner = BatchRunner(
+            max_workers=1, backend="thread", deduplicate=True, near_duplicate_threshold=None
+        )
+        runner.run(corpus)
+        assert len(runner.last_stats.duplicates) == 3
+        assert runner.last_stats.near_duplicates == ()
+
+    def test_off_by_default(self, corpus: list[Document]):
+        runner = BatchRunner(max_workers=1, backend="thread")
+        runner.run(corpus)
+        assert runner.last_stats.duplicates == ()
+
+    def test_compute_ttr_batch(self):
+        results = compute_ttr_batch(
+            [("a", "same text"), ("b", "same text")], max_workers=1, deduplicate=True
+        )
+        assert [r.text_id for r in results] == ["a", "b"]
+        assert results[0].model_copy(update={"text_id": "b"}) == results[1]
+
+    def test_invalid_threshold(self):
+        with pytest.raises(ValueError):
+            BatchRunner(deduplicate=True, near_duplicate_threshold=1.5)
@@ -1,6 +1,10 @@
 """Tests for per-chunk TTR data (return_chunk_details option)."""
 
-from stylometry_ttr import TTRCalculator, TTRConfig
+import json
+
+import pytest
+
+from stylometry_ttr import ChunkSeries, TTRCalculator, TTRConfig, TTRResult
 
 
 class TestChunkDetails:
@@ -83,3 +87,54 @@ class TestChunkDetails:
         print(f"Total chunks: {len(result.chunk_ttrs)}")
         print("Ready for: plt.plot(x, y)")
         print("=" * 60)
+
+
+class TestCompactChunkSeries:
+    """Tests for compact_chunk_details (ChunkSeries output)."""
+
+    @pytest.fixture
+    def compact_result(self, hound_tokens: list[str]) -> TTRResult:
+        config = TTRConfig(return_chunk_details=True, compact_chunk_details=True)
+        return TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+
+    def test_returns_chunk_series(self, compact_result: TTRResult):
+        assert isinstance(compact_result.chunk_ttrs, ChunkSeries)
+        assert len(compact_result.chunk_ttrs) == compact_result.chunk_count
+
+    def test_matches_chunk_objects(self, hound_tokens: list[str], compact_result: TTRResult):
+        config = TTRConfig(return_chunk_details=True)
+        full = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert list(compact_result.chunk_ttrs) == full.chunk_ttrs
+        assert compact_result.chunk_ttrs[-1] == full.chunk_ttrs[-1]
+        assert compact_result.chunk_ttrs[2:5] == full.chunk_ttrs[2:5]
+
+    def test_index_out_of_range(self):
+        series = ChunkSeries([0.1, 0.2])
+        assert series[-2].chunk_number == 1
+        for index in (2, -3, -4, -5):
+            with pytest.raises(IndexError):
+                series[index]
+
+    def test_serializes_as_numeric_array(self, compact_result: TTRResult):
+        parsed = json.loads(compact_result.to_json())
+        assert parsed["chunk_ttrs"] == list(compact_result.chunk_ttrs.values)
+        assert all(isinstance(v, float) for v in parsed["chunk_ttrs"])
+
+    def test_json_round_trip(self, compact_result: TTRResult):
+        restored = TTRResult.model_validate_json(compact_result.to_json())
+        assert isinstance(restored.chunk_ttrs, ChunkSeries)
+        assert restored == compact_result
+
+    def test_values_are_read_only(self, compact_result: TTRResult):
+        with pytest.raises(TypeError):
+            compact_result.chunk_ttrs.values[0] = 0.5
+
+    def test_sampled_details_stay_explicit(self, hound_tokens: list[str]):
+        config = TTRConfig(
+            return_chunk_details=True,
+            compact_chunk_details=True,
+            sttr_sample_size=5,
+            sttr_sample_seed=0,
+        )
+        result = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert isinstance(result.chunk_ttrs, list)
@@ -0,0 +1,97 @@
+"""Tests for streaming corpus readers."""
+
+import bz2
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from stylometry_ttr import Tokenizer, TTRCalculator, TTRConfig, compute_ttr, iter_corpus
+
+
+@pytest.fixture
+def texts(hound_text: str) -> dict[str, str]:
+    """Three member texts keyed by archive path."""
+    third = len(hound_text) // 3
+    return {
+        "books/part1.txt": hound_text[:third],
+        "books/part2.txt": hound_text[third : 2 * third],
+        "books/part3.txt": hound_text[2 * third :],
+    }
+
+
+def _expected(texts: dict[str, str], config: TTRConfig) -> dict[str, object]:
+    return {
+        name[: -len(".txt")]: compute_ttr(text, text_id=name[: -len(".txt")], config=config)
+        for name, text in texts.items()
+    }
+
+
+class TestStreamingPrimitives:
+    """Tests for Tokenizer.tokenize_stream and TTRCalculator.compute_iter."""
+
+    def test_tokenize_stream_matches_tokenize(self, hound_text: str, hound_tokens: list[str]):
+        blocks = (hound_text[i : i + 997] for i in range(0, len(hound_text), 997))
+        assert list(Tokenizer().tokenize_stream(blocks)) == hound_tokens
+
+    @pytest.mark.parametrize(
+        "config",
+        [
+            TTRConfig(),
+            TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True),
+            TTRConfig(sttr_sample_size=8, sttr_sample_seed=2, return_chunk_details=True),
+        ],
+    )
+    def test_compute_iter_matches_compute(self, hound_tokens: list[str], config: TTRConfig):
+        calc = TTRCalculator(config=config)
+        expected = calc.compute(hound_tokens, text_id="test")
+        assert calc.compute_iter(iter(hound_tokens), text_id="test") == expected
+
+    def test_compute_iter_empty(self):
+        result = TTRCalculator().compute_iter(iter([]), text_id="empty")
+        assert result == TTRCalculator().compute([], text_id="empty")
+
+
+class TestIterCorpus:
+    """Tests for iter_corpus over compressed files and archives."""
+
+    def test_zip(self, tmp_path: Path, texts: dict[str, str]):
+        path = tmp_path / "corpus.zip"
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, text in texts.items():
+                archive.writestr(name, text)
+            archive.writestr("README.md", "not a text")
+
+        results = list(iter_corpus(path, pattern="*.txt", block_size=4096))
+        assert {r.text_id: r for r in results} == _expected(texts, TTRConfig())
+
+    @pytest.mark.parametrize(
+        "suffix,mode", [(".tar", "w"), (".tar.gz", "w:gz"), (".tar.xz", "w:xz")]
+    )
+    def test_tar(self, tmp_path: Path, texts: dict[str, str], suffix: str, mode: str):
+        path = tmp_path / f"corpus{suffix}"
+        with tarfile.open(path, mode) as archive:
+            for name, text in texts.items():
+                data = text.encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        config = TTRConfig(return_chunk_details=True)
+        results = list(iter_corpus(path, config=config, block_size=4096))
+        assert {r.text_id: r for r in results} == _expected(texts, config)
+
+    @pytest.mark.parametrize(
+        "suffix,opener", [(".gz", gzip.open), (".bz2", bz2.open), (".xz", lzma.open)]
+    )
+    def test_single_compressed_file(self, tmp_path: Path, hound_text: str, suffix: str, opener):
+        path = tmp_path / f"hound.txt{suffix}"
+        with opener(path, "wt", encoding="utf-8") as handle:
+            handle.write(hound_text)
+
+        [result] = iter_corpus(path, block_size=4096)
+        assert result == compute_ttr(hound_text, text_id="hound")
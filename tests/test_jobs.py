@@ -0,0 +1,125 @@
+"""Tests for resumable, checkpointed corpus jobs."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from stylometry_ttr import (
+    CorpusJob,
+    Document,
+    RunningAggregate,
+    TTRAggregator,
+    TTRResult,
+    compute_ttr,
+)
+
+
+@pytest.fixture
+def documents(hound_text: str) -> list[Document]:
+    """Twelve excerpts split between two authors."""
+    step = len(hound_text) // 12
+    return [
+        Document(f"doc-{i:02d}", hound_text[i * step : (i + 1) * step], author=f"author-{i % 2}")
+        for i in range(12)
+    ]
+
+
+class _Interrupted(Exception):
+    pass
+
+
+def _dying(documents: list[Document], after: int):
+    """Yield documents, then fail as if the process had been killed."""
+    for i, doc in enumerate(documents):
+        if i == after:
+            raise _Interrupted
+        yield doc
+
+
+def _strip_timestamps(aggregates: dict) -> dict:
+    return {k: v.model_dump(exclude={"generated_at"}) for k, v in aggregates.items()}
+
+
+class TestRunningAggregate:
+    """Tests for RunningAggregate."""
+
+    def test_matches_aggregator(self, documents: list[Document]):
+        results = [compute_ttr(d.text, text_id=d.text_id) for d in documents]
+        running = RunningAggregate()
+        for result in results:
+            running.add(result)
+        expected = TTRAggregator().aggregate(results, group_id="all")
+        assert running.to_aggregate("all").model_dump(exclude={"generated_at"}) == (
+            expected.model_dump(exclude={"generated_at"})
+        )
+
+    def test_replace_and_round_trip(self, documents: list[Document]):
+        running = RunningAggregate()
+        for doc in documents[:3]:
+            running.add(compute_ttr(doc.text, text_id=doc.text_id))
+        running.add(compute_ttr(documents[3].text, text_id=documents[0].text_id))
+        assert len(running) == 3
+
+        restored = RunningAggregate.from_dict(json.loads(json.dumps(running.to_dict())))
+        assert restored.to_dict() == running.to_dict()
+
+    def test_empty_raises(self):
+        with pytest.raises(ValueError):
+            RunningAggregate().to_aggregate("empty")
+
+
+class TestCorpusJob:
+    """Tests for CorpusJob."""
+
+    def test_uninterrupted_run(self, tmp_path: Path, documents: list[Document]):
+        output = tmp_path / "results.jsonl"
+        aggregates = CorpusJob(output, checkpoint_every=5).run(documents)
+
+        lines = output.read_text().splitlines()
+        results = [TTRResult.model_validate_json(line) for line in lines]
+        assert [r.text_id for r in results] == [d.text_id for d in documents]
+        assert set(aggregates) == {"author-0", "author-1"}
+        assert aggregates["author-0"].text_count == 6
+
+    def test_resume_is_identical(self, tmp_path: Path, documents: list[Document]):
+        reference_output = tmp_path / "reference.jsonl"
+        reference = CorpusJob(reference_output, checkpoint_every=4).run(documents)
+
+        output = tmp_path / "results.jsonl"
+        with pytest.raises(_Interrupted):
+            CorpusJob(output, checkpoint_every=4).run(_dying(documents, after=10))
+
+        # Results after the last checkpoint were written but not checkpointed
+        assert len(output.read_text().splitlines()) == 8
+
+        job = CorpusJob(output, checkpoint_every=4)
+        resumed = job.run(documents)
+
+        assert output.read_bytes() == reference_output.read_bytes()
+        assert _strip_timestamps(resumed) == _strip_timestamps(reference)
+        assert job.completed == {d.text_id for d in documents}
+
+    def test_checkpoint_holds_only_offset(self, tmp_path: Path, documents: list[Document]):
+        output = tmp_path / "results.jsonl"
+        CorpusJob(output, checkpoint_every=2).run(documents)
+        state = json.loads((tmp_path / "results.jsonl.checkpoint").read_text())
+        assert state == {"version": 2, "output_offset": output.stat().st_size}
+
+    def test_finished_documents_are_skipped(self, tmp_path: Path, documents: list[Document]):
+        output = tmp_path / "results.jsonl"
+        CorpusJob(output, checkpoint_every=3).run(documents[:6])
+        CorpusJob(output, checkpoint_every=3).run(documents)
+        assert len(output.read_text().splitlines()) == len(documents)
+
+    def test_duplicate_text_ids_recorded_once(self, tmp_path: Path, documents: list[Document]):
+        output = tmp_path / "results.jsonl"
+        CorpusJob(output, checkpoint_every=2).run(documents[:3] + documents[:3])
+        assert len(output.read_text().splitlines()) == 3
+
+    def test_parallel_run_matches_sequential(self, tmp_path: Path, documents: list[Document]):
+        sequential = tmp_path / "sequential.jsonl"
+        parallel = tmp_path / "parallel.jsonl"
+        CorpusJob(sequential, checkpoint_every=5).run(documents)
+        CorpusJob(parallel, checkpoint_every=5, max_workers=2).run(documents)
+        assert parallel.read_bytes() == sequential.read_bytes()
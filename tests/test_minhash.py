@@ -0,0 +1,192 @@
+"""Tests for MinHash signatures and the LSH similarity index."""
+
+import random
+
+import pytest
+
+from stylometry_ttr import (
+    BatchRunner,
+    Document,
+    MinHashIndex,
+    MinHashSignature,
+    Tokenizer,
+    TTRConfig,
+    TTRResult,
+    compute_ttr,
+    minhash,
+    minhash_signature,
+    overlap_matrix,
+    shingle_signature,
+)
+
+
+def _jaccard(left: set, right: set) -> float:
+    return len(left & right) / len(left | right)
+
+
+@pytest.fixture
+def hound_types(hound_text: str) -> list[set[str]]:
+    """Type sets of ten consecutive slices of the Hound."""
+    tokens = Tokenizer().tokenize(hound_text)
+    step = len(tokens) // 10
+    return [set(tokens[i * step : (i + 1) * step]) for i in range(10)]
+
+
+class TestMinHashSignature:
+    """Tests for minhash_signature and MinHashSignature."""
+
+    def test_deterministic(self):
+        types = {"the", "hound", "of", "baskervilles"}
+        assert minhash_signature(types, 64) == minhash_signature(list(types) * 2, 64)
+        assert minhash_signature(types, 64) != minhash_signature(types, 64, seed=1)
+
+    def test_estimates_jaccard(self, hound_types: list[set[str]]):
+        a, b = hound_types[0], hound_types[0] | hound_types[1]
+        estimate = minhash_signature(a, 512).jaccard(minhash_signature(b, 512))
+        assert estimate == pytest.approx(_jaccard(a, b), abs=0.08)
+
+    def test_short_texts_are_densified(self):
+        signature = minhash_signature({"one", "two", "three"}, 128)
+        assert not signature.is_empty
+        assert MinHashSignature.EMPTY not in signature
+        assert set(signature) <= {minhash_signature({w}, 128)[0] for w in ("one", "two", "three")}
+        assert signature.jaccard(minhash_signature({"one", "two", "three"}, 128)) == 1.0
+
+    @pytest.mark.parametrize("count", [1, 3, 40, 300])
+    def test_densification_follows_probe_sequence(self, count: int):
+        num_perm, seed = 128, 2
+        types = {f"word{i}" for i in range(count)}
+        raw = minhash_signature(types, num_perm, seed=seed)
+
+        # Reference: rebuild the undensified slots, then walk each probe sequence
+        empty = MinHashSignature.EMPTY
+        filled = [empty] * num_perm
+        for word in types:
+            h = minhash._stable_hash(word, seed)
+            filled[h % num_perm] = min(filled[h % num_perm], (h // num_perm) % empty)
+        for i in range(num_perm):
+            j = i
+            probe = random.Random(f"{seed}:{num_perm}:{i}")
+            while filled[j] == empty:
+                j = probe.randrange(num_perm)
+            assert raw[i] == filled[j]
+
+    def test_empty(self):
+        empty = minhash_signature(set(), 16)
+        assert empty.is_empty
+        assert empty.jaccard(empty) == 0.0
+        assert empty.jaccard(minhash_signature({"word"}, 16)) == 0.0
+
+    def test_length_mismatch(self):
+        with pytest.raises(ValueError):
+            minhash_signature({"a"}, 16).jaccard(minhash_signature({"a"}, 32))
+
+    def test_result_signature(self, hound_text: str):
+        config = TTRConfig(minhash_permutations=64)
+        result = compute_ttr(hound_text, text_id="h", config=config)
+        assert result.minhash == minhash_signature(set(Tokenizer().tokenize(hound_text)), 64)
+        assert TTRResult.model_validate_json(result.model_dump_json()) == result
+        assert compute_ttr(hound_text, text_id="h").minhash is None
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            compute_ttr("text", text_id="t", config=TTRConfig(minhash_permutations=0))
+        with pytest.raises(ValueError):
+            compute_ttr("text", text_id="t", config=TTRConfig(minhash_seed=-1))
+
+    @pytest.mark.parametrize("shared_memory", [True, False])
+    def test_batch_round_trip(self, hound_text: str, shared_memory: bool):
+        config = TTRConfig(minhash_permutations=32, return_chunk_details=True)
+        documents = [
+            Document("hound", hound_text),
+            Document("short", "A few words."),
+            Document("empty", ""),
+        ]
+        runner = BatchRunner(config=config, max_workers=2, shared_memory=shared_memory)
+        assert runner.run(documents) == [
+            compute_ttr(doc.text, text_id=doc.text_id, config=config) for doc in documents
+        ]
+
+
+class TestShingleSignature:
+    """Tests for raw-text shingle signatures."""
+
+    def test_near_duplicates_score_high(self, hound_text: str):
+        text = hound_text[:50000]
+        mirror = "Mirrored from example.org\n\n" + text.replace("\n", "\r\n").upper()
+        assert shingle_signature(text).jaccard(shingle_signature(mirror)) > 0.95
+        assert shingle_signature(text).jaccard(shingle_signature(hound_text[50000:100000])) < 0.1
+
+    def test_word_order_matters(self):
+        text = "the hound of the baskervilles was seen on the moor at night"
+        shuffled = " ".join(sorted(text.split()))
+        assert shingle_signature(text).jaccard(shingle_signature(shuffled)) < 0.5
+
+    def test_short_and_empty_texts(self):
+        assert shingle_signature("two words", 16) == shingle_signature("Two  WORDS\n", 16)
+        assert shingle_signature("", 16).is_empty
+        with pytest.raises(ValueError):
+            shingle_signature("text", shingle_size=0)
+
+
+class TestOverlap:
+    """Tests for overlap_matrix and MinHashIndex."""
+
+    def test_overlap_matrix(self, hound_types: list[set[str]]):
+        signatures = [minhash_signature(types, 256) for types in hound_types[:4]]
+        matrix = overlap_matrix(signatures + [minhash_signature(set(), 256)])
+        for i in range(4):
+            assert matrix[i][i] == 1.0
+            for j in range(4):
+                assert matrix[i][j] == matrix[j][i]
+                if i != j:
+                    expected = _jaccard(hound_types[i], hound_types[j])
+                    assert matrix[i][j] == pytest.approx(expected, abs=0.1)
+        assert matrix[4] == [0.0] * 5
+
+    def test_top_k_finds_near_duplicates(self, hound_types: list[set[str]]):
+        index = MinHashIndex(num_perm=128, threshold=0.5)
+        for i, types in enumerate(hound_types):
+            index.add(f"part{i}", minhash_signature(types, 128))
+            # A near-duplicate of each part: the same types minus a few
+            index.add(f"copy{i}", minhash_signature(set(sorted(types)[10:]), 128))
+
+        assert len(index) == 20
+        for i in range(10):
+            top = index.top_k(f"part{i}", k=1)
+            assert top[0][0] == f"copy{i}"
+            assert top[0][1] > 0.8
+
+        pairs = {(a, b) for a, b, _ in index.similar_pairs(min_similarity=0.8)}
+        assert pairs == {(f"part{i}", f"copy{i}") for i in range(10)}
+
+    def test_query_by_signature(self, hound_types: list[set[str]]):
+        index = MinHashIndex(num_perm=64, bands=16)
+        assert (index.bands, index.rows) == (16, 4)
+        for i, types in enumerate(hound_types):
+            index.add(f"part{i}", minhash_signature(types, 64))
+        assert index.query(minhash_signature(hound_types[3], 64), k=1) == [("part3", 1.0)]
+
+    def test_from_results(self, hound_text: str):
+        config = TTRConfig(minhash_permutations=64)
+        first, prefix = hound_text[: len(hound_text) // 2], hound_text[: len(hound_text) // 3]
+        results = [
+            compute_ttr(first, text_id="first", config=config),
+            compute_ttr(prefix, text_id="prefix", config=config),
+            compute_ttr("", text_id="empty", config=config),
+        ]
+        index = MinHashIndex.from_results(results, threshold=0.3)
+        assert "empty" in index
+        expected = _jaccard(set(Tokenizer().tokenize(first)), set(Tokenizer().tokenize(prefix)))
+        assert index.top_k("first", k=5) == [("prefix", pytest.approx(expected, abs=0.15))]
+        assert index.top_k("empty") == []
+
+    def test_rejects_bad_input(self):
+        index = MinHashIndex(num_perm=16)
+        index.add("a", minhash_signature({"x"}, 16))
+        with pytest.raises(ValueError):
+            index.add("a", minhash_signature({"y"}, 16))
+        with pytest.raises(ValueError):
+            index.add("b", minhash_signature({"y"}, 32))
+        with pytest.raises(ValueError):
+            MinHashIndex.from_results([compute_ttr("text", text_id="t")])
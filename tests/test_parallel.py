@@ -0,0 +1,65 @@
+"""Tests for segmented, multi-process tokenization."""
+
+import random
+
+import pytest
+
+from stylometry_ttr import Tokenizer, compute_ttr
+from stylometry_ttr.tokenizer import segment_text
+
+
+class TestSegmentText:
+    """Tests for safe segment boundaries."""
+
+    def test_segments_cover_text(self, hound_text: str):
+        segments = segment_text(hound_text, segment_size=10_000)
+        assert len(segments) > 10
+        assert "".join(segments) == hound_text
+
+    def test_short_text_is_one_segment(self):
+        assert segment_text("a short text", segment_size=100) == ["a short text"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "com-\n\nplete words here",
+            "an [editorial\n\nnote] here and more",
+            "some _italic\n\nspan_ here and more",
+            "com-_x_\nplete words here",
+            "com- [note]\nplete words here",
+            "com—\nplete words here",
+        ],
+    )
+    def test_no_cut_inside_cleaning_spans(self, text: str):
+        tokenizer = Tokenizer()
+        segments = segment_text(text, segment_size=1)
+        tokens = [token for segment in segments for token in tokenizer.tokenize(segment)]
+        assert tokens == tokenizer.tokenize(text)
+
+    def test_random_texts_tokenize_identically(self):
+        tokenizer = Tokenizer()
+        alphabet = ["a", "b", "X", "-", "_", "[", "]", "\n", " ", "—", "'", "1", "n't"]
+        rng = random.Random(0)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            segments = segment_text(text, segment_size=rng.randint(1, 8))
+            tokens = [token for segment in segments for token in tokenizer.tokenize(segment)]
+            assert tokens == tokenizer.tokenize(text)
+
+    def test_invalid_segment_size(self):
+        with pytest.raises(ValueError):
+            segment_text("text", segment_size=0)
+
+
+class TestTokenizeParallel:
+    """Tests for Tokenizer.tokenize_parallel."""
+
+    def test_matches_sequential(self, hound_text: str, hound_tokens: list[str]):
+        tokenizer = Tokenizer()
+        tokens = tokenizer.tokenize_parallel(hound_text, max_workers=2, segment_size=50_000)
+        assert tokens == hound_tokens
+
+    def test_compute_ttr_with_workers(self, hound_text: str):
+        sequential = compute_ttr(hound_text, text_id="pg2852", return_chunks=True)
+        parallel = compute_ttr(hound_text, text_id="pg2852", return_chunks=True, max_workers=2)
+        assert parallel == sequential
@@ -0,0 +1,144 @@
+"""Tests for sampled-chunk STTR estimation."""
+
+from pathlib import Path
+
+import pytest
+
+from stylometry_ttr import (
+    CorpusJob,
+    RunningAggregate,
+    STTREstimate,
+    Tokenizer,
+    TTRAggregator,
+    TTRCalculator,
+    TTRConfig,
+    TTRStore,
+    compute_ttr,
+)
+
+
+class TestSampledSTTR:
+    """Tests for the sttr_sample_size option."""
+
+    def test_sampling_disabled_by_default(self, hound_tokens: list[str]):
+        result = TTRCalculator().compute(hound_tokens, text_id="test")
+        assert result.sttr_se is None
+        assert result.sttr_sample_count is None
+
+    def test_random_sample(self, hound_tokens: list[str]):
+        config = TTRConfig(sttr_sample_size=10, sttr_sample_seed=42)
+        result = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert result.sttr_sample_count == 10
+        assert result.chunk_count == len(hound_tokens) // 1000
+        assert result.sttr_se is not None and result.sttr_se > 0
+        assert result.delta_mean is None
+
+    def test_estimate_close_to_full_sttr(self, hound_tokens: list[str]):
+        full = TTRCalculator().compute(hound_tokens, text_id="test")
+        config = TTRConfig(sttr_sample_size=20, sttr_sample_method="stratified", sttr_sample_seed=1)
+        sampled = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert abs(sampled.sttr - full.sttr) < 4 * sampled.sttr_se
+
+    def test_seed_is_reproducible(self, hound_tokens: list[str]):
+        config = TTRConfig(sttr_sample_size=10, sttr_sample_seed=7)
+        first = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        second = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert first == second
+
+    def test_stratified_covers_whole_text(self, hound_tokens: list[str]):
+        config = TTRConfig(
+            sttr_sample_size=4,
+            sttr_sample_method="stratified",
+            sttr_sample_seed=3,
+            return_chunk_details=True,
+        )
+        result = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        numbers = [c.chunk_number for c in result.chunk_ttrs]
+        stratum = result.chunk_count / 4
+        for k, number in enumerate(numbers):
+            assert k * stratum < number <= (k + 1) * stratum + 1
+
+    def test_sample_larger_than_chunks_is_exact(self, hound_tokens: list[str]):
+        full = TTRCalculator().compute(hound_tokens, text_id="test")
+        config = TTRConfig(sttr_sample_size=10_000)
+        result = TTRCalculator(config=config).compute(hound_tokens, text_id="test")
+        assert result == full
+
+    def test_unknown_method_raises(self):
+        with pytest.raises(ValueError):
+            TTRCalculator(config=TTRConfig(sttr_sample_method="systematic"))
+
+
+class _RecordingTokenizer(Tokenizer):
+    """Tokenizer that records how many characters it was given."""
+
+    def __init__(self):
+        super().__init__()
+        self.characters = 0
+
+    def tokenize(self, text: str) -> list[str]:
+        self.characters += len(text)
+        return super().tokenize(text)
+
+
+class TestSampledRawText:
+    """Tests for STTR estimated from sampled windows of raw text."""
+
+    def test_tokenizes_only_sampled_windows(self, hound_text: str):
+        config = TTRConfig(sttr_sample_size=5, sttr_sample_seed=1)
+        tokenizer = _RecordingTokenizer()
+        estimate = TTRCalculator(config).estimate_sttr(hound_text, "test", tokenizer=tokenizer)
+        assert estimate.windowed
+        assert estimate.sttr_sample_count == 5
+        assert 0 < tokenizer.characters < len(hound_text) / 4
+
+    def test_estimate_is_separate_from_results(self, hound_text: str):
+        config = TTRConfig(sttr_sample_size=10, sttr_sample_seed=1)
+        estimate = TTRCalculator(config).estimate_sttr(hound_text, "test", author="doyle")
+        assert isinstance(estimate, STTREstimate)
+        assert estimate.author == "doyle" and estimate.sttr_se > 0
+        assert STTREstimate.model_validate_json(estimate.to_json()) == estimate
+
+    def test_estimate_close_to_full_sttr(self, hound_text: str):
+        full = compute_ttr(hound_text, text_id="test")
+        config = TTRConfig(sttr_sample_size=20, sttr_sample_method="stratified", sttr_sample_seed=1)
+        estimate = TTRCalculator(config).estimate_sttr(hound_text, "test")
+        assert abs(estimate.sttr - full.sttr) < 4 * estimate.sttr_se
+
+    def test_windows_match_whole_text_tokens(self, hound_text: str, hound_tokens: list[str]):
+        tokenizer = Tokenizer()
+        window = tokenizer.tokenize_window(hound_text, 100_000, 50, 400)
+        start = next(
+            i for i in range(len(hound_tokens)) if hound_tokens[i : i + 50] == window
+        )
+        assert start > 0
+        assert tokenizer.tokenize_window(hound_text, len(hound_text) - 100, 50, 400) is None
+        assert tokenizer.tokenize_window(hound_text, 0, 10, 5) == hound_tokens[:10]
+
+    def test_short_text_is_tokenized_in_full(self, hound_text: str):
+        short = hound_text[:20_000]
+        config = TTRConfig(sttr_sample_size=5, sttr_sample_seed=1, min_words_for_sttr=1000)
+        calculator = TTRCalculator(config)
+        estimate = calculator.estimate_sttr(short, "t")
+        result = calculator.compute(Tokenizer().tokenize(short), "t")
+        assert not estimate.windowed
+        assert (estimate.sttr, estimate.sttr_se) == (result.sttr, result.sttr_se)
+
+    def test_raw_text_results_are_exact(self, hound_text: str, hound_tokens: list[str]):
+        config = TTRConfig(sttr_sample_size=5, sttr_sample_seed=1)
+        result = compute_ttr(hound_text, text_id="test", config=config)
+        assert result == TTRCalculator(config).compute(hound_tokens, "test")
+        assert result == TTRCalculator(config).compute_iter(iter(hound_tokens), "test")
+        assert result.sttr_sample_count == 5
+
+    def test_sampled_results_can_be_aggregated(self, hound_text: str, tmp_path: Path):
+        config = TTRConfig(sttr_sample_size=5, sttr_sample_seed=1)
+        result = compute_ttr(hound_text, text_id="test", author="doyle", config=config)
+        expected = TTRAggregator().aggregate([result], group_id="doyle")
+        running = RunningAggregate()
+        running.add(result)
+        assert running.to_aggregate("doyle").ttr_mean == expected.ttr_mean
+        with TTRStore() as store:
+            store.add(result)
+            assert store.aggregate("doyle").sttr_mean == expected.sttr_mean
+        CorpusJob(tmp_path / "out.jsonl", config=config)
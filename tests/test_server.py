@@ -0,0 +1,157 @@
+"""Tests for the HTTP scoring service."""
+
+import json
+import os
+import signal
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Any, Iterator
+
+import pytest
+
+from stylometry_ttr import TTRAggregator, TTRConfig, TTRResult, Vocabulary, compute_ttr
+from stylometry_ttr.server import ScoringServer
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[ScoringServer]:
+    """A server on a free port with a short batch window."""
+    with ScoringServer(port=0, max_workers=2, batch_window=0.02, large_document_size=50_000) as srv:
+        yield srv
+
+
+def _request(server: ScoringServer, path: str, payload: Any = None) -> tuple[int, Any]:
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(server.url + path, data=data)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        return exc.code, json.loads(exc.read())
+
+
+class TestScoringServer:
+    """Tests for ScoringServer endpoints."""
+
+    def test_single_document(self, server: ScoringServer, hound_text: str):
+        status, body = _request(
+            server, "/ttr", {"text_id": "hound", "text": hound_text, "author": "doyle"}
+        )
+        assert status == 200
+        assert TTRResult.model_validate(body) == compute_ttr(
+            hound_text, text_id="hound", author="doyle"
+        )
+
+    def test_documents_list(self, server: ScoringServer):
+        texts = ["The cat sat on the mat.", "", "A dog, a dog, a dog."]
+        documents = [{"text_id": str(i), "text": text} for i, text in enumerate(texts)]
+        status, body = _request(server, "/ttr", {"documents": documents})
+        assert status == 200
+        assert [TTRResult.model_validate(r) for r in body["results"]] == [
+            compute_ttr(text, text_id=str(i)) for i, text in enumerate(texts)
+        ]
+
+    def test_request_options(self, server: ScoringServer, hound_text: str):
+        payload = {"text_id": "h", "text": hound_text, "chunk_size": 500, "return_chunks": True}
+        status, body = _request(server, "/ttr", payload)
+        assert status == 200
+        expected = compute_ttr(hound_text, text_id="h", chunk_size=500, return_chunks=True)
+        assert TTRResult.model_validate(body) == expected
+
+    def test_concurrent_requests_are_batched(self, server: ScoringServer):
+        before = server.metrics_snapshot()
+        responses: dict[int, Any] = {}
+
+        def post(i: int) -> None:
+            responses[i] = _request(server, "/ttr", {"text_id": str(i), "text": f"word {i} " * 50})
+
+        threads = [threading.Thread(target=post, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i, (status, body) in responses.items():
+            assert status == 200
+            assert body["text_id"] == str(i)
+        after = server.metrics_snapshot()
+        assert after["documents"] - before["documents"] == 16
+        assert after["batches"] - before["batches"] < 16
+
+    def test_aggregate(self, server: ScoringServer):
+        results = [compute_ttr(text, text_id=text) for text in ("a b c a", "x y z z", "one two")]
+        payload = {"group_id": "g", "results": [r.model_dump(mode="json") for r in results]}
+        status, body = _request(server, "/aggregate", payload)
+        assert status == 200
+        expected = TTRAggregator().aggregate(results, group_id="g").model_dump(mode="json")
+        body.pop("generated_at")
+        expected.pop("generated_at")
+        assert body == expected
+
+    def test_metrics(self, server: ScoringServer):
+        _request(server, "/ttr", {"text_id": "m", "text": "metrics please"})
+        status, body = _request(server, "/metrics")
+        assert status == 200
+        assert body["requests"] >= 1
+        assert body["documents_per_second"] > 0
+        latency = body["latency_ms"]
+        assert 0 <= latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["max"]
+
+    @pytest.mark.parametrize(
+        "path,payload",
+        [
+            ("/ttr", {"text": "no id"}),
+            ("/ttr", {"text_id": "x", "text": "t", "chunk_size": 0}),
+            ("/ttr", ["not", "an", "object"]),
+            ("/aggregate", {"group_id": "g", "results": []}),
+            ("/aggregate", {"group_id": "g", "results": [{"text_id": "x"}]}),
+        ],
+    )
+    def test_bad_requests(self, server: ScoringServer, path: str, payload: Any):
+        status, body = _request(server, path, payload)
+        assert status == 400
+        assert "error" in body
+
+    def test_unknown_path(self, server: ScoringServer):
+        status, _ = _request(server, "/nope")
+        assert status == 404
+
+    def test_server_config(self, hound_text: str):
+        config = TTRConfig(sttr_chunk_size=250)
+        with ScoringServer(port=0, config=config, max_workers=1) as srv:
+            status, body = _request(srv, "/ttr", {"text_id": "h", "text": hound_text})
+        assert status == 200
+        assert TTRResult.model_validate(body) == compute_ttr(hound_text, text_id="h", config=config)
+
+    def test_rejects_type_vocabulary(self):
+        with pytest.raises(ValueError):
+            ScoringServer(port=0, config=TTRConfig(type_vocabulary=Vocabulary()))
+
+    def test_health(self, server: ScoringServer):
+        status, body = _request(server, "/health")
+        assert status == 200
+        assert body == {"status": "ok", "pool": {"workers": 2, "restarts": 0}}
+
+    def test_recovers_from_dead_worker(self):
+        with ScoringServer(port=0, max_workers=1) as srv:
+            # Kill the worker outright, as the OOM killer would
+            for process in list(srv._pool._processes.values()):
+                os.kill(process.pid, signal.SIGKILL)
+                process.join()
+
+            deadline = time.monotonic() + 30
+            while True:
+                status, body = _request(srv, "/health")
+                assert status == 200
+                if body["pool"]["restarts"] or time.monotonic() > deadline:
+                    break
+                time.sleep(0.05)
+            assert body["pool"]["restarts"] == 1
+
+            status, body = _request(srv, "/ttr", {"text_id": "t", "text": "The cat sat."})
+            assert status == 200
+            assert TTRResult.model_validate(body) == compute_ttr("The cat sat.", text_id="t")
+
+        assert srv.health()["status"] == "stopped"
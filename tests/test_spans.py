@@ -0,0 +1,82 @@
+"""Tests for span-based tokenization and source offsets."""
+
+import pytest
+
+from stylometry_ttr import Tokenizer, TTRCalculator, TTRConfig
+
+TEXTS = [
+    "The quick brown fox jumps over the lazy dog.",
+    "“Naïve café,” she said—ﬁnally… ‘Twas _very_ odd.",
+    "A com-\n   plete [Illustration: a hound] word; O'er the moor’s edge.",
+    "Mr. Holmes's 1st of 1,000 cases, 3.14 and VII. İstanbul and the Kelvin sign.",
+    "__ _a_b_ [unclosed and more-\n\nwords] ſome ﬀ ﬃ ﬄ ― end",
+    "",
+]
+
+
+def _source_word(text: str, span: tuple[int, int]) -> str:
+    return text[span[0] : span[1]]
+
+
+class TestTokenSpans:
+    """Tests for Tokenizer.tokenize_spans."""
+
+    @pytest.mark.parametrize("text", TEXTS)
+    @pytest.mark.parametrize(
+        "tokenizer",
+        [Tokenizer(), Tokenizer(lowercase=False), Tokenizer(min_length=3, strip_numbers=True)],
+    )
+    def test_matches_tokenize(self, text: str, tokenizer: Tokenizer):
+        spans = tokenizer.tokenize_spans(text)
+        assert spans.tokens() == tokenizer.tokenize(text)
+        assert list(spans) == tokenizer.tokenize(text)
+        assert len(spans) == len(tokenizer.tokenize(text))
+
+    def test_matches_tokenize_on_hound(self, hound_text: str):
+        tokenizer = Tokenizer()
+        spans = tokenizer.tokenize_spans(hound_text)
+        assert spans.tokens() == tokenizer.tokenize(hound_text)
+        assert spans.buffer.islower()
+
+    def test_normalizer(self):
+        tokenizer = Tokenizer(normalizer=lambda token: token.rstrip("s"))
+        text = "Dogs and CATS and dog"
+        spans = tokenizer.tokenize_spans(text)
+        assert spans.tokens() == tokenizer.tokenize(text)
+        assert list(spans) == tokenizer.tokenize(text)
+
+    def test_ascii_source_spans(self, hound_text: str):
+        text = hound_text[:20000].encode("ascii", "ignore").decode("ascii")
+        spans = Tokenizer().tokenize_spans(text)
+        for i in range(len(spans)):
+            assert _source_word(text, spans.source_span(i)).lower() == spans[i]
+
+    def test_source_spans_through_rewrites(self):
+        text = "ﬁnally _very_ com-\n  plete a—b [note] end"
+        spans = Tokenizer().tokenize_spans(text)
+        assert spans.tokens() == ["finally", "very", "complete", "a", "b", "end"]
+        sources = [_source_word(text, spans.source_span(i)) for i in range(len(spans))]
+        assert sources == ["ﬁnally", "very", "com-\n  plete", "a", "b", "end"]
+
+    def test_chunk_offsets(self, hound_text: str):
+        config = TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True)
+        tokenizer = Tokenizer()
+        spans = tokenizer.tokenize_spans(hound_text)
+        result = TTRCalculator(config).compute(spans.tokens(), text_id="hound")
+        assert result == TTRCalculator(config).compute(tokenizer.tokenize(hound_text), "hound")
+        assert TTRCalculator(config).compute_iter(spans, text_id="hound") == result
+
+        offsets = spans.chunk_offsets(config.sttr_chunk_size)
+        assert len(offsets) == len(result.chunk_ttrs)
+        for chunk, (start, end) in zip(result.chunk_ttrs, offsets):
+            chunk_tokens = tokenizer.tokenize(hound_text[start:end])
+            assert len(chunk_tokens) == config.sttr_chunk_size
+            assert len(set(chunk_tokens)) / config.sttr_chunk_size == pytest.approx(chunk.ttr)
+        assert all(left[1] <= right[0] for left, right in zip(offsets, offsets[1:]))
+
+    def test_chunk_offsets_short_text(self):
+        spans = Tokenizer().tokenize_spans("too few words")
+        assert spans.chunk_offsets(1000) == []
+        assert spans.chunk_offsets(1) == [(0, 3), (4, 7), (8, 13)]
+        with pytest.raises(ValueError):
+            spans.chunk_offsets(0)
@@ -0,0 +1,163 @@
+"""Tests for the SQLite results store."""
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from stylometry_ttr import TTRAggregator, TTRConfig, TTRResult, TTRStore, compute_ttr
+
+
+@pytest.fixture
+def results(hound_text: str) -> list[TTRResult]:
+    """Results for slices of the Hound, split between two authors."""
+    config = TTRConfig(sttr_chunk_size=500, min_words_for_sttr=1000, return_chunk_details=True)
+    step = len(hound_text) // 8
+    return [
+        compute_ttr(
+            hound_text[i * step : (i + 1) * step + i * 997],
+            text_id=f"part{i}",
+            title=f"Part {i}",
+            author="doyle" if i % 2 else "watson",
+            config=config,
+        )
+        for i in range(8)
+    ] + [compute_ttr("A very short note.", text_id="note", author="watson")]
+
+
+def _expected(results: list[TTRResult], author: str):
+    group = [r for r in results if r.author == author]
+    return TTRAggregator().aggregate(group, group_id=author)
+
+
+def _same(left, right) -> bool:
+    """Compare aggregates ignoring their generation timestamps."""
+    return left.model_dump(exclude={"generated_at"}) == right.model_dump(exclude={"generated_at"})
+
+
+class TestTTRStore:
+    """Tests for TTRStore."""
+
+    def test_round_trip(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            store.add_many(results)
+            assert len(store) == len(results)
+            for result in results:
+                assert result.text_id in store
+                assert store.get(result.text_id) == result
+            assert store.get("missing") is None
+
+    def test_aggregates_match_aggregator(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            for result in results:
+                store.add(result)
+            assert set(store.aggregates()) == {"doyle", "watson"}
+            for author in ("doyle", "watson"):
+                assert _same(store.aggregate(author), _expected(results, author))
+
+    def test_replace_moves_result_between_groups(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            store.add_many(results)
+            moved = results[0].model_copy(update={"author": "doyle"})
+            store.add(moved)
+            updated = [moved] + results[1:]
+            assert len(store) == len(results)
+            for author in ("doyle", "watson"):
+                assert _same(store.aggregate(author), _expected(updated, author))
+
+    def test_remove(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            store.add_many(results)
+            store.remove("note")
+            assert "note" not in store
+            assert _same(store.aggregate("watson"), _expected(results[:-1], "watson"))
+            with pytest.raises(KeyError):
+                store.remove("note")
+
+    def test_removing_last_result_drops_group(self):
+        with TTRStore() as store:
+            store.add(compute_ttr("only text", text_id="t", author="solo"))
+            store.remove("t")
+            with pytest.raises(KeyError):
+                store.aggregate("solo")
+
+    def test_query(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            store.add_many(results)
+
+            assert [r.text_id for r in store.query(author="doyle")] == [
+                r.text_id for r in sorted(results, key=lambda r: r.text_id) if r.author == "doyle"
+            ]
+
+            in_range = list(store.query(ttr=(0.21, 0.24), total_words=(1000, None)))
+            assert 0 < len(in_range) < len(results)
+            assert in_range == sorted(
+                (r for r in results if 0.21 <= r.ttr <= 0.24 and r.total_words >= 1000),
+                key=lambda r: r.text_id,
+            )
+
+            top = list(store.query(order_by="sttr", descending=True, limit=3, sttr=(None, None)))
+            assert [r.sttr for r in top] == sorted(
+                (r.sttr for r in results if r.sttr is not None), reverse=True
+            )[:3]
+
+    def test_query_rejects_unknown_metric(self):
+        with TTRStore() as store:
+            with pytest.raises(ValueError):
+                list(store.query(text=(0, 1)))
+            with pytest.raises(ValueError):
+                list(store.query(order_by="ttr; DROP TABLE results"))
+
+    def test_persists_across_connections(self, tmp_path: Path, results: list[TTRResult]):
+        path = tmp_path / "results.db"
+        with TTRStore(path) as store:
+            store.add_many(results)
+        with TTRStore(path) as store:
+            assert len(store) == len(results)
+            assert _same(store.aggregate("doyle"), _expected(results, "doyle"))
+
+    def test_custom_grouping(self, results: list[TTRResult]):
+        with TTRStore(group_by=lambda r: r.text_id[:4]) as store:
+            store.add_many(results)
+            assert set(store.aggregates()) == {"part", "note"}
+            assert store.aggregate("part").text_count == 8
+            assert [r.text_id for r in store.query(group_id="note")] == ["note"]
+
+    def test_add_is_incremental(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            store.add_many(results[:-1])
+            statements: list[str] = []
+            store._connection.set_trace_callback(statements.append)
+            store.add(results[-1])
+            store._connection.set_trace_callback(None)
+            # Only the rebuild path reads a group's metric columns
+            assert not [sql for sql in statements if "SELECT total_words" in sql]
+            assert _same(store.aggregate("watson"), _expected(results, "watson"))
+
+    def test_mixed_updates_match_aggregator(self, results: list[TTRResult]):
+        with TTRStore() as store:
+            current = {}
+            for i, result in enumerate(results):
+                store.add(result)
+                current[result.text_id] = result
+                if i % 3 == 2:
+                    moved = result.model_copy(update={"author": "holmes"})
+                    store.add(moved)
+                    current[moved.text_id] = moved
+                if i % 4 == 3:
+                    store.remove(results[i - 1].text_id)
+                    del current[results[i - 1].text_id]
+                for author in {r.author for r in current.values()}:
+                    assert _same(store.aggregate(author), _expected(list(current.values()), author))
+
+    def test_upgrades_older_schema(self, tmp_path: Path, results: list[TTRResult]):
+        path = tmp_path / "results.db"
+        with TTRStore(path) as store:
+            store.add_many(results[:-1])
+        with sqlite3.connect(path) as connection:
+            connection.execute("DELETE FROM group_state")
+            connection.execute("PRAGMA user_version = 2")
+        with TTRStore(path) as store:
+            store.add(results[-1])
+            for author in ("doyle", "watson"):
+                assert _same(store.aggregate(author), _expected(results, author))
@@ -1,6 +1,12 @@
 """Tests for the Tokenizer class."""
 
+import pickle
+import random
+
+import pytest
+
 from stylometry_ttr import Tokenizer
+from stylometry_ttr.tokenizer import clean_text_artifacts, normalize_unicode
 
 
 class TestTokenizer:
@@ -33,3 +39,80 @@ class TestTokenizer:
         assert "1" not in tokens
         assert "42" not in tokens
         assert "chapter" in tokens
+
+
+class TestAsciiFastPath:
+    """The bytes-level ASCII path must yield the same tokens as the general path."""
+
+    @staticmethod
+    def _general(tokenizer: Tokenizer, text: str) -> list[str]:
+        return list(tokenizer._iter_tokens(clean_text_artifacts(normalize_unicode(text))))
+
+    @pytest.mark.parametrize(
+        "tokenizer",
+        [
+            Tokenizer(),
+            Tokenizer(lowercase=False),
+            Tokenizer(min_length=3, strip_numbers=True),
+        ],
+    )
+    def test_hound_matches_general_path(self, tokenizer: Tokenizer, hound_text: str):
+        assert tokenizer.tokenize(hound_text) == self._general(tokenizer, hound_text)
+
+    def test_ascii_edge_cases(self):
+        tokenizer = Tokenizer(lowercase=False)
+        text = "`Twas XIV o'er the 2nd com-\x1c\nplete _ITALIC_ [note] MIX, 1,000 runnin'"
+        assert tokenizer.tokenize(text) == self._general(tokenizer, text)
+
+    def test_random_ascii_texts(self):
+        tokenizer = Tokenizer()
+        alphabet = ["a", "B", "IV", "-", "_", "[", "]", "\n", " ", "\x1c", "`", "'", "2nd", "n't"]
+        rng = random.Random(1)
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            assert tokenizer.tokenize(text) == self._general(tokenizer, text)
+
+
+def _strip_plural(token: str) -> str:
+    """Toy stemmer for normalizer tests."""
+    return token[:-1] if token.endswith("s") and len(token) > 3 else token
+
+
+class TestNormalizer:
+    """Tests for the per-type normalizer hook."""
+
+    def test_normalizer_applied(self):
+        tokenizer = Tokenizer(normalizer=_strip_plural)
+        assert tokenizer.tokenize("Dogs chase cats") == ["dog", "chase", "cat"]
+
+    def test_called_once_per_surface_type(self, hound_text: str):
+        calls: list[str] = []
+
+        def counting(token: str) -> str:
+            calls.append(token)
+            return _strip_plural(token)
+
+        tokens = Tokenizer(normalizer=counting).tokenize(hound_text)
+        surface_types = set(Tokenizer(lowercase=False).tokenize(hound_text))
+        assert len(calls) <= len(surface_types)
+        assert len(calls) < len(tokens) / 5
+
+    def test_matches_per_token_normalization(self, hound_text: str, hound_tokens: list[str]):
+        tokens = Tokenizer(normalizer=_strip_plural).tokenize(hound_text)
+        assert tokens == [_strip_plural(token) for token in hound_tokens]
+
+    def test_general_path_matches(self):
+        text = "Naïve “Dogs” and—naïve CATS"
+        tokenizer = Tokenizer(normalizer=_strip_plural)
+        assert tokenizer.tokenize(text) == list(tokenizer.tokenize_iter(text))
+        assert tokenizer.tokenize(text) == ["na", "ve", "dog", "and", "na", "ve", "cat"]
+
+    def test_bounded_cache(self, hound_text: str, hound_tokens: list[str]):
+        tokenizer = Tokenizer(normalizer=_strip_plural, normalizer_cache_size=16)
+        assert tokenizer.tokenize(hound_text) == [_strip_plural(t) for t in hound_tokens]
+
+    def test_pickle_round_trip(self):
+        tokenizer = Tokenizer(lowercase=False, min_length=2, normalizer=_strip_plural)
+        restored = pickle.loads(pickle.dumps(tokenizer))
+        assert restored.normalizer is _strip_plural
+        assert restored.tokenize("The Dogs ran") == tokenizer.tokenize("The Dogs ran")
@@ -0,0 +1,53 @@
+"""Tests for computing several tokenizer configurations in one pass."""
+
+import pytest
+
+from stylometry_ttr import Tokenizer, TTRCalculator, TTRConfig, compute_ttr_variants
+
+
+def _strip_plural(token: str) -> str:
+    return token[:-1] if token.endswith("s") and len(token) > 3 else token
+
+
+TOKENIZERS = {
+    "default": Tokenizer(),
+    "case_sensitive": Tokenizer(lowercase=False),
+    "no_numbers": Tokenizer(strip_numbers=True),
+    "min3": Tokenizer(min_length=3),
+    "strict": Tokenizer(lowercase=False, min_length=4, strip_numbers=True),
+    "stemmed": Tokenizer(normalizer=_strip_plural),
+}
+
+
+class TestComputeTTRVariants:
+    """Tests for compute_ttr_variants."""
+
+    @pytest.mark.parametrize(
+        "config", [TTRConfig(), TTRConfig(sttr_chunk_size=500, return_chunk_details=True)]
+    )
+    def test_matches_separate_tokenization(self, hound_text: str, config: TTRConfig):
+        results = compute_ttr_variants(
+            hound_text, text_id="pg2852", tokenizers=TOKENIZERS, author="doyle", config=config
+        )
+        assert set(results) == set(TOKENIZERS)
+
+        calc = TTRCalculator(config=config)
+        for name, tokenizer in TOKENIZERS.items():
+            tokens = tokenizer.tokenize(hound_text)
+            assert results[name] == calc.compute(tokens, text_id="pg2852", author="doyle"), name
+
+    def test_variants_differ(self, hound_text: str):
+        results = compute_ttr_variants(hound_text, text_id="pg2852", tokenizers=TOKENIZERS)
+        assert results["case_sensitive"].unique_words > results["default"].unique_words
+        assert results["min3"].total_words < results["default"].total_words
+
+    def test_mixed_unicode_and_numbers(self):
+        text = "Chapter 1: the CAFÉ and the café, 2nd time—'Twas 1,000 Times."
+        results = compute_ttr_variants(text, text_id="t", tokenizers=TOKENIZERS)
+        calc = TTRCalculator()
+        for name, tokenizer in TOKENIZERS.items():
+            assert results[name] == calc.compute(tokenizer.tokenize(text), text_id="t")
+
+    def test_empty_text(self):
+        results = compute_ttr_variants("", text_id="empty", tokenizers=TOKENIZERS)
+        assert all(result.total_words == 0 for result in results.values())
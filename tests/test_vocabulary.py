@@ -0,0 +1,225 @@
+"""Tests for shared-vocabulary type signatures and pooled aggregates."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from stylometry_ttr import (
+    BatchRunner,
+    CorpusJob,
+    Document,
+    RunningAggregate,
+    Tokenizer,
+    TTRAggregate,
+    TTRAggregator,
+    TTRCalculator,
+    TTRConfig,
+    TTRResult,
+    TTRStore,
+    TypeSignature,
+    Vocabulary,
+    compute_ttr,
+)
+
+
+@pytest.fixture
+def parts(hound_text: str) -> list[str]:
+    """Four overlapping slices of the Hound."""
+    step = len(hound_text) // 4
+    return [hound_text[i * step : (i + 2) * step] for i in range(3)] + ["", "A short note."]
+
+
+def _same_aggregate(left: TTRAggregate, right: TTRAggregate) -> bool:
+    return left.model_dump(exclude={"generated_at"}) == right.model_dump(exclude={"generated_at"})
+
+
+def _results(parts: list[str], vocabulary: Vocabulary) -> list[TTRResult]:
+    config = TTRConfig(type_vocabulary=vocabulary)
+    return [
+        compute_ttr(text, text_id=f"part{i}", author="doyle", config=config)
+        for i, text in enumerate(parts)
+    ]
+
+
+class TestVocabulary:
+    """Tests for Vocabulary and TypeSignature."""
+
+    def test_ids_are_stable(self):
+        vocabulary = Vocabulary(["the", "hound"])
+        assert vocabulary.id("hound") == 1
+        assert vocabulary.id("moor") == 2
+        assert vocabulary.word(2) == "moor"
+        assert len(vocabulary) == 3
+        assert Vocabulary(vocabulary.to_list()).to_list() == ["the", "hound", "moor"]
+
+    def test_signature_round_trip(self):
+        vocabulary = Vocabulary()
+        signature = vocabulary.signature(["moor", "the", "hound", "the"])
+        assert list(signature) == sorted(signature)
+        assert len(signature) == 3
+        assert vocabulary.words(signature) == ["hound", "moor", "the"]
+        assert vocabulary.id("the") in signature
+        assert 99 not in signature
+
+    def test_union(self):
+        left, right = TypeSignature([5, 1, 3]), TypeSignature([3, 8])
+        assert TypeSignature.union([left, right]) == TypeSignature([1, 3, 5, 8])
+        assert TypeSignature.union_size([left, right]) == 4
+        assert TypeSignature.union_size([]) == 0
+
+    def test_result_signature(self, hound_text: str):
+        vocabulary = Vocabulary()
+        result = compute_ttr(hound_text, text_id="h", config=TTRConfig(type_vocabulary=vocabulary))
+        assert len(result.type_signature) == result.unique_words
+        assert set(vocabulary.words(result.type_signature)) == set(Tokenizer().tokenize(hound_text))
+        assert TTRResult.model_validate_json(result.model_dump_json()) == result
+
+    def test_compute_iter_matches(self, hound_text: str):
+        vocabulary = Vocabulary()
+        calculator = TTRCalculator(TTRConfig(type_vocabulary=vocabulary))
+        tokens = Tokenizer().tokenize(hound_text)
+        assert calculator.compute_iter(iter(tokens), "h") == calculator.compute(tokens, "h")
+
+
+class TestPooledAggregate:
+    """Tests for pooled vocabulary statistics."""
+
+    def test_matches_retokenizing_everything(self, parts: list[str]):
+        results = _results(parts, Vocabulary())
+        aggregate = TTRAggregator().aggregate(results, group_id="doyle")
+
+        pooled = set()
+        for text in parts:
+            pooled.update(Tokenizer().tokenize(text))
+        assert aggregate.pooled_unique_words == len(pooled)
+        assert aggregate.pooled_ttr == round(len(pooled) / aggregate.total_words, 6)
+        assert aggregate.pooled_unique_words < sum(r.unique_words for r in results)
+
+    def test_absent_without_signatures(self, parts: list[str]):
+        results = _results(parts, Vocabulary())
+        results[0] = compute_ttr(parts[0], text_id="part0")
+        aggregate = TTRAggregator().aggregate(results, group_id="doyle")
+        assert aggregate.pooled_unique_words is None
+        assert aggregate.pooled_ttr is None
+
+    def test_store_matches_aggregator(self, parts: list[str]):
+        vocabulary = Vocabulary()
+        results = _results(parts, vocabulary)
+        expected = TTRAggregator().aggregate(results, group_id="doyle")
+        with TTRStore(vocabulary=vocabulary) as store:
+            store.add_many(results)
+            aggregate = store.aggregate("doyle")
+            assert store.get("part1") == results[1]
+        assert aggregate.pooled_unique_words == expected.pooled_unique_words
+        assert aggregate.pooled_ttr == expected.pooled_ttr
+
+    def test_store_pools_incrementally(self, parts: list[str]):
+        vocabulary = Vocabulary()
+        results = _results(parts, vocabulary)
+        with TTRStore(vocabulary=vocabulary) as store:
+            for result in results:
+                store.add(result)
+            assert _same_aggregate(
+                store.aggregate("doyle"), TTRAggregator().aggregate(results, group_id="doyle")
+            )
+            store.remove("part1")
+            remaining = results[:1] + results[2:]
+            assert _same_aggregate(
+                store.aggregate("doyle"), TTRAggregator().aggregate(remaining, group_id="doyle")
+            )
+
+    def test_store_restores_vocabulary(self, tmp_path: Path):
+        path = tmp_path / "results.db"
+        with TTRStore(path, vocabulary=Vocabulary()) as store:
+            store.add(_results(["alpha beta"], store.vocabulary)[0])
+
+        vocabulary = Vocabulary()
+        with TTRStore(path, vocabulary=vocabulary) as store:
+            result = _results(["gamma delta"], vocabulary)[0]
+            store.add(result.model_copy(update={"text_id": "part1"}))
+            assert store.aggregate("doyle").pooled_unique_words == 4
+        assert vocabulary.to_list() == ["alpha", "beta", "delta", "gamma"]
+
+    def test_store_rejects_other_vocabulary(self, tmp_path: Path):
+        path = tmp_path / "results.db"
+        with TTRStore(path, vocabulary=Vocabulary()) as store:
+            store.add(_results(["alpha beta"], store.vocabulary)[0])
+
+        # Signatures made before the store restored its vocabulary reuse IDs
+        vocabulary = Vocabulary()
+        _results(["gamma delta"], vocabulary)
+        with pytest.raises(ValueError):
+            TTRStore(path, vocabulary=vocabulary)
+
+        with TTRStore(path) as store:
+            with pytest.raises(ValueError):
+                store.add(_results(["alpha"], Vocabulary())[0])
+            with TTRStore(path, vocabulary=Vocabulary(["alpha"])) as other:
+                with pytest.raises(ValueError):
+                    other.add(_results(["alpha beta gamma"], Vocabulary())[0])
+            assert store.aggregate("doyle").pooled_unique_words == 2
+
+    def test_job_restores_vocabulary(self, tmp_path: Path, parts: list[str]):
+        documents = [Document(f"part{i}", text, author="doyle") for i, text in enumerate(parts)]
+        output = tmp_path / "out.jsonl"
+
+        first = CorpusJob(output, config=TTRConfig(type_vocabulary=Vocabulary()))
+        first.run(documents[:2])
+
+        vocabulary = Vocabulary()
+        resumed = CorpusJob(output, config=TTRConfig(type_vocabulary=vocabulary))
+        aggregates = resumed.run(documents)
+
+        reference = Vocabulary()
+        expected = _results(parts, reference)
+        assert vocabulary.to_list() == reference.to_list()
+        lines = output.read_text(encoding="utf-8").splitlines()
+        assert [TTRResult.model_validate_json(line) for line in lines] == expected
+        assert aggregates["doyle"].text_count == len(parts)
+
+    def test_job_pools_vocabulary(self, tmp_path: Path, parts: list[str]):
+        documents = [Document(f"part{i}", text, author="doyle") for i, text in enumerate(parts)]
+        expected = TTRAggregator().aggregate(_results(parts, Vocabulary()), group_id="doyle")
+
+        output = tmp_path / "out.jsonl"
+        config = TTRConfig(type_vocabulary=Vocabulary())
+        CorpusJob(output, config=config, checkpoint_every=1).run(documents[:2])
+        aggregates = CorpusJob(output, config=config).run(documents)
+        assert _same_aggregate(aggregates["doyle"], expected)
+
+    def test_running_aggregate_keeps_signatures(self, parts: list[str]):
+        results = _results(parts, Vocabulary())
+        running = RunningAggregate()
+        for result in results:
+            running.add(result)
+        restored = RunningAggregate.from_dict(json.loads(json.dumps(running.to_dict())))
+
+        expected = TTRAggregator().aggregate(results, group_id="doyle")
+        assert _same_aggregate(running.to_aggregate("doyle"), expected)
+        assert _same_aggregate(restored.to_aggregate("doyle"), expected)
+
+        running.add(compute_ttr(parts[0], text_id="part0", author="doyle"))
+        assert running.to_aggregate("doyle").pooled_unique_words is None
+        running.remove("part0")
+        assert running.to_aggregate("doyle").pooled_unique_words is not None
+
+    def test_process_backend_rejected(self):
+        with pytest.raises(ValueError):
+            BatchRunner(
+                config=TTRConfig(type_vocabulary=Vocabulary()), max_workers=2, backend="process"
+            )
+
+    def test_thread_backend_shares_vocabulary(self, parts: list[str]):
+        vocabulary = Vocabulary()
+        documents = [Document(f"part{i}", text, author="doyle") for i, text in enumerate(parts)]
+        runner = BatchRunner(
+            config=TTRConfig(type_vocabulary=vocabulary), max_workers=3, backend="thread"
+        )
+        results = runner.run(documents)
+
+        expected = TTRAggregator().aggregate(_results(parts, Vocabulary()), group_id="doyle")
+        aggregate = TTRAggregator().aggregate(results, group_id="doyle")
+        assert aggregate.pooled_unique_words == expected.pooled_unique_words
+        for text, result in zip(parts, results):
+            assert set(vocabulary.words(result.type_signature)) == set(Tokenizer().tokenize(text))